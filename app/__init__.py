@@ -1,8 +1,14 @@
 from flask import Flask
+from app.datastore import DATASTORE_PATH
+from app.jobs import UPLOAD_DIR, JOB_WORKERS, JOB_QUEUE_SIZE
 
 def create_app():
     """Flask application factory."""
     app = Flask(__name__)
+    app.config["DATASTORE_PATH"] = DATASTORE_PATH
+    app.config["UPLOAD_DIR"] = UPLOAD_DIR
+    app.config["JOB_WORKERS"] = JOB_WORKERS
+    app.config["JOB_QUEUE_SIZE"] = JOB_QUEUE_SIZE
 
     from app.routes import routes_bp  # Import blueprint
     app.register_blueprint(routes_bp)  # Register blueprint
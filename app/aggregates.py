@@ -0,0 +1,152 @@
+import threading
+from collections import Counter
+import numpy as np
+from app.models import SurveyTable
+from app.store_index import StoreIndex, StoreRegistry
+from app.console_logger import log_stage
+
+def answer_items(response) -> list:
+    """
+    Returns the values a response contributes to its question's answer distribution.
+    - Multi-line and multiple-choice responses (lists) count each entry once
+    - Ratings and single choices count as one value
+    """
+    if isinstance(response, list):
+        return [str(item) for item in response]
+    return [str(response)]
+
+class AnswerAggregates(StoreIndex):
+    """
+    Answer distributions per survey type and question, kept up to date as surveys are ingested.
+
+    Counts are updated incrementally when surveys are added or replaced, and rebuilt
+    with a vectorized pass over a SurveyTable when the store changed behind the index.
+    Each survey type's API payload is built once after it changes, so serving it does
+    not depend on the number of stored surveys.
+    """
+    def __init__(self):
+        """Initialize an empty index."""
+        self.counts = {}              # survey_type -> question_id -> Counter of answers
+        self.answered = {}            # survey_type -> question_id -> number of responses
+        self.survey_totals = Counter()
+        self.version = None           # Store version the index reflects
+        self._views = {}              # survey_type -> cached summary payload
+        self._lock = threading.Lock()
+
+    def _apply(self, survey, sign: int):
+        counts = self.counts.setdefault(survey.survey_type, {})
+        answered = self.answered.setdefault(survey.survey_type, {})
+        self.survey_totals[survey.survey_type] += sign
+        for response in survey.responses:
+            counter = counts.setdefault(response.question_id, Counter())
+            for item in answer_items(response.response):
+                counter[item] += sign
+            answered[response.question_id] = answered.get(response.question_id, 0) + sign
+        self._views.pop(survey.survey_type, None)
+
+    def update(self, surveys: list, replaced: list = (), version: str = None, base_version: str = None) -> bool:
+        """
+        Adds newly saved surveys to the index.
+
+        Args:
+            surveys (list): Survey objects that were just saved.
+            replaced (list, optional): The stored Survey objects those saves overwrote.
+            version (str, optional): Store version after the save.
+            base_version (str, optional): Store version before the save. If the index no longer
+                reflects it (a sync rebuilt it in the meantime), the deltas are dropped and the
+                index is marked stale so the next sync rebuilds it.
+
+        Returns:
+            bool: Whether the deltas were applied.
+        """
+        with self._lock:
+            if base_version is not None and self.version != base_version:
+                self.version = None
+                return False
+            for survey in replaced:
+                self._apply(survey, -1)
+            for survey in surveys:
+                self._apply(survey, 1)
+            if version is not None:
+                self.version = version
+        return True
+
+    def rebuild(self, table: SurveyTable, version: str = None):
+        """
+        Recomputes every distribution from a SurveyTable.
+
+        Rows are grouped by (survey type, question, answer code) in one numpy pass, so
+        Python only loops over distinct combinations rather than every response.
+        """
+        counts, answered = {}, {}
+        survey_totals = Counter()
+        if len(table):
+            type_codes = np.frombuffer(table.type_codes, dtype=table.type_codes.typecode)
+            rows_per_survey = np.diff(np.frombuffer(table.offsets, dtype=table.offsets.typecode))
+            for code, total in enumerate(np.bincount(type_codes).tolist()):
+                if total:
+                    survey_totals[table.survey_types[code]] = total
+
+            row_keys = np.stack([
+                np.repeat(type_codes, rows_per_survey).astype(np.int64),
+                np.frombuffer(table.question_ids, dtype=table.question_ids.typecode).astype(np.int64),
+                np.frombuffer(table.answer_codes, dtype=table.answer_codes.typecode).astype(np.int64),
+            ], axis=1)
+            if len(row_keys):
+                combinations, frequencies = np.unique(row_keys, axis=0, return_counts=True)
+                for (type_code, question_id, answer_code), frequency in zip(combinations.tolist(), frequencies.tolist()):
+                    survey_type = table.survey_types[type_code]
+                    counter = counts.setdefault(survey_type, {}).setdefault(question_id, Counter())
+                    for item in answer_items(table.answers[answer_code]):
+                        counter[item] += frequency
+                    question_answered = answered.setdefault(survey_type, {})
+                    question_answered[question_id] = question_answered.get(question_id, 0) + frequency
+
+        with self._lock:
+            self.counts, self.answered, self.survey_totals = counts, answered, survey_totals
+            self._views = {}
+            self.version = version
+        log_stage("Aggregates Rebuilt 📈", f"{len(table)} survey(s), {len(table.question_ids)} response(s).")
+
+    def rebuild_from_store(self, store, version: str):
+        self.rebuild(SurveyTable.from_surveys(store.iter_surveys()), version)
+
+    def summary(self, survey_type: str) -> dict:
+        """
+        Returns every question's answer distribution for one survey type.
+
+        Returns:
+            dict: {"survey_type", "surveys", "questions": {question_id: {"responses", "answers": {answer: count}}}}.
+        """
+        view = self._views.get(survey_type)
+        if view is None:
+            with self._lock:
+                answered = self.answered.get(survey_type, {})
+                questions = {}
+                for question_id in sorted(self.counts.get(survey_type, {})):
+                    if answered.get(question_id, 0) <= 0:
+                        continue
+                    counter = self.counts[survey_type][question_id]
+                    questions[str(question_id)] = {
+                        "responses": answered[question_id],
+                        "answers": {answer: count for answer, count in counter.most_common() if count > 0},
+                    }
+                view = {"survey_type": survey_type, "surveys": self.survey_totals[survey_type], "questions": questions}
+                self._views[survey_type] = view
+        return view
+
+    def question(self, survey_type: str, question_id: int):
+        """Returns one question's answer distribution, or None if nobody answered it."""
+        return self.summary(survey_type)["questions"].get(str(question_id))
+
+_aggregates = StoreRegistry(AnswerAggregates)
+
+def get_aggregates(store) -> AnswerAggregates:
+    """Returns the aggregate index for a survey store, synced with its current contents."""
+    index = _aggregates.for_store(store)
+    index.sync(store)
+    return index
+
+def cached_aggregates(store_path: str):
+    """Returns the aggregate index already built for a store path, or None."""
+    return _aggregates.cached(store_path)
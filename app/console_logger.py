@@ -1,27 +1,112 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
 import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-def log_stage(title: str, message: str = None, result=None):
+# Minimum level that is emitted ("DEBUG" shows per-page progress) and output format ("console" or "json")
+LOG_LEVEL = os.environ.get("STLOVP_LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("STLOVP_LOG_FORMAT", "console")
+
+logger = logging.getLogger("stlovp")
+
+class ConsoleFormatter(logging.Formatter):
+    """Renders a log stage as the separator block the app has always printed."""
+    def format(self, record: logging.LogRecord) -> str:
+        separator = "=" * 50
+        lines = [f"\n{separator}", record.getMessage()]
+        message = getattr(record, "stage_message", None)
+        result = getattr(record, "stage_result", None)
+        if message:
+            lines.append(f"   ➝ {message}")
+        if result is not None:
+            lines.append(f"   ✅ Result: {result}")
+        lines.append(f"{separator}\n")
+        return "\n".join(lines)
+
+class JSONFormatter(logging.Formatter):
+    """Renders a log stage as one JSON object per line."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "process": record.process,
+            "title": record.getMessage(),
+        }
+        message = getattr(record, "stage_message", None)
+        result = getattr(record, "stage_result", None)
+        if message:
+            entry["message"] = message
+        if result is not None:
+            entry["result"] = result
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+_listener = None
+_configured_pid = None
+
+def configure_logging(level=None, log_format: str = None, stream=None):
+    """
+    Sets up the app logger.
+    - Records are handed to a queue and written by a background thread, so logging never waits on the console
+    - Worker processes forked from a configured process write directly, as the queue thread does not survive the fork
+
+    Args:
+        level (str or int, optional): Minimum level to emit. Defaults to LOG_LEVEL.
+        log_format (str, optional): "console" for the separator blocks or "json" for JSON lines. Defaults to LOG_FORMAT.
+        stream (optional): Where to write. Defaults to sys.stdout.
     """
-    Prints a formatted log message with an appropriate emoji.
+    global _listener, _configured_pid
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JSONFormatter() if (log_format or LOG_FORMAT) == "json" else ConsoleFormatter())
+
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.setLevel(level or LOG_LEVEL)
+    logger.propagate = False
+
+    if _configured_pid is None or _configured_pid == os.getpid():
+        _listener = QueueListener(queue.SimpleQueue(), handler)
+        _listener.start()
+        logger.addHandler(QueueHandler(_listener.queue))
+    else:
+        logger.addHandler(handler)
+    _configured_pid = os.getpid()
+
+def flush_logging():
+    """Writes out every queued record."""
+    global _listener
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+        _listener.start()
+
+@atexit.register
+def _stop_listener():
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+
+def log_stage(title: str, message: str = None, result=None, level: int = logging.INFO, args: tuple = ()):
+    """
+    Logs a stage of work with an appropriate emoji.
+
+    Returns straight away when the level is disabled, before anything is formatted,
+    so verbose per-page logging is free when only INFO and above are shown.
 
     Args:
         title (str): The main title for the log stage.
         message (str, optional): Additional information about what is happening.
         result (any, optional): The result of the function (if applicable).
+        level (int, optional): A logging level, e.g. logging.DEBUG for per-page detail. Defaults to INFO.
+        args (tuple, optional): Values %-formatted into the title only when the record is emitted.
     """
-    # Define section separator
-    separator = "=" * 50
-
-    # Print the formatted log message
-    print(f"\n{separator}")
-    print(f"{title}")
-    
-    # Print optional message
-    if message:
-        print(f"   ➝ {message}")
-
-    # Print function return result if provided
-    if result is not None:
-        print(f"   ✅ Result: {result}")
-
-    print(f"{separator}\n")
+    if _configured_pid != os.getpid():
+        configure_logging(logger.level or None)
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, title, *args, extra={"stage_message": message, "stage_result": result})
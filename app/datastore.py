@@ -0,0 +1,268 @@
+import os
+import json
+import sqlite3
+import threading
+from itertools import groupby
+from app.models import Survey
+from app.console_logger import log_stage
+
+# Survey data store location; the file extension selects the backend (see open_store)
+DATASTORE_PATH = os.path.join(os.getcwd(), "survey_data.db")
+
+# Original single-file JSON data store, migrated into an SQLite store in the same folder on first use
+LEGACY_DATASTORE_NAME = "survey_data.json"
+
+SURVEY_TYPES = ("Resident", "Stakeholder")
+
+class SurveyStore:
+    """
+    Storage backend interface for surveys.
+
+    Backends store and return Survey objects; a survey is identified by its
+    (survey_type, survey_id) pair, and saving an existing survey replaces it.
+    """
+    def save_surveys(self, surveys: list):
+        """Adds or replaces a batch of surveys in one atomic write."""
+        raise NotImplementedError
+
+    def iter_surveys(self, survey_type: str = None, survey_id: str = None):
+        """Yields stored surveys, optionally filtered by survey type and/or survey id."""
+        raise NotImplementedError
+
+    def get_survey(self, survey_type: str, survey_id: str):
+        """Returns a single survey, or None if it is not stored."""
+        return next(self.iter_surveys(survey_type, survey_id), None)
+
+    def survey_keys(self) -> set:
+        """Returns the (survey_type, survey_id) pair of every stored survey."""
+        return {(survey.survey_type, survey.survey_id) for survey in self.iter_surveys()}
+
+    def version(self) -> str:
+        """Returns a token that changes whenever the stored data changes."""
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        """Returns every survey in the original {"Resident": [...], "Stakeholder": [...]} format."""
+        data_store = {survey_type: [] for survey_type in SURVEY_TYPES}
+        for survey in self.iter_surveys():
+            data_store.setdefault(survey.survey_type, []).append(survey.to_dict())
+        return data_store
+
+class SQLiteSurveyStore(SurveyStore):
+    """
+    SQLite survey store.
+    - Surveys and responses live in separate tables, indexed on survey_type, survey_id and question_id
+    - Saving a batch is a single transaction, so a crash never leaves a half-written store
+    - Adding one survey touches only that survey's rows
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS surveys (
+            id INTEGER PRIMARY KEY,
+            survey_type TEXT NOT NULL,
+            survey_id TEXT NOT NULL,
+            UNIQUE (survey_type, survey_id)
+        );
+        CREATE INDEX IF NOT EXISTS surveys_survey_id ON surveys (survey_id);
+        CREATE TABLE IF NOT EXISTS responses (
+            survey_pk INTEGER NOT NULL REFERENCES surveys (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (survey_pk, position)
+        );
+        CREATE INDEX IF NOT EXISTS responses_question_id ON responses (question_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) an SQLite survey store.
+
+        Args:
+            path (str): Database file location.
+        """
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def save_surveys(self, surveys: list):
+        if not surveys:
+            return
+        conn = self._connection()
+        with conn:
+            for survey in surveys:
+                conn.execute("INSERT OR IGNORE INTO surveys (survey_type, survey_id) VALUES (?, ?)",
+                             (survey.survey_type, survey.survey_id))
+                survey_pk = conn.execute("SELECT id FROM surveys WHERE survey_type = ? AND survey_id = ?",
+                                         (survey.survey_type, survey.survey_id)).fetchone()[0]
+                conn.execute("DELETE FROM responses WHERE survey_pk = ?", (survey_pk,))
+
+                rows = []
+                for position, response in enumerate(survey.to_dict()["responses"]):
+                    rows.append((survey_pk, position, response["question_id"], json.dumps(response)))
+                conn.executemany("INSERT INTO responses (survey_pk, position, question_id, payload) "
+                                 "VALUES (?, ?, ?, ?)", rows)
+            conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+
+    def iter_surveys(self, survey_type: str = None, survey_id: str = None):
+        query = ("SELECT s.id, s.survey_type, s.survey_id, r.payload FROM surveys s "
+                 "LEFT JOIN responses r ON r.survey_pk = s.id")
+        conditions, params = [], []
+        if survey_type is not None:
+            conditions.append("s.survey_type = ?")
+            params.append(survey_type)
+        if survey_id is not None:
+            conditions.append("s.survey_id = ?")
+            params.append(survey_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY s.id, r.position"
+
+        rows = self._connection().execute(query, params)
+        for (_, row_type, row_id), group in groupby(rows, key=lambda row: row[:3]):
+            responses = [json.loads(payload) for *_, payload in group if payload is not None]
+            yield Survey.from_dict({"survey_type": row_type, "survey_id": row_id, "responses": responses})
+
+    def survey_keys(self) -> set:
+        return set(self._connection().execute("SELECT survey_type, survey_id FROM surveys"))
+
+    def version(self) -> str:
+        return self._connection().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def get_meta(self, key: str):
+        """Returns a stored metadata value, or None."""
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        """Stores a metadata value."""
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        """Closes this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class JSONSurveyStore(SurveyStore):
+    """
+    The original single-file JSON survey store.
+
+    Every save reads and rewrites the whole file, so it is kept for compatibility
+    and small datasets. Writes go through a temporary file and an atomic rename,
+    and an unreadable file raises instead of being replaced by an empty store.
+    """
+    def __init__(self, path: str):
+        """
+        Open a JSON survey store.
+
+        Args:
+            path (str): JSON file location.
+        """
+        self.path = path
+
+    def _load(self) -> dict:
+        data_store = {survey_type: [] for survey_type in SURVEY_TYPES}
+        if not os.path.exists(self.path):
+            return data_store
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                loaded = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Survey data store {self.path} is corrupt: {e}") from e
+
+        # Collapse duplicate entries for the same survey, keeping the most recent copy
+        for survey_type, surveys in loaded.items():
+            data_store[survey_type] = list({survey["survey_id"]: survey for survey in surveys}.values())
+        return data_store
+
+    def save_surveys(self, surveys: list):
+        if not surveys:
+            return
+        data_store = self._load()
+        positions = {}
+        for survey in surveys:
+            entries = data_store.setdefault(survey.survey_type, [])
+            if survey.survey_type not in positions:
+                positions[survey.survey_type] = {entry["survey_id"]: index for index, entry in enumerate(entries)}
+
+            index = positions[survey.survey_type].get(survey.survey_id)
+            if index is None:
+                positions[survey.survey_type][survey.survey_id] = len(entries)
+                entries.append(survey.to_dict())
+            else:
+                entries[index] = survey.to_dict()
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data_store, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    def iter_surveys(self, survey_type: str = None, survey_id: str = None):
+        for stored_type, surveys in self._load().items():
+            if survey_type is not None and stored_type != survey_type:
+                continue
+            for survey in surveys:
+                if survey_id is None or survey["survey_id"] == survey_id:
+                    yield Survey.from_dict(survey)
+
+    def version(self) -> str:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return "0"
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+def migrate_json_store(json_path: str, store: SurveyStore) -> int:
+    """
+    Copies every survey from a legacy JSON data store into another store in one batch.
+
+    Returns:
+        int: Number of surveys migrated.
+    """
+    surveys = list(JSONSurveyStore(json_path).iter_surveys())
+    store.save_surveys(surveys)
+    log_stage("Survey Data Migrated ✅", f"Copied {len(surveys)} survey(s) from {json_path}.")
+    return len(surveys)
+
+def open_store(path: str = None, legacy_json_path: str = None) -> SurveyStore:
+    """
+    Opens the survey store at the given path.
+    - ".json" paths use the original single-file JSON store
+    - Any other path uses the SQLite store, which imports the legacy JSON file the first time it is opened
+
+    Args:
+        path (str, optional): Store location. Defaults to DATASTORE_PATH.
+        legacy_json_path (str, optional): JSON file to migrate from.
+            Defaults to LEGACY_DATASTORE_NAME in the same folder as the store.
+    """
+    path = path or DATASTORE_PATH
+    if path.lower().endswith(".json"):
+        return JSONSurveyStore(path)
+
+    store = SQLiteSurveyStore(path)
+    legacy_json_path = legacy_json_path or os.path.join(os.path.dirname(os.path.abspath(path)), LEGACY_DATASTORE_NAME)
+    if store.get_meta("migrated_from") is None:
+        if os.path.exists(legacy_json_path):
+            migrate_json_store(legacy_json_path, store)
+        store.set_meta("migrated_from", legacy_json_path)
+    return store
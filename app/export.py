@@ -0,0 +1,124 @@
+import io
+import csv
+from app.models import response_text
+
+# Optional Parquet support; CSV export works without it
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Columns of an export, one row per question response
+EXPORT_COLUMNS = ("survey_type", "survey_id", "question_id", "response", "confidence")
+
+# Rows encoded per CSV chunk, and per Parquet row group
+CSV_CHUNK_ROWS = 500
+PARQUET_ROW_GROUP_ROWS = 50000
+
+# Export format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+def iter_export_rows(store, survey_types: list = None):
+    """
+    Yields one (survey_type, survey_id, question_id, response, confidence) row per stored response.
+    - Multi-line responses become one newline-separated cell
+    - Surveys are read from the store one at a time, so memory does not grow with the store
+
+    Args:
+        store (SurveyStore): The survey store to read.
+        survey_types (list, optional): Only export these survey types. Defaults to every type.
+    """
+    for survey_type in survey_types or [None]:
+        for survey in store.iter_surveys(survey_type):
+            for response in survey.responses:
+                yield (survey.survey_type, survey.survey_id, response.question_id,
+                       response_text(response.response), response.confidence)
+
+def iter_row_batches(rows, batch_rows: int):
+    """Groups rows into lists of at most batch_rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_csv(store, survey_types: list = None, chunk_rows: int = None):
+    """Yields a UTF-8 CSV export (header first) in chunks of chunk_rows rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in iter_row_batches(iter_export_rows(store, survey_types), chunk_rows or CSV_CHUNK_ROWS):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")  # Header of an empty export
+
+class _ChunkSink:
+    """Write-only file object that keeps what was written until the exporting generator drains it."""
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def iter_parquet(store, survey_types: list = None, row_group_rows: int = None):
+    """
+    Yields a Parquet export, one row group at a time.
+
+    Parquet keeps its metadata in a footer, so the file can be written front to back
+    and each row group sent as soon as it is encoded.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export needs pyarrow installed.")
+    schema = pyarrow.schema([("survey_type", pyarrow.string()), ("survey_id", pyarrow.string()),
+                             ("question_id", pyarrow.int32()), ("response", pyarrow.string()),
+                             ("confidence", pyarrow.float64())])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    for batch in iter_row_batches(iter_export_rows(store, survey_types), row_group_rows or PARQUET_ROW_GROUP_ROWS):
+        writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(column, type=field.type) for column, field in zip(zip(*batch), schema)], schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def iter_export(store, export_format: str = "csv", survey_types: list = None):
+    """
+    Streams the store's responses as bytes in the given format ("csv" or "parquet").
+
+    Raises:
+        ValueError: For an unknown format.
+        RuntimeError: For Parquet without pyarrow installed.
+    """
+    if export_format == "csv":
+        return iter_csv(store, survey_types)
+    if export_format == "parquet":
+        if pyarrow is None:
+            raise RuntimeError("Parquet export needs pyarrow installed.")
+        return iter_parquet(store, survey_types)
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -1,118 +1,614 @@
 import os
-import json
-import pytesseract
-from pdf2image import convert_from_path
-import cv2
+import sys
+import logging
+import re
+import time
+import importlib.util
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from app.models import Response, Survey
 from app.console_logger import log_stage
+from app.metrics import REGISTRY
+from app.datastore import DATASTORE_PATH
+from app.form_templates import read_page_regions
+
+def lazy_import(name: str):
+    """
+    Returns a module that is only executed when one of its attributes is first used, or None if it is not installed.
+
+    Keeps OpenCV, pytesseract and pdf2image off the import path of the web app, which never OCRs in-process.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+cv2 = lazy_import("cv2")
+pytesseract = lazy_import("pytesseract")
+pdf2image = lazy_import("pdf2image")
+
+# Optional in-process Tesseract bindings; pytesseract is used when they are not installed
+tesserocr = lazy_import("tesserocr")
 
 # Set Tesseract OCR and Poppler paths
 TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
 POPPLER_PATH = r"C:\poppler-24.08.0\poppler-24.08.0\Library\bin"
 
-# JSON storage path
-DATASTORE_PATH = os.path.join(os.getcwd(), "survey_data.json")
+# OCR engine: "tesserocr" (in-process), "pytesseract" (subprocess per page) or "auto" (tesserocr if installed)
+OCR_ENGINE = "auto"
+TESSERACT_LANG = "eng"
+TESSDATA_PATH = os.path.join(os.path.dirname(TESSERACT_CMD), "tessdata")
+
+# Adaptive threshold parameters used by preprocess_image
+THRESHOLD_BLOCK_SIZE = 31
+THRESHOLD_C = 2
+
+# Page rendering resolution and how many pages poppler rasterizes per call
+RENDER_DPI = 200
+RENDER_WINDOW = 1
+
+# Tiered OCR: each page is read with the cheapest tier first and only re-read with the next
+# tier when the mean word confidence (0-100) falls below OCR_CONFIDENCE_THRESHOLD.
+# psm is Tesseract's page segmentation mode (6 = single text block, 3 = full automatic layout).
+OCR_TIERED = True
+OCR_CONFIDENCE_THRESHOLD = 70.0
+OCR_TIERS = [
+    {"name": "fast", "dpi": 150, "psm": 6},
+    {"name": "quality", "dpi": RENDER_DPI, "psm": 3},
+]
+
+# Blank and low-content page filter, run on the raw grayscale render before preprocessing.
+# Pages whose share of ink pixels (darker than BLANK_PAGE_DARK_LEVEL) is below BLANK_PAGE_INK_RATIO
+# are skipped; other pages are cropped to their content plus CONTENT_CROP_MARGIN (fraction of page size).
+# A single printed 12pt line covers about 0.1% of an A4 page, so the ratio sits well below that.
+# Set BLANK_PAGE_INK_RATIO to 0 to OCR every page.
+BLANK_PAGE_INK_RATIO = 0.0002
+BLANK_PAGE_DARK_LEVEL = 128
+CONTENT_CROP_MARGIN = 0.02
+
+# Question header: a numbered line ("1.", "12.", ...) or any line ending in a question mark
+QUESTION_HEADER = re.compile(r"[1-9]\d*\.|.*\?$")
+
+# Number of OCR worker processes used per PDF (1 = serial, in-process OCR)
+OCR_MAX_WORKERS = os.cpu_count() or 1
 
 def preprocess_image(image):
     """
     Preprocesses image for better OCR accuracy.
-    - Converts to grayscale
+    - Converts to grayscale (skipped for pages already rendered in grayscale)
     - Applies adaptive thresholding for better contrast
     """
-    log_stage("Preprocessing Image... 🖼️")
-    image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2GRAY)
-    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 2)
+    log_stage("Preprocessing Image... 🖼️", level=logging.DEBUG)
+    image = np.asarray(image)
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                 THRESHOLD_BLOCK_SIZE, THRESHOLD_C)
 
-def extract_text_from_pdf(pdf_path: str) -> list:
+@lru_cache(maxsize=None)
+def _tesseract_version(engine_name: str, tesseract_cmd: str):
     """
-    Extracts text from a PDF file using OCR.
-    - Converts PDF pages to images
+    Returns the Tesseract version behind an OCR engine, or None if it cannot be determined.
+    - tesserocr reports the library it is linked against, without needing the tesseract CLI
+    - pytesseract asks the CLI at tesseract_cmd
+    """
+    try:
+        if engine_name == "tesserocr":
+            return tesserocr.tesseract_version().splitlines()[0].strip()
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        return str(pytesseract.get_tesseract_version())
+    except Exception as e:
+        log_stage("Tesseract Version Unknown ⚠️", f"{engine_name}: {e}", level=logging.WARNING)
+        return None
+
+def ocr_tiers(dpi: int = None) -> list:
+    """
+    Returns the OCR tiers to run, cheapest first.
+    An explicit DPI, or OCR_TIERED = False, gives a single full-quality tier.
+    """
+    if dpi is not None or not OCR_TIERED:
+        return [dict(OCR_TIERS[-1], dpi=dpi or RENDER_DPI)]
+    return OCR_TIERS
+
+def ocr_settings(dpi: int = None, template=None) -> dict:
+    """
+    Returns every setting that changes OCR output.
+    Used as part of the OCR cache key, so any change here invalidates cached text.
+    """
+    engine_name = resolve_ocr_engine_name()
+    return {
+        "form_template": template.digest if template is not None else None,
+        "ocr_tiers": ocr_tiers(dpi),
+        "ocr_confidence_threshold": OCR_CONFIDENCE_THRESHOLD,
+        "blank_page_ink_ratio": BLANK_PAGE_INK_RATIO,
+        "blank_page_dark_level": BLANK_PAGE_DARK_LEVEL,
+        "content_crop_margin": CONTENT_CROP_MARGIN,
+        "render_grayscale": True,
+        "threshold_block_size": THRESHOLD_BLOCK_SIZE,
+        "threshold_c": THRESHOLD_C,
+        "ocr_engine": engine_name,
+        "tesseract_lang": TESSERACT_LANG,
+        "tesseract_version": _tesseract_version(engine_name, TESSERACT_CMD),
+    }
+
+class OCREngine:
+    """
+    Turns a preprocessed page (a NumPy array from preprocess_image) into text.
+    """
+    name = None
+
+    def image_to_string(self, image) -> str:
+        raise NotImplementedError
+
+    def recognize(self, image, psm: int = None):
+        """
+        Runs OCR and scores it.
+
+        Args:
+            image: Preprocessed page or region.
+            psm (int, optional): Tesseract page segmentation mode. Defaults to Tesseract's own (3).
+
+        Returns:
+            tuple: (text, mean word confidence from 0 to 100; 0 when no words were found)
+        """
+        raise NotImplementedError
+
+class PytesseractEngine(OCREngine):
+    """
+    Runs OCR through pytesseract, which writes a temporary image and starts a
+    new tesseract process (reloading the language model) for every page.
+    """
+    name = "pytesseract"
+
+    def __init__(self):
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+    def image_to_string(self, image) -> str:
+        return pytesseract.image_to_string(image, lang=TESSERACT_LANG)
+
+    def recognize(self, image, psm: int = None):
+        config = f"--psm {psm}" if psm is not None else ""
+        data = pytesseract.image_to_data(image, lang=TESSERACT_LANG, config=config,
+                                         output_type=pytesseract.Output.DICT)
+
+        # Rebuild the text line by line from the word boxes, keeping only recognized words
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if confidence < 0 or not word.strip():
+                continue
+            lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(word)
+            confidences.append(confidence)
+
+        text = "\n".join(" ".join(words) for words in lines.values())
+        return text, (sum(confidences) / len(confidences) if confidences else 0.0)
+
+class TesserocrEngine(OCREngine):
+    """
+    Runs OCR in-process through a Tesseract API handle that stays loaded for the life of the process.
+    Page buffers are handed to Tesseract directly, with no temporary file.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang: str = None):
+        kwargs = {"lang": lang or TESSERACT_LANG}
+        if os.path.isdir(TESSDATA_PATH):
+            kwargs["path"] = TESSDATA_PATH
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def image_to_string(self, image) -> str:
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        self.api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+        return self.api.GetUTF8Text()
+
+    def recognize(self, image, psm: int = None):
+        self.api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm)
+        text = self.image_to_string(image)
+        return text, float(self.api.MeanTextConf()) if text.strip() else 0.0
+
+OCR_ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEngine.name: TesserocrEngine,
+}
+
+_ocr_engine = None  # (pid, engine) for the current process
+
+def resolve_ocr_engine_name(name: str = None) -> str:
+    """Resolves "auto" (or None) to the engine that will actually be used."""
+    name = name or OCR_ENGINE
+    if name == "auto":
+        return TesserocrEngine.name if tesserocr is not None else PytesseractEngine.name
+    if name not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine {name!r}. Must be one of: auto, {', '.join(OCR_ENGINES)}.")
+    if name == TesserocrEngine.name and tesserocr is None:
+        raise ValueError("OCR engine 'tesserocr' requested but the tesserocr package is not installed.")
+    return name
+
+def get_ocr_engine() -> OCREngine:
+    """
+    Returns this process's OCR engine, creating it on first use.
+    Each worker process keeps its own engine, so the language model is loaded once per worker.
+    """
+    global _ocr_engine
+    if _ocr_engine is None or _ocr_engine[0] != os.getpid():
+        engine = OCR_ENGINES[resolve_ocr_engine_name()]()
+        log_stage("OCR Engine Loaded ⚙️", f"Using {engine.name} in process {os.getpid()}.")
+        _ocr_engine = (os.getpid(), engine)
+    return _ocr_engine[1]
+
+def count_pages(pdf_path: str) -> int:
+    """Returns the number of pages in a PDF without rendering it."""
+    return int(pdf2image.pdfinfo_from_path(pdf_path, poppler_path=POPPLER_PATH)["Pages"])
+
+def iter_pages(pdf_path: str, dpi: int = None, window: int = None, first_page: int = 1, last_page: int = None):
+    """
+    Renders PDF pages lazily, a small window at a time.
+    - Renders straight to grayscale
+    - Holds at most `window` pages in memory; each page is released once the caller moves on
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        dpi (int, optional): Rendering resolution. Defaults to RENDER_DPI.
+        window (int, optional): Pages rendered per poppler call. Defaults to RENDER_WINDOW.
+        first_page (int, optional): First page to render (1-based).
+        last_page (int, optional): Last page to render. Defaults to the last page of the PDF.
+
+    Yields:
+        tuple: (page_number, image) with 1-based page numbers.
+    """
+    dpi = dpi or RENDER_DPI
+    window = max(window or RENDER_WINDOW, 1)
+    last_page = last_page or count_pages(pdf_path)
+
+    for window_start in range(first_page, last_page + 1, window):
+        window_end = min(window_start + window - 1, last_page)
+        images = pdf2image.convert_from_path(pdf_path, dpi=dpi, first_page=window_start, last_page=window_end,
+                                   grayscale=True, poppler_path=POPPLER_PATH)
+        page_number = window_start
+        while images:
+            yield page_number, images.pop(0)
+            page_number += 1
+
+def render_page(pdf_path: str, page_number: int, dpi: int = None):
+    """Renders a single PDF page in grayscale."""
+    for _, image in iter_pages(pdf_path, dpi=dpi, window=1, first_page=page_number, last_page=page_number):
+        return image
+    return None
+
+def find_content_box(image):
+    """
+    Locates the printed or written content on a rendered page.
+    - Measures ink density to detect blank pages
+    - Finds the bounding box of the ink, widened by CONTENT_CROP_MARGIN
+
+    Returns:
+        tuple: (top, bottom, left, right) pixel bounds of the content, or None for a blank page.
+    """
+    gray = np.asarray(image)
+    if gray.ndim == 3:
+        gray = gray.mean(axis=2)
+    ink = gray < BLANK_PAGE_DARK_LEVEL
+
+    height, width = ink.shape
+    if BLANK_PAGE_INK_RATIO > 0 and ink.mean() < BLANK_PAGE_INK_RATIO:
+        return None
+
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0:
+        return None if BLANK_PAGE_INK_RATIO > 0 else (0, height, 0, width)
+
+    margin_y = int(height * CONTENT_CROP_MARGIN)
+    margin_x = int(width * CONTENT_CROP_MARGIN)
+    return (max(rows[0] - margin_y, 0), min(rows[-1] + 1 + margin_y, height),
+            max(cols[0] - margin_x, 0), min(cols[-1] + 1 + margin_x, width))
+
+def ocr_page(image, psm: int = None, timings: dict = None):
+    """
+    Runs the per-page OCR pipeline on a single rendered page.
     - Applies preprocessing
-    - Runs OCR using Tesseract
+    - Runs OCR using this process's OCR engine
+    - Returns the page text split into lines, plus its mean word confidence
+
+    Args:
+        timings (dict, optional): Accumulates "preprocess" and "ocr" seconds.
+    """
+    start = time.perf_counter()
+    processed_image = preprocess_image(image)
+    preprocessed = time.perf_counter()
+    text, confidence = get_ocr_engine().recognize(processed_image, psm)
+    if timings is not None:
+        timings["preprocess"] = timings.get("preprocess", 0.0) + preprocessed - start
+        timings["ocr"] = timings.get("ocr", 0.0) + time.perf_counter() - preprocessed
+    return text.split("\n"), confidence
+
+def ocr_pdf_page(pdf_path: str, page_number: int, dpi: int = None, image=None) -> dict:
+    """
+    Reads a single PDF page through the OCR tiers.
+    - Skips blank pages and crops the rest to their content before OCR
+    - Runs the cheapest tier first
+    - Re-renders and re-reads the page with the next tier only while confidence is below the threshold
+    - Keeps the most confident reading
+
+    Kept at module level so it can be shipped to worker processes; each worker renders
+    its own page, so only page numbers (not images) cross the process boundary.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        page_number (int): 1-based page number.
+        dpi (int, optional): Forces a single tier at this DPI.
+        image (optional): The page already rendered at the first tier's DPI, if the caller has it.
+
+    Returns:
+        dict: {"page", "lines", "confidence", "tier", "status", "timings"} for the page, where status is
+            "blank" (skipped), "cropped" or "full" and timings holds render/preprocess/ocr seconds
+            summed over every tier tried.
+    """
+    best = None
+    timings = {"render": 0.0, "preprocess": 0.0, "ocr": 0.0}
+    for level, tier in enumerate(ocr_tiers(dpi)):
+        if level > 0 or image is None:
+            start = time.perf_counter()
+            image = render_page(pdf_path, page_number, tier["dpi"])
+            timings["render"] += time.perf_counter() - start
+
+        content_box = find_content_box(image)
+        if content_box is None:
+            return {"page": page_number, "lines": [], "confidence": None, "tier": None, "status": "blank",
+                    "timings": timings}
+
+        top, bottom, left, right = content_box
+        height, width = np.asarray(image).shape[:2]
+        status = "full" if (top, bottom, left, right) == (0, height, 0, width) else "cropped"
+        if status == "cropped":
+            image = np.asarray(image)[top:bottom, left:right]
+
+        lines, confidence = ocr_page(image, tier["psm"], timings)
+        image = None
+
+        if best is None or confidence > best["confidence"]:
+            best = {"page": page_number, "lines": lines, "confidence": round(confidence, 2),
+                    "tier": tier["name"], "status": status, "timings": timings}
+        if confidence >= OCR_CONFIDENCE_THRESHOLD:
+            break
+        log_stage("Low OCR Confidence on Page %d 🔍 (%.1f with the %s tier)", level=logging.DEBUG,
+                  args=(page_number, confidence, tier["name"]))
+
+    return best
+
+def iter_ocr_pages(pdf_path: str, max_workers: int = None, dpi: int = None):
+    """
+    Extracts text from a PDF file using OCR, yielding each page as soon as it and every page before it are done.
+    - Streams PDF pages to images a few at a time, so peak memory does not grow with page count
+    - Reads each page through the OCR tiers, in parallel when more than one worker is allowed
+    - Yields pages in page order, identical to the serial path
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        max_workers (int, optional): Size of the page worker pool. Defaults to OCR_MAX_WORKERS;
+            1 runs every page serially in the current process.
+        dpi (int, optional): Forces a single OCR tier at this DPI.
+
+    Yields:
+        dict: One {"page", "lines", "confidence", "tier", "status"} dictionary per page.
+    """
+    page_count = count_pages(pdf_path)
+
+    if max_workers is None:
+        max_workers = OCR_MAX_WORKERS
+    max_workers = min(max_workers, page_count)
+
+    if max_workers <= 1:
+        first_tier_dpi = ocr_tiers(dpi)[0]["dpi"]
+        pages = iter_pages(pdf_path, dpi=first_tier_dpi, last_page=page_count)
+        while True:
+            start = time.perf_counter()
+            rendered = next(pages, None)
+            if rendered is None:
+                break
+            render_seconds = time.perf_counter() - start
+            page_number, image = rendered
+            log_stage("Processing Page %d... 🔄", level=logging.DEBUG, args=(page_number,))
+            page = ocr_pdf_page(pdf_path, page_number, dpi, image)
+            page["timings"]["render"] += render_seconds
+            del image, rendered
+            yield page
+    else:
+        log_stage(f"Processing {page_count} Pages in Parallel... 🔄", f"Using {max_workers} worker(s).")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Keep a bounded window of pages in flight and collect them in submission order
+            pending = deque()
+            for page_number in range(1, page_count + 1):
+                pending.append(executor.submit(ocr_pdf_page, pdf_path, page_number, dpi))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+def extract_pages_from_pdf(pdf_path: str, max_workers: int = None, dpi: int = None) -> list:
+    """
+    Extracts text from a PDF file using OCR, page by page. See iter_ocr_pages.
+
+    Returns:
+        list: One {"page", "lines", "confidence", "tier", "status"} dictionary per page.
+    """
+    pages = list(iter_ocr_pages(pdf_path, max_workers, dpi))
+    log_stage("Page Stats 📑", result=page_stats(pages, dpi))
+    return pages
+
+def page_stats(pages: list, dpi: int = None) -> dict:
+    """Counts skipped blank pages, cropped pages and pages re-read at a higher OCR tier."""
+    first_tier = ocr_tiers(dpi)[0]["name"]
+    return {
+        "pages": len(pages),
+        "blank_skipped": sum(1 for page in pages if page.get("status") == "blank"),
+        "cropped": sum(1 for page in pages if page.get("status") == "cropped"),
+        "escalated": sum(1 for page in pages if page["tier"] not in (None, first_tier)),
+    }
+
+def record_page_metrics(pages: list):
+    """
+    Adds freshly OCR'd pages to the metrics registry: per-stage durations and page counts by status.
+
+    Called by whichever process collects the pages, since worker processes have their own registry.
+    """
+    REGISTRY.inc("stlovp_documents_total", method="ocr")
+    for page in pages:
+        REGISTRY.inc("stlovp_pages_total", status=page.get("status", "full"))
+        for stage, seconds in page.get("timings", {}).items():
+            REGISTRY.observe("stlovp_stage_seconds", seconds, stage=stage)
+
+def page_lines(pages: list):
+    """
+    Flattens per-page OCR results.
+
+    Returns:
+        tuple: (lines, confidences) where confidences[i] is the confidence of the page lines[i] came from.
+    """
+    lines, confidences = [], []
+    for page in pages:
+        lines.extend(page["lines"])
+        confidences.extend([page["confidence"]] * len(page["lines"]))
+    return lines, confidences
+
+def extract_text_from_pdf(pdf_path: str, max_workers: int = None, cache=None, dpi: int = None) -> list:
+    """
+    Extracts text from a PDF file using OCR.
+    - Streams PDF pages to images a few at a time, so peak memory does not grow with page count
+    - Applies preprocessing and tiered OCR to each page, in parallel when more than one worker is allowed
+    - Returns lines in page order, identical to the serial path
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        max_workers (int, optional): Size of the page worker pool. Defaults to OCR_MAX_WORKERS;
+            1 runs every page serially in the current process.
+        cache (OCRCache, optional): Cache consulted before, and filled after, running OCR.
+        dpi (int, optional): Forces a single OCR tier at this DPI.
     """
     log_stage(f"Extracting Text from {pdf_path}... 📄")
-    images = convert_from_path(pdf_path, poppler_path=POPPLER_PATH)
-    extracted_text = []
+    pages = None
+    if cache is not None:
+        cache_key = cache.key_for(pdf_path, ocr_settings(dpi))
+        pages = cache.get(cache_key)
+        if pages is not None:
+            log_stage("✅ Text Loaded from OCR Cache!")
 
-    for page_num, image in enumerate(images):
-        log_stage(f"Processing Page {page_num + 1}... 🔄")
-        processed_image = preprocess_image(image)
-        text = pytesseract.image_to_string(processed_image)
-        extracted_text.extend(text.split("\n"))
+    if pages is None:
+        pages = extract_pages_from_pdf(pdf_path, max_workers, dpi)
+        record_page_metrics(pages)
+        if cache is not None:
+            cache.put(cache_key, pages)
+        log_stage("✅ Text Extraction Complete!")
 
-    log_stage("✅ Text Extraction Complete!")
+    extracted_text, _ = page_lines(pages)
     return extracted_text
 
-def parse_survey_responses(survey_type: str, survey_id: str, extracted_text: list) -> Survey:
+def extract_responses_with_template(pdf_path: str, template, dpi: int = None) -> list:
     """
-    Parses extracted text into a structured survey object.
-    - Detects questions based on numbering (1., 2., etc.)
-    - Associates responses with questions
-    - Supports multiple choice and written responses
+    Reads a fixed-layout survey using its form template instead of full-page OCR.
+    - Renders only the pages the template covers
+    - Reads rating and multiple-choice answers from checkbox ink density
+    - Runs OCR only on free-text answer regions
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        template (FormTemplate): Question and answer regions for this form.
+        dpi (int, optional): Rendering resolution. Defaults to RENDER_DPI.
+
+    Returns:
+        list: Response dictionaries in question order.
     """
+    log_stage(f"Reading {pdf_path} with the {template.survey_type} form template... 📐")
+    engine = get_ocr_engine()
+    page_count = count_pages(pdf_path)
     responses = []
-    current_question_id = None
+
+    for page_number in template.pages():
+        if page_number > page_count:
+            log_stage("Template Page Missing! ❌", f"{pdf_path} has no page {page_number}.")
+            continue
+        questions = [q for q in template.questions if q.page == page_number]
+        for _, image in iter_pages(pdf_path, dpi=dpi, window=1, first_page=page_number, last_page=page_number):
+            responses.extend(response.to_dict() for response in read_page_regions(preprocess_image(image), questions, engine))
+
+    return responses
+
+def iter_survey_responses(lines, confidences=None):
+    """
+    Parses OCR lines into responses as the lines arrive.
+    - Detects question headers (numbered "1.", "2.", ... lines, or lines ending in "?") with one compiled matcher
+    - Associates the lines that follow with that question
+    - Yields each Response as soon as the next header (or the end of input) closes it
+
+    Args:
+        lines (iterable): OCR lines; may be a generator fed page by page.
+        confidences (iterable, optional): Page confidence for each line, consumed in step with lines.
+            Each response gets the lowest confidence among its lines.
+
+    Yields:
+        Response: Responses numbered in the order they are found.
+    """
+    question_count = 0
+    in_question = False
     response_buffer = []
+    response_confidence = None
+    confidences = iter(confidences) if confidences is not None else None
 
-    for line in extracted_text:
+    for line in lines:
+        line_confidence = next(confidences) if confidences is not None else None
         line = line.strip()
         if not line:
             continue  # Skip empty lines
 
-        # Detect question numbers (e.g., "1. How interested are you...?")
-        if line.endswith("?") or any(line.startswith(f"{i}.") for i in range(1, 21)):
-            if current_question_id is not None and response_buffer:
-                responses.append(Response(current_question_id, response_buffer))
-
-            current_question_id = len(responses) + 1
+        if QUESTION_HEADER.match(line):
+            if in_question and response_buffer:
+                question_count += 1
+                yield Response(question_count, response_buffer, response_confidence)
+            in_question = True
             response_buffer = []
-        elif current_question_id:
+            response_confidence = None
+        elif in_question:
             response_buffer.append(line)
+            if line_confidence is not None:
+                response_confidence = line_confidence if response_confidence is None else min(response_confidence, line_confidence)
 
-    # Add last response if there is any remaining data
-    if current_question_id and response_buffer:
-        responses.append(Response(current_question_id, response_buffer))
+    # Emit the last response if there is any remaining data
+    if in_question and response_buffer:
+        yield Response(question_count + 1, response_buffer, response_confidence)
 
-    return Survey(survey_type, survey_id, responses)
+def parse_survey_responses(survey_type: str, survey_id: str, extracted_text, confidences=None) -> Survey:
+    """
+    Parses extracted text into a structured survey object.
+    - Detects questions based on numbering (1., 2., etc.)
+    - Associates responses with questions
+    - Supports multiple choice and written responses
+    - Tags each response with the lowest page confidence among its lines, when confidences are given
+
+    See iter_survey_responses for the streaming parser this wraps.
+    """
+    return Survey(survey_type, survey_id, list(iter_survey_responses(extracted_text, confidences)))
 
 def save_to_json(survey_type: str, survey_folder: str):
     """
-    Extracts text from all PDFs in the given folder and saves structured survey responses to JSON.
-    - Detects new surveys and appends data without overwriting
+    Extracts text from all PDFs in the given folder and saves structured survey responses to the survey store.
+    - Detects new surveys and adds them without overwriting others
     - Ensures correct survey categorization ("Resident" or "Stakeholder")
     - Prevents duplicate survey entries
-    """
-    log_stage(f"Processing {survey_type} Surveys... 📊")
-
-    # Load or initialize the data store
-    if os.path.exists(DATASTORE_PATH):
-        with open(DATASTORE_PATH, "r", encoding="utf-8") as f:
-            try:
-                data_store = json.load(f)
-            except json.JSONDecodeError:
-                data_store = {"Resident": [], "Stakeholder": []}
-    else:
-        data_store = {"Resident": [], "Stakeholder": []}
-
-    existing_surveys = {(s["survey_id"], s["survey_type"]) for s in data_store[survey_type]}
-
-    for filename in os.listdir(survey_folder):
-        if filename.lower().endswith(".pdf"):
-            pdf_path = os.path.join(survey_folder, filename)
-            log_stage(f"Extracting text from {filename}... 📄")
-
-            extracted_text = extract_text_from_pdf(pdf_path)
-            if extracted_text:
-                survey = parse_survey_responses(survey_type, filename, extracted_text)
 
-                if (survey.survey_id, survey.survey_type) not in existing_surveys:
-                    data_store[survey_type].append(survey.to_dict())
-
-    # Save the updated data store
-    with open(DATASTORE_PATH, "w", encoding="utf-8") as f:
-        json.dump(data_store, f, indent=4)
-
-    log_stage(f"✅ Survey Data Saved to {DATASTORE_PATH}")
+    Runs through the shared ingestion scheduler; see app.ingest.ingest_surveys.
+    """
+    from app.ingest import ingest_surveys  # Imported here to avoid a circular import
 
+    log_stage(f"Processing {survey_type} Surveys... 📊")
+    ingest_surveys({survey_type: survey_folder}, datastore_path=DATASTORE_PATH)
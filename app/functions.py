@@ -2,7 +2,7 @@ def my_function():
     return {"message": "Hello from my_function!"}
 import os
 
-import os
+import logging
 from app.console_logger import log_stage
 
 def get_survey_info(directory_path: str) -> dict:
@@ -25,10 +25,12 @@ def get_survey_info(directory_path: str) -> dict:
         log_stage("Directory Not Found! ❌", "Returning default empty response.", result)
         return result
 
-    files = [f for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
+    with os.scandir(directory_path) as entries:
+        files = [entry.name for entry in entries if entry.is_file()]
     result = {"exists": True, "file_count": len(files), "file_names": files}
 
-    log_stage("Survey Info Retrieved! ✅", f"Found {len(files)} file(s).", result)
+    log_stage("Survey Info Retrieved! ✅", f"Found {len(files)} file(s).")
+    log_stage("Survey Files 📄", directory_path, result, level=logging.DEBUG)
     return result
 
 def get_resident_survey_info() -> dict:
@@ -0,0 +1,314 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from app.extract_text import (extract_pages_from_pdf, extract_responses_with_template, parse_survey_responses,
+                              page_lines, page_stats, ocr_settings, record_page_metrics)
+from app.form_templates import load_form_template
+from app.models import Response, Survey
+from app.datastore import open_store
+from app.aggregates import cached_aggregates
+from app.search import cached_search_index
+from app.ocr_cache import OCRCache
+from app.manifest import FileManifest
+from app.console_logger import log_stage
+from app.metrics import REGISTRY
+
+# Survey folders scanned by a full ingestion run
+SURVEY_FOLDERS = {
+    "Resident": os.path.join("surveys", "resident"),
+    "Stakeholder": os.path.join("surveys", "stakeholder"),
+}
+
+# Number of documents OCR'd concurrently
+INGEST_MAX_WORKERS = os.cpu_count() or 1
+
+def scan_survey_tree(survey_folders: dict) -> dict:
+    """
+    Indexes every PDF under the survey folders, including subfolders, with one scandir pass per directory.
+
+    Returns:
+        dict: pdf_path -> (survey_type, size, mtime_ns).
+    """
+    index = {}
+    for survey_type, survey_folder in survey_folders.items():
+        pending_dirs = [survey_folder]
+        while pending_dirs:
+            try:
+                entries = list(os.scandir(pending_dirs.pop()))
+            except OSError:
+                continue  # Missing or vanished folder
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        stat = entry.stat()
+                        index[entry.path] = (survey_type, stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue  # Deleted between listing and stat
+    return index
+
+def survey_id_for(survey_folder: str, pdf_path: str) -> str:
+    """
+    Returns the survey id of a PDF: its path relative to its survey folder, with "/" separators.
+    Files directly in the folder keep their filename, and same-named files in different subfolders stay distinct.
+    """
+    return os.path.relpath(pdf_path, survey_folder).replace(os.sep, "/")
+
+def find_survey_pdfs(survey_folders: dict) -> list:
+    """
+    Lists every PDF in the given survey folders, including their subfolders.
+
+    Args:
+        survey_folders (dict): Maps survey type ("Resident" or "Stakeholder") to a folder path.
+
+    Returns:
+        list: (survey_type, survey_id, pdf_path) tuples, sorted by folder then survey id (see survey_id_for).
+    """
+    jobs = []
+    for survey_type, survey_folder in survey_folders.items():
+        if not os.path.isdir(survey_folder):
+            log_stage("Survey Folder Not Found! ❌", f"Skipping {survey_folder}")
+            continue
+        pdf_paths = scan_survey_tree({survey_type: survey_folder})
+        jobs.extend(sorted((survey_type, survey_id_for(survey_folder, pdf_path), pdf_path) for pdf_path in pdf_paths))
+    return jobs
+
+def pending_survey_pdfs(survey_folders: dict = None, datastore_path: str = None, manifest: FileManifest = None) -> list:
+    """
+    Lists the PDFs an ingestion run would need to look at, using only directory listings and file stats.
+
+    A file is pending when it is not in the manifest, its size or mtime changed, or its survey
+    is missing from the store. Files whose last extraction failed or found no text are recorded
+    with an outcome and are not pending again until they change. An empty list means the survey
+    store is up to date.
+
+    Returns:
+        list: (survey_type, filename, pdf_path) tuples.
+    """
+    manifest = manifest or FileManifest()
+    stored_surveys = open_store(datastore_path).survey_keys()
+    pending = []
+    for survey_type, filename, pdf_path in find_survey_pdfs(survey_folders or SURVEY_FOLDERS):
+        if manifest.is_current(pdf_path) and ((survey_type, filename) in stored_surveys
+                                              or manifest.entry(pdf_path).get("outcome") in ("failed", "empty")):
+            continue
+        pending.append((survey_type, filename, pdf_path))
+    return pending
+
+def extract_pdf(pdf_path: str, page_workers: int = 1, template=None) -> list:
+    """
+    Runs the extraction step for one PDF.
+
+    Kept at module level so it can be shipped to worker processes.
+
+    Returns:
+        list: Response dictionaries when a form template is given, otherwise per-page OCR results.
+    """
+    if template is not None:
+        return extract_responses_with_template(pdf_path, template)
+    return extract_pages_from_pdf(pdf_path, page_workers)
+
+def build_survey(survey_type: str, survey_id: str, extracted_output: list, template=None) -> Survey:
+    """
+    Turns the output of extract_pdf for one PDF into a Survey.
+
+    Args:
+        survey_type (str): Either "Resident" or "Stakeholder".
+        survey_id (str): The PDF's filename.
+        extracted_output (list): Response dictionaries (template-read forms) or per-page OCR results.
+        template (FormTemplate, optional): The template the PDF was read with, if any.
+    """
+    if template is not None:
+        return Survey(survey_type, survey_id, [Response.from_dict(r) for r in extracted_output])
+    with REGISTRY.timed("stlovp_stage_seconds", stage="parse"):
+        lines, confidences = page_lines(extracted_output)
+        return parse_survey_responses(survey_type, survey_id, lines, confidences)
+
+def save_ingested_surveys(store, surveys: list, aggregates=None, search_index=None):
+    """
+    Saves a batch of surveys, updating the store's answer aggregates and search index incrementally
+    when they are already built.
+
+    Only an index that matches the store before this save can be updated in place, and only if it
+    still does when the deltas are applied (a concurrent sync may rebuild it after the save);
+    otherwise it is rebuilt on its next sync.
+    """
+    aggregates = aggregates or cached_aggregates(store.path)
+    search_index = search_index or cached_search_index(store.path)
+    version = store.version()
+    in_sync = aggregates is not None and aggregates.version == version
+    search_in_sync = search_index is not None and search_index.version == version
+    replaced = [store.get_survey(s.survey_type, s.survey_id) for s in surveys] if in_sync else []
+    with REGISTRY.timed("stlovp_stage_seconds", stage="datastore_write"):
+        store.save_surveys(surveys)
+    saved_version = store.version()
+    if in_sync:
+        aggregates.update(surveys, [survey for survey in replaced if survey is not None], saved_version,
+                          base_version=version)
+    if search_in_sync:
+        search_index.update(surveys, version=saved_version, base_version=version)
+
+def ingest_surveys(survey_folders: dict = None, max_workers: int = None, max_in_flight: int = None,
+                   datastore_path: str = None, cache: OCRCache = None, manifest: FileManifest = None,
+                   templates: dict = None, aggregates=None, pdfs: list = None, failed: list = None) -> list:
+    """
+    Extracts every survey PDF from all survey folders through one shared worker pool.
+    - Queues PDFs from every survey type into the same pool
+    - Skips files the manifest shows as unchanged before any rendering
+    - Logs and skips files deleted or renamed since they were found
+    - Reads forms that have a form template from their question regions instead of full-page OCR
+    - Bounds the number of documents in flight
+    - Reuses cached OCR text for PDFs whose content has been seen before
+    - Logs and skips a PDF whose extraction fails or finds no text, recording that outcome in the manifest
+      so serve's auto mode does not retry it until it changes (explicit runs still retry it)
+    - Saves results to the survey store in a single atomic batch at the end,
+      replacing the entry of any survey whose file was modified
+    - Updates the store's answer aggregates and search index incrementally when they are already built
+
+    Args:
+        survey_folders (dict, optional): Maps survey type to folder. Defaults to SURVEY_FOLDERS.
+        max_workers (int, optional): Worker processes. Defaults to INGEST_MAX_WORKERS; 1 runs serially.
+        max_in_flight (int, optional): Documents submitted but not yet finished. Defaults to 2 * max_workers.
+        datastore_path (str, optional): Survey store location, see datastore.open_store. Defaults to DATASTORE_PATH.
+        cache (OCRCache, optional): OCR result cache. Defaults to an OCRCache in OCR_CACHE_DIR.
+        manifest (FileManifest, optional): Ingested file manifest. Defaults to a FileManifest at MANIFEST_PATH.
+        templates (dict, optional): Maps survey type to FormTemplate. Defaults to the templates in FORM_TEMPLATE_DIR.
+        aggregates (AnswerAggregates, optional): Aggregate index to update. Defaults to the store's index, if built.
+        pdfs (list, optional): Only ingest these (survey_type, filename, pdf_path) tuples instead of every
+            PDF in survey_folders.
+        failed (list, optional): Receives the path of every PDF that could not be extracted.
+
+    Returns:
+        list: The Survey objects that were added or replaced.
+    """
+    survey_folders = survey_folders or SURVEY_FOLDERS
+    max_workers = max_workers or INGEST_MAX_WORKERS
+    max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+
+    cache = cache or OCRCache()
+    manifest = manifest or FileManifest()
+
+    jobs = pdfs if pdfs is not None else find_survey_pdfs(survey_folders)
+    log_stage("Ingesting Surveys... 📊", f"{len(jobs)} PDF(s) found across {len(survey_folders)} folder(s).")
+
+    store = open_store(datastore_path)
+    stored_surveys = store.survey_keys()
+
+    # Drop unchanged files before any rendering or OCR
+    changed_jobs = []
+    for survey_type, filename, pdf_path in jobs:
+        try:
+            status, record = manifest.check(pdf_path)
+        except OSError as e:
+            # Deleted or renamed since the folder scan; a later scan picks up its new name
+            log_stage("Survey PDF Unreadable ⚠️", f"{pdf_path}: {e}")
+            continue
+        if status == "unchanged" and (survey_type, filename) in stored_surveys:
+            continue
+        changed_jobs.append((survey_type, filename, pdf_path, record))
+    log_stage("Manifest Checked 🗂️", f"{len(jobs) - len(changed_jobs)} unchanged, {len(changed_jobs)} to extract.")
+
+    if templates is None:
+        templates = {survey_type: load_form_template(survey_type) for survey_type in survey_folders}
+
+    # Serve previously seen content from the cache; only misses are sent to the workers.
+    # Template-read forms cache response dicts, other forms cache per-page OCR results.
+    extracted = {}
+    cache_keys = {}
+    misses = []
+    for survey_type, filename, pdf_path, record in changed_jobs:
+        settings = ocr_settings(template=templates.get(survey_type))
+        cache_keys[pdf_path] = cache.key_for(pdf_path, settings, content_hash=record["sha256"])
+        cached_text = cache.get(cache_keys[pdf_path])
+        if cached_text is None:
+            misses.append((pdf_path, templates.get(survey_type)))
+        else:
+            extracted[pdf_path] = cached_text
+
+    # Spread spare workers over pages when there are fewer documents than workers
+    page_workers = max(1, max_workers // max(len(misses), 1))
+
+    failures = {}
+
+    def extraction_failed(pdf_path: str, error: Exception):
+        failures[pdf_path] = error
+        log_stage("Survey Extraction Failed! ❌", f"{pdf_path}: {error}")
+
+    extraction_start = time.perf_counter()
+    if max_workers <= 1 or len(misses) <= 1:
+        for pdf_path, template in misses:
+            try:
+                extracted[pdf_path] = extract_pdf(pdf_path, page_workers, template)
+            except Exception as e:
+                extraction_failed(pdf_path, e)
+                continue
+            cache.put(cache_keys[pdf_path], extracted[pdf_path])
+    else:
+        pending = {}
+        queue = iter(misses)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                # Top the window back up before waiting on the next completion
+                for pdf_path, template in queue:
+                    pending[executor.submit(extract_pdf, pdf_path, page_workers, template)] = pdf_path
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path = pending.pop(future)
+                    try:
+                        extracted[pdf_path] = future.result()
+                    except Exception as e:
+                        extraction_failed(pdf_path, e)
+                        continue
+                    cache.put(cache_keys[pdf_path], extracted[pdf_path])
+
+    # Worker processes keep their own metrics, so record what they extracted here
+    extraction_seconds = time.perf_counter() - extraction_start
+    fresh_pages = 0
+    for pdf_path, template in misses:
+        if template is not None:
+            REGISTRY.inc("stlovp_documents_total", method="template")
+        elif extracted.get(pdf_path):
+            record_page_metrics(extracted[pdf_path])
+            fresh_pages += len(extracted[pdf_path])
+    if fresh_pages and extraction_seconds > 0:
+        REGISTRY.set("stlovp_ingest_pages_per_second", fresh_pages / extraction_seconds)
+
+    # Merge in queue order so the data store layout does not depend on completion order
+    surveys = []
+    totals = Counter()
+    for survey_type, filename, pdf_path, record in changed_jobs:
+        if pdf_path in failures:
+            manifest.record(pdf_path, record, survey_type=survey_type, survey_id=filename, outcome="failed")
+            continue
+        extracted_output = extracted.get(pdf_path)
+        if not extracted_output:
+            manifest.record(pdf_path, record, survey_type=survey_type, survey_id=filename, outcome="empty")
+            continue
+        try:
+            survey = build_survey(survey_type, filename, extracted_output, templates.get(survey_type))
+        except Exception as e:
+            extraction_failed(pdf_path, e)
+            manifest.record(pdf_path, record, survey_type=survey_type, survey_id=filename, outcome="failed")
+            continue
+        if templates.get(survey_type) is None:
+            totals.update(page_stats(extracted_output))
+        surveys.append(survey)
+        manifest.record(pdf_path, record, survey_type=survey_type, survey_id=filename)
+    if failed is not None:
+        failed.extend(failures)
+
+    log_stage("OCR Cache Stats 📦", result=cache.stats())
+    log_stage("Page Stats 📑", result=dict(totals))
+    if surveys:
+        save_ingested_surveys(store, surveys, aggregates)
+        log_stage(f"✅ Survey Data Saved to {store.path}", f"{len(surveys)} survey(s) added or replaced.")
+    if failures:
+        log_stage("Some Surveys Failed ⚠️", f"{len(failures)} PDF(s) will be retried when ingested again or changed.")
+    manifest.save()
+    return surveys
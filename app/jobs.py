@@ -0,0 +1,190 @@
+import os
+import time
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from app.ingest import SURVEY_FOLDERS, extract_pdf, build_survey, save_ingested_surveys
+from app.extract_text import record_page_metrics
+from app.form_templates import load_form_template
+from app.datastore import open_store
+from app.manifest import FileManifest
+from app.console_logger import log_stage
+
+# Uploaded PDFs wait here until their job moves them into the survey folder
+UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
+
+# Worker threads (and OCR processes) for uploaded PDFs, and how many uploads may wait before new ones are rejected
+JOB_WORKERS = 2
+JOB_QUEUE_SIZE = 32
+
+# Finished jobs kept for status lookups before the oldest are forgotten
+JOB_HISTORY = 1000
+
+class QueueFull(Exception):
+    """Raised when an upload is submitted while the job queue is at capacity."""
+
+class SurveyExists(Exception):
+    """Raised when an upload would replace a stored, filed or in-progress survey of the same type and name."""
+
+class JobQueue:
+    """
+    Bounded queue of uploaded PDFs processed by background workers.
+    - submit() returns a job id immediately and raises QueueFull instead of queuing without limit
+    - Each worker thread runs OCR in a shared process pool, so the web process stays responsive
+    - A finished job's survey is saved to the survey store and its PDF moved into the survey folder
+    """
+    def __init__(self, datastore_path: str = None, workers: int = None, max_queued: int = None,
+                 upload_dir: str = None, survey_folders: dict = None, manifest: FileManifest = None,
+                 use_processes: bool = True):
+        """
+        Initialize a job queue. Workers start on the first submit.
+
+        Args:
+            datastore_path (str, optional): Survey store location. Defaults to DATASTORE_PATH.
+            workers (int, optional): Concurrent jobs. Defaults to JOB_WORKERS.
+            max_queued (int, optional): Jobs waiting for a worker before submit() raises QueueFull. Defaults to JOB_QUEUE_SIZE.
+            upload_dir (str, optional): Staging folder for uploads. Defaults to UPLOAD_DIR.
+            survey_folders (dict, optional): Where finished PDFs are filed, by survey type. Defaults to SURVEY_FOLDERS.
+            manifest (FileManifest, optional): Manifest recording filed PDFs, so ingestion does not OCR them again.
+            use_processes (bool, optional): Run OCR in worker processes; False runs it in the worker threads.
+        """
+        self.datastore_path = datastore_path
+        self.workers = workers or JOB_WORKERS
+        self.upload_dir = upload_dir or UPLOAD_DIR
+        self.survey_folders = survey_folders or SURVEY_FOLDERS
+        self.manifest = manifest or FileManifest()
+        self.use_processes = use_processes
+        self.jobs = OrderedDict()
+        self._queue = queue.Queue(maxsize=max_queued or JOB_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._threads = []
+        self._store = None
+
+    def _start(self):
+        if self._threads:
+            return
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"ocr-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, survey_type: str, filename: str, save_upload) -> str:
+        """
+        Stages an uploaded PDF and queues it for extraction.
+
+        Args:
+            survey_type (str): Either "Resident" or "Stakeholder".
+            filename (str): The survey id the PDF will be stored under.
+            save_upload (callable): Writes the upload to the path it is given.
+
+        Returns:
+            str: The job id.
+
+        Raises:
+            QueueFull: If max_queued jobs are already waiting.
+            SurveyExists: If a survey with this type and filename is stored, filed or still being processed.
+        """
+        job_id = uuid.uuid4().hex
+        job = {"job_id": job_id, "status": "queued", "survey_type": survey_type, "survey_id": filename,
+               "submitted_at": time.time()}
+        with self._lock:
+            # Reserve the name under the lock so two uploads of the same file cannot both be queued
+            if self._survey_exists(survey_type, filename):
+                raise SurveyExists(f"A {survey_type} survey named {filename} already exists.")
+            if self._queue.full():
+                raise QueueFull("Job queue is full.")
+            self._start()
+            self.jobs[job_id] = job
+
+        os.makedirs(self.upload_dir, exist_ok=True)
+        staged_path = os.path.join(self.upload_dir, f"{job_id}.pdf")
+        try:
+            save_upload(staged_path)
+        except Exception:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+            raise
+        try:
+            self._queue.put_nowait((job_id, staged_path))
+        except queue.Full:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+            os.remove(staged_path)
+            raise QueueFull("Job queue is full.")
+        return job_id
+
+    def _survey_exists(self, survey_type: str, filename: str) -> bool:
+        for job in self.jobs.values():
+            in_progress = job["status"] in ("queued", "running")
+            if in_progress and job["survey_type"] == survey_type and job["survey_id"] == filename:
+                return True
+        if os.path.exists(os.path.join(self.survey_folders[survey_type], filename)):
+            return True
+        if self._store is None:
+            self._store = open_store(self.datastore_path)
+        return self._store.get_survey(survey_type, filename) is not None
+
+    def status(self, job_id: str):
+        """Returns a copy of a job's state, or None for an unknown (or long forgotten) job."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+            if fields.get("status") in ("done", "failed"):
+                finished = [key for key, job in self.jobs.items() if job["status"] in ("done", "failed")]
+                for key in finished[:max(len(finished) - JOB_HISTORY, 0)]:
+                    del self.jobs[key]
+
+    def _extract(self, pdf_path: str, template) -> list:
+        if self._executor is None:
+            return extract_pdf(pdf_path, 1, template)
+        return self._executor.submit(extract_pdf, pdf_path, 1, template).result()
+
+    def _work(self):
+        store = open_store(self.datastore_path)
+        while True:
+            job_id, staged_path = self._queue.get()
+            job = self.status(job_id)
+            self._update(job_id, status="running", started_at=time.time())
+            try:
+                survey_type, filename = job["survey_type"], job["survey_id"]
+                template = load_form_template(survey_type)
+                extracted_output = self._extract(staged_path, template)
+                if template is None:
+                    record_page_metrics(extracted_output)
+                survey = build_survey(survey_type, filename, extracted_output, template)
+                save_ingested_surveys(store, [survey])
+
+                # File the PDF with the rest of its survey type so later ingestion runs see it as unchanged
+                survey_folder = self.survey_folders[survey_type]
+                os.makedirs(survey_folder, exist_ok=True)
+                pdf_path = os.path.join(survey_folder, filename)
+                os.replace(staged_path, pdf_path)
+                with self._lock:
+                    # Reload so entries written by ingestion runs or workers since the last upload are kept
+                    self.manifest = FileManifest(self.manifest.manifest_path)
+                    _, record = self.manifest.check(pdf_path)
+                    self.manifest.record(pdf_path, record, survey_type=survey_type, survey_id=filename)
+                    self.manifest.save()
+
+                self._update(job_id, status="done", finished_at=time.time(), result=survey.to_dict())
+                log_stage("Upload Processed ✅", f"{survey_type}: {filename} ({len(survey.responses)} response(s))")
+            except Exception as e:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+                self._update(job_id, status="failed", finished_at=time.time(), error=str(e))
+                log_stage("Upload Failed! ❌", f"{job['survey_id']}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Blocks until every queued job has finished."""
+        self._queue.join()
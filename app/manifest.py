@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+from app.console_logger import log_stage
+
+# Manifest of every ingested survey file
+MANIFEST_PATH = os.path.join(os.getcwd(), "survey_manifest.json")
+
+def file_digest(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class FileManifest:
+    """
+    Records the path, size, mtime and content hash of every ingested file.
+
+    Lets ingestion decide whether a file needs OCR before rendering it:
+    a matching size and mtime is trusted as unchanged, and the content hash is
+    only computed when those differ.
+    """
+    def __init__(self, manifest_path: str = None):
+        """
+        Initialize a manifest, loading any previously saved entries.
+
+        Args:
+            manifest_path (str, optional): Manifest file location. Defaults to MANIFEST_PATH.
+        """
+        self.manifest_path = manifest_path or MANIFEST_PATH
+        self.entries = {}
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                try:
+                    self.entries = json.load(f)
+                except json.JSONDecodeError:
+                    log_stage("Manifest Unreadable! ❌", "Every file will be checked by content hash.")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path)
+
+    def check(self, path: str):
+        """
+        Compares a file against its manifest entry.
+
+        Returns:
+            tuple: (status, record) where status is "new", "modified" or "unchanged" and
+                record holds the file's current size, mtime and sha256.
+        """
+        stat = os.stat(path)
+        entry = self.entries.get(self._key(path))
+
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return "unchanged", entry
+
+        record = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": file_digest(path)}
+        if entry is None:
+            return "new", record
+        if entry["sha256"] == record["sha256"]:
+            # Touched but not edited: refresh the stat fields so the next check is hash-free
+            entry.update(size=record["size"], mtime=record["mtime"])
+            return "unchanged", entry
+        return "modified", record
+
+    def is_current(self, path: str) -> bool:
+        """Returns whether a file's size and mtime match its manifest entry, without reading the file."""
+        entry = self.entries.get(self._key(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+
+    def entry(self, path: str):
+        """Returns a file's manifest entry, or None if it was never recorded."""
+        return self.entries.get(self._key(path))
+
+    def record(self, path: str, record: dict, **fields):
+        """
+        Stores a file's current size, mtime and sha256, plus any extra fields such as survey_type.
+
+        Fields from an earlier entry (such as a failed outcome) are not carried over.
+        """
+        self.entries[self._key(path)] = dict({name: record[name] for name in ("size", "mtime", "sha256")}, **fields)
+
+    def save(self):
+        """Writes the manifest atomically."""
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4)
+        os.replace(temp_path, self.manifest_path)
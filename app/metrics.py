@@ -0,0 +1,113 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms, rendered in the Prometheus text format.
+
+    Metrics are declared once with a help string and then updated by name, with
+    optional labels (e.g. stage="ocr"). Updates take a lock and touch a few numbers,
+    so they are cheap enough for per-page use.
+    """
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = {}  # name -> {"type", "help", "buckets", "values": {label key: value}}
+        self._lock = threading.Lock()
+
+    def _declare(self, name: str, metric_type: str, help_text: str, buckets: tuple = None):
+        with self._lock:
+            self._metrics.setdefault(name, {"type": metric_type, "help": help_text, "buckets": buckets, "values": {}})
+
+    def counter(self, name: str, help_text: str):
+        """Declares a counter."""
+        self._declare(name, "counter", help_text)
+
+    def gauge(self, name: str, help_text: str):
+        """Declares a gauge."""
+        self._declare(name, "gauge", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        """Declares a histogram."""
+        self._declare(name, "histogram", help_text, tuple(sorted(buckets)))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Adds to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            values = self._metrics[name]["values"]
+            values[key] = values.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        """Sets a gauge."""
+        with self._lock:
+            self._metrics[name]["values"][_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Records one observation in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            metric = self._metrics[name]
+            series = metric["values"].get(key)
+            if series is None:
+                series = metric["values"][key] = {"buckets": [0] * len(metric["buckets"]), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(metric["buckets"]):
+                if value <= bound:
+                    series["buckets"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def timed(self, name: str, **labels):
+        """Observes the duration of the with-block in a histogram, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def value(self, name: str, **labels):
+        """Returns a counter or gauge value, or a histogram's {"buckets", "sum", "count"}; None if never updated."""
+        with self._lock:
+            return self._metrics[name]["values"].get(_label_key(labels))
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, metric in sorted(self._metrics.items()):
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for labels, value in sorted(metric["values"].items()):
+                    if metric["type"] != "histogram":
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(metric["buckets"], value["buckets"]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value['count']}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {value['sum']}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+# The app's metrics, served on /metrics
+REGISTRY = MetricsRegistry()
+REGISTRY.histogram("stlovp_stage_seconds", "Time spent per pipeline stage (render, preprocess, ocr, parse, datastore_write).")
+REGISTRY.counter("stlovp_pages_total", "PDF pages OCR'd, by status (blank, cropped, full).")
+REGISTRY.counter("stlovp_documents_total", "Survey PDFs extracted, by method (ocr, template).")
+REGISTRY.counter("stlovp_ocr_cache_hits_total", "OCR cache lookups that returned stored results.")
+REGISTRY.counter("stlovp_ocr_cache_misses_total", "OCR cache lookups that found nothing.")
+REGISTRY.gauge("stlovp_ingest_pages_per_second", "Pages OCR'd per second of extraction time in the last ingestion run.")
@@ -1,32 +1,56 @@
+import sys
+import json
+import math
+from array import array
 from typing import List, Dict, Union
 from app.console_logger import log_stage
 
+def response_text(response) -> str:
+    """Returns the text of a response: its lines joined, or the value itself."""
+    if isinstance(response, list):
+        return "\n".join(str(item) for item in response)
+    return str(response)
+
 class Response:
     """
     Represents a single response to a survey question.
     """
-    def __init__(self, question_id: int, response: Union[str, int, List[str]]):
+    __slots__ = ("question_id", "response", "confidence")
+
+    def __init__(self, question_id: int, response: Union[str, int, List[str]], confidence: float = None):
         """
         Initialize a response object.
 
         Args:
             question_id (int): The unique ID of the question.
             response (Union[str, int, List[str]]): The response value.
+            confidence (float, optional): OCR confidence (0-100) of the page the response was read from.
         """
         self.question_id = question_id
         self.response = response
+        self.confidence = confidence
 
     def to_dict(self) -> Dict:
-        """Converts response data to a dictionary format."""
-        return {
+        """Converts response data to a dictionary format. Confidence is only included when known."""
+        data = {
             "question_id": self.question_id,
             "response": self.response
         }
+        if self.confidence is not None:
+            data["confidence"] = self.confidence
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Response":
+        """Creates a response from its dictionary format."""
+        return cls(data["question_id"], data["response"], data.get("confidence"))
 
 class Survey:
     """
     Represents a survey containing multiple questions and responses.
     """
+    __slots__ = ("survey_type", "survey_id", "responses")
+
     def __init__(self, survey_type: str, survey_id: str, responses: list):
         """
         Initialize a survey object.
@@ -34,7 +58,7 @@ class Survey:
         Args:
             survey_type (str): Either "Resident" or "Stakeholder".
             survey_id (str): Unique ID for the survey file.
-            responses (list): List of response dictionaries.
+            responses (list): Response objects (plain response dictionaries are also accepted).
         """
         if survey_type not in ["Resident", "Stakeholder"]:
             raise ValueError("Invalid survey type. Must be 'Resident' or 'Stakeholder'.")
@@ -48,6 +72,144 @@ class Survey:
         return {
             "survey_type": self.survey_type,
             "survey_id": self.survey_id,
-            "responses": [resp.to_dict() if hasattr(resp, "to_dict") else resp for resp in self.responses]
+            "responses": [resp.to_dict() if isinstance(resp, Response) else resp for resp in self.responses]
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Survey":
+        """Creates a survey, with Response objects, from its dictionary format."""
+        return cls(data["survey_type"], data["survey_id"], [Response.from_dict(resp) for resp in data["responses"]])
+
+
+class SurveyTable:
+    """
+    Column-oriented store for many surveys, for loading large datasets into memory.
+    - Survey types, survey ids and answers are interned: each distinct value is kept once
+      and referenced by an integer code
+    - Per-response question ids, answer codes and confidences live in typed arrays
+    - Survey i's responses are rows offsets[i]:offsets[i + 1]
+
+    Converts to and from the Survey dictionary format without loss.
+    """
+    def __init__(self):
+        """Initialize an empty table."""
+        self.survey_types = []           # Distinct survey types, indexed by type code
+        self.type_codes = array("B")     # Type code per survey
+        self.survey_ids = []             # Interned survey id per survey
+        self.offsets = array("I", [0])   # First response row of each survey, plus the end
+        self.question_ids = array("i")   # Question id per response
+        self.answer_codes = array("I")   # Answer code per response
+        self.confidences = array("d")    # Confidence per response, NaN when unknown
+        self.answers = []                # Distinct answer values, indexed by answer code
+        self._answer_index = {}
+        self._type_index = {}
+
+    def __len__(self) -> int:
+        return len(self.survey_ids)
+
+    @staticmethod
+    def _answer_key(value):
+        """Returns a hashable key that tells apart answers that compare equal but serialize differently (4, 4.0, True, "4")."""
+        if isinstance(value, list):
+            return list, tuple(value)
+        return type(value), value
+
+    def _intern_answer(self, value) -> int:
+        key = self._answer_key(value)
+        code = self._answer_index.get(key)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            elif isinstance(value, list):
+                value = [sys.intern(item) if isinstance(item, str) else item for item in value]
+            code = len(self.answers)
+            self.answers.append(value)
+            self._answer_index[key] = code
+        return code
+
+    def _intern_type(self, survey_type: str) -> int:
+        code = self._type_index.get(survey_type)
+        if code is None:
+            code = len(self.survey_types)
+            self.survey_types.append(survey_type)
+            self._type_index[survey_type] = code
+        return code
+
+    def append(self, survey: Union[Survey, Dict]):
+        """Adds one survey, given as a Survey or in its dictionary format."""
+        if isinstance(survey, Survey):
+            survey = survey.to_dict()
+        self.type_codes.append(self._intern_type(survey["survey_type"]))
+        self.survey_ids.append(sys.intern(survey["survey_id"]))
+        for response in survey["responses"]:
+            confidence = response.get("confidence")
+            self.question_ids.append(response["question_id"])
+            self.answer_codes.append(self._intern_answer(response["response"]))
+            self.confidences.append(math.nan if confidence is None else confidence)
+        self.offsets.append(len(self.question_ids))
+
+    @classmethod
+    def from_surveys(cls, surveys) -> "SurveyTable":
+        """Builds a table from Survey objects or survey dictionaries."""
+        table = cls()
+        for survey in surveys:
+            table.append(survey)
+        return table
+
+    from_dicts = from_surveys
+
+    def survey_index(self) -> array:
+        """Returns the survey position of every response row."""
+        rows = array("I")
+        for index in range(len(self)):
+            rows.extend([index] * (self.offsets[index + 1] - self.offsets[index]))
+        return rows
+
+    def _response_dict(self, row: int) -> Dict:
+        answer = self.answers[self.answer_codes[row]]
+        data = {
+            "question_id": self.question_ids[row],
+            "response": list(answer) if isinstance(answer, list) else answer
+        }
+        confidence = self.confidences[row]
+        if not math.isnan(confidence):
+            data["confidence"] = confidence
+        return data
+
+    def to_dicts(self) -> list:
+        """Returns every survey in its dictionary format, in insertion order."""
+        return [{
+            "survey_type": self.survey_types[self.type_codes[index]],
+            "survey_id": self.survey_ids[index],
+            "responses": [self._response_dict(row) for row in range(self.offsets[index], self.offsets[index + 1])]
+        } for index in range(len(self))]
+
+    def to_surveys(self) -> list:
+        """Returns every survey as a Survey object with Response objects."""
+        return [Survey.from_dict(data) for data in self.to_dicts()]
+
+    def to_json(self) -> str:
+        """
+        Serializes every survey to the same JSON text as json.dumps(self.to_dicts()).
+
+        Each distinct answer and survey type is encoded once and reused, so no
+        intermediate dictionaries are built.
+        """
+        encoded_answers = [json.dumps(answer) for answer in self.answers]
+        encoded_types = [json.dumps(survey_type) for survey_type in self.survey_types]
+        question_ids, answer_codes, confidences = self.question_ids, self.answer_codes, self.confidences
+
+        surveys = []
+        for index in range(len(self)):
+            responses = []
+            for row in range(self.offsets[index], self.offsets[index + 1]):
+                confidence = confidences[row]
+                if math.isnan(confidence):
+                    responses.append(f'{{"question_id": {question_ids[row]}, "response": {encoded_answers[answer_codes[row]]}}}')
+                else:
+                    responses.append(f'{{"question_id": {question_ids[row]}, "response": {encoded_answers[answer_codes[row]]}, '
+                                     f'"confidence": {confidence!r}}}')
+            surveys.append(f'{{"survey_type": {encoded_types[self.type_codes[index]]}, '
+                           f'"survey_id": {json.dumps(self.survey_ids[index])}, '
+                           f'"responses": [{", ".join(responses)}]}}')
+        return f"[{', '.join(surveys)}]"
@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+from app.console_logger import log_stage
+from app.manifest import file_digest
+from app.metrics import REGISTRY
+
+# On-disk OCR cache location and size cap
+OCR_CACHE_DIR = os.path.join(os.getcwd(), ".ocr_cache")
+OCR_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+class OCRCache:
+    """
+    Content-addressed on-disk cache of OCR results.
+
+    Entries are keyed by a hash of the PDF bytes plus the preprocessing and OCR
+    settings, so editing a file or changing a setting never returns stale text.
+    The least recently used entries are evicted once the cache exceeds max_bytes.
+    """
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Initialize a cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding cache entries. Defaults to OCR_CACHE_DIR.
+            max_bytes (int, optional): Size cap for all entries. Defaults to OCR_CACHE_MAX_BYTES.
+        """
+        self.cache_dir = cache_dir or OCR_CACHE_DIR
+        self.max_bytes = max_bytes or OCR_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # Total entry size, computed on first write
+
+    def key_for(self, pdf_path: str, settings: dict, content_hash: str = None) -> str:
+        """
+        Returns the cache key for a PDF under the given OCR settings.
+
+        Args:
+            pdf_path (str): Path to the PDF file.
+            settings (dict): Preprocessing and OCR settings, see extract_text.ocr_settings.
+            content_hash (str, optional): SHA-256 of the PDF if already known; computed otherwise.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        digest.update((content_hash or file_digest(pdf_path)).encode("ascii"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str):
+        """
+        Looks up cached OCR output.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            REGISTRY.inc("stlovp_ocr_cache_misses_total")
+            return None
+
+        # Bump the modification time so eviction sees this entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        REGISTRY.inc("stlovp_ocr_cache_hits_total")
+        return value
+
+    def put(self, key: str, value):
+        """Stores OCR output under the given key, evicting old entries if over the size cap."""
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        previous_size = os.path.getsize(entry_path) if os.path.exists(entry_path) else 0
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(temp_path, entry_path)
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += os.path.getsize(entry_path) - previous_size
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """Yields (path, size, mtime) for every cache entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits within max_bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for path, size, _ in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            evicted += 1
+
+        log_stage("OCR Cache Eviction 🧹", f"Removed {evicted} entry(ies).")
+
+    def stats(self) -> dict:
+        """Returns hit and miss counts for this cache instance."""
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,9 +1,199 @@
-from flask import Blueprint, jsonify
+import hashlib
+from flask import Blueprint, jsonify, current_app, request, url_for, stream_with_context
+from werkzeug.utils import secure_filename
 from app.functions import my_function
+from app.datastore import open_store, SURVEY_TYPES
+from app.aggregates import get_aggregates
+from app.jobs import JobQueue, QueueFull, SurveyExists
+from app.metrics import REGISTRY
+from app.export import iter_export, EXPORT_FORMATS
+from app.search import get_search_index, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.survey_cache import get_survey_snapshot, encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 routes_bp = Blueprint('routes', __name__)
 
+def get_store():
+    """Returns the app's survey store, opening it on first use."""
+    store = current_app.extensions.get("survey_store")
+    if store is None:
+        store = open_store(current_app.config["DATASTORE_PATH"])
+        current_app.extensions["survey_store"] = store
+    return store
+
+def get_job_queue() -> JobQueue:
+    """Returns the app's upload job queue, creating it on first use."""
+    job_queue = current_app.extensions.get("job_queue")
+    if job_queue is None:
+        job_queue = JobQueue(current_app.config["DATASTORE_PATH"], workers=current_app.config["JOB_WORKERS"],
+                             max_queued=current_app.config["JOB_QUEUE_SIZE"],
+                             upload_dir=current_app.config["UPLOAD_DIR"])
+        current_app.extensions["job_queue"] = job_queue
+    return job_queue
+
+def resolve_survey_type(survey_type: str):
+    """Maps a URL survey type ("resident", "Resident", ...) to its stored name, or None."""
+    return {name.lower(): name for name in SURVEY_TYPES}.get(survey_type.lower())
+
+def conditional_json(version: str, build_payload):
+    """
+    Returns a JSON response tagged with an ETag for this store version and request URL.
+
+    A matching If-None-Match gets a 304 before the payload is built.
+    """
+    etag = hashlib.sha1(f"{version} {request.full_path}".encode("utf-8")).hexdigest()
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
 @routes_bp.route('/')
 def hello_world():
     result = my_function()
     return jsonify(result)
+
+@routes_bp.route('/metrics')
+def metrics():
+    """Pipeline counters and stage timings in the Prometheus text format."""
+    return current_app.response_class(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@routes_bp.route('/api/aggregates/<survey_type>')
+def survey_aggregates(survey_type):
+    """Answer distributions for every question of one survey type."""
+    survey_type = resolve_survey_type(survey_type)
+    if survey_type is None:
+        return jsonify({"error": "Unknown survey type."}), 404
+    return jsonify(get_aggregates(get_store()).summary(survey_type))
+
+@routes_bp.route('/api/aggregates/<survey_type>/<int:question_id>')
+def question_aggregates(survey_type, question_id):
+    """Answer distribution for a single question."""
+    survey_type = resolve_survey_type(survey_type)
+    if survey_type is None:
+        return jsonify({"error": "Unknown survey type."}), 404
+    distribution = get_aggregates(get_store()).question(survey_type, question_id)
+    if distribution is None:
+        return jsonify({"error": "No responses for this question."}), 404
+    return jsonify(dict(distribution, survey_type=survey_type, question_id=question_id))
+
+@routes_bp.route('/api/surveys')
+def list_surveys():
+    """
+    Lists surveys, optionally filtered by ?type= and ?survey_id=, a page at a time.
+
+    Pass the returned next_cursor as ?cursor= to get the following page.
+    """
+    survey_type = request.args.get("type")
+    if survey_type is not None:
+        survey_type = resolve_survey_type(survey_type)
+        if survey_type is None:
+            return jsonify({"error": "Unknown survey type."}), 404
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        cursor = decode_cursor(request.args["cursor"]) if "cursor" in request.args else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    snapshot = get_survey_snapshot(get_store())
+
+    def build_payload():
+        surveys, next_key = snapshot.page(survey_type, request.args.get("survey_id"), cursor, limit)
+        return {"surveys": surveys, "next_cursor": encode_cursor(next_key) if next_key else None}
+
+    return conditional_json(snapshot.version, build_payload)
+
+@routes_bp.route('/api/surveys/<survey_type>/<path:survey_id>')
+def get_survey(survey_type, survey_id):
+    """Returns a single survey."""
+    survey_type = resolve_survey_type(survey_type)
+    snapshot = get_survey_snapshot(get_store())
+    survey = snapshot.get(survey_type, survey_id) if survey_type else None
+    if survey is None:
+        return jsonify({"error": "Survey not found."}), 404
+    return conditional_json(snapshot.version, lambda: survey)
+
+@routes_bp.route('/api/search')
+def search_responses():
+    """
+    Full-text search over survey responses (?q=), optionally filtered by ?type= and ?question_id=.
+
+    Hits are ranked best first and tolerate OCR misreads in both the query and the stored text.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Missing search query."}), 400
+    survey_type = request.args.get("type")
+    if survey_type is not None:
+        survey_type = resolve_survey_type(survey_type)
+        if survey_type is None:
+            return jsonify({"error": "Unknown survey type."}), 404
+    try:
+        question_id = int(request.args["question_id"]) if "question_id" in request.args else None
+        limit = min(max(int(request.args.get("limit", DEFAULT_SEARCH_LIMIT)), 1), MAX_SEARCH_LIMIT)
+    except ValueError:
+        return jsonify({"error": "question_id and limit must be integers."}), 400
+
+    index = get_search_index(get_store())
+    return conditional_json(index.version, lambda: dict(index.search(query, survey_type, question_id, limit),
+                                                        query=query))
+
+@routes_bp.route('/api/export')
+def export_surveys():
+    """
+    Streams every stored response, one row per question, as ?format=csv (default) or parquet.
+
+    Repeat ?type= to export several survey types. The body is sent in chunks as it is
+    read from the store, so large exports are never held in memory.
+    """
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "Unknown export format."}), 400
+    survey_types = [resolve_survey_type(survey_type) for survey_type in request.args.getlist("type")]
+    if None in survey_types:
+        return jsonify({"error": "Unknown survey type."}), 404
+    try:
+        chunks = iter_export(get_store(), export_format, survey_types or None)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 501
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return current_app.response_class(stream_with_context(chunks), mimetype=mimetype, headers={
+        "Content-Disposition": f"attachment; filename=surveys.{extension}"})
+
+@routes_bp.route('/api/uploads', methods=['POST'])
+def upload_survey():
+    """
+    Accepts a survey PDF (form fields: file, survey_type) and queues it for OCR.
+
+    Returns 202 with the job id right away, 409 when a survey of that type and filename already
+    exists (rename the file to upload it), or 503 when the job queue is full.
+    """
+    upload = request.files.get("file")
+    survey_type = resolve_survey_type(request.form.get("survey_type", ""))
+    filename = secure_filename(upload.filename) if upload else ""
+    if survey_type is None:
+        return jsonify({"error": "survey_type must be Resident or Stakeholder."}), 400
+    if not filename.lower().endswith(".pdf"):
+        return jsonify({"error": "A PDF file is required."}), 400
+
+    try:
+        job_id = get_job_queue().submit(survey_type, filename, upload.save)
+    except QueueFull as e:
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+    except SurveyExists as e:
+        return jsonify({"error": str(e)}), 409
+
+    status_url = url_for("routes.job_status", job_id=job_id)
+    return jsonify({"job_id": job_id, "status_url": status_url}), 202, {"Location": status_url}
+
+@routes_bp.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Returns an upload job's status, and its survey once done."""
+    job = get_job_queue().status(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job)
@@ -0,0 +1,260 @@
+import re
+import math
+import heapq
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+import numpy as np
+from app.models import response_text
+from app.store_index import StoreIndex, StoreRegistry
+from app.console_logger import log_stage
+
+# Smallest trigram (Dice) similarity for a misspelled index term to match a query term, and how many such terms to try
+FUZZY_MIN_SIMILARITY = 0.5
+FUZZY_MAX_EXPANSIONS = 10
+
+# Query terms shorter than this only match exactly
+FUZZY_MIN_LENGTH = 4
+
+# Hits returned per search by default, and the most a request may ask for
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# BM25 ranking parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9|]+")
+
+# Characters OCR commonly reads in place of letters, undone inside words that also contain letters
+OCR_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "5": "s", "8": "b", "|": "l"})
+
+def tokenize(text: str) -> list:
+    """
+    Splits text into normalized search terms.
+    - Folds case, accents and curly quotes
+    - Undoes common OCR letter/digit confusions inside words ("c0mputer" becomes "computer", "5kills" becomes "skills")
+    - Drops stray single characters and punctuation, keeping numbers such as rating values
+    """
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    terms = []
+    for token in TOKEN_PATTERN.findall(text):
+        has_letters = any(c.isalpha() for c in token)
+        if has_letters and not token.isalpha():
+            token = token.translate(OCR_CONFUSIONS)
+        elif not has_letters:
+            token = token.replace("|", "")
+            if not token:
+                continue
+        if len(token) > 1 or token.isdigit():
+            terms.append(token)
+    return terms
+
+def trigrams(term: str) -> set:
+    """Returns the character trigrams of a term, with word boundary markers."""
+    padded = f"^{term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex(StoreIndex):
+    """
+    Inverted index over survey responses, kept up to date as surveys are ingested.
+    - One document per response, holding its survey type, survey id and question id for filtering
+    - Terms are matched exactly and through a trigram index of the vocabulary, so OCR misreads
+      ("lnterested", "interestcd") still find each other
+    - Hits are ranked with BM25, scored with numpy over each term's postings so common words
+      stay fast on large stores
+    """
+    def __init__(self):
+        """Initialize an empty index."""
+        self.docs = {}          # doc_id -> (survey_type, survey_id, question_id, response)
+        self.doc_terms = {}     # doc_id -> Counter of terms
+        self.postings = {}      # term -> {doc_id: term frequency}
+        self.term_trigrams = {} # trigram -> set of terms
+        self.survey_docs = {}   # (survey_type, survey_id) -> doc ids
+        self.type_codes = {}    # survey_type -> code used in doc_types
+        self.doc_types = array("i")      # Per doc_id columns, for vectorized filtering and scoring
+        self.doc_questions = array("i")
+        self.doc_lengths = array("d")
+        self.total_length = 0
+        self.version = None     # Store version the index reflects
+        self._posting_arrays = {}  # term -> (doc ids, frequencies) as numpy arrays, built on first search
+        self._lock = threading.Lock()
+
+    def _add_survey(self, survey):
+        doc_ids = []
+        type_code = self.type_codes.setdefault(survey.survey_type, len(self.type_codes))
+        for response in survey.responses:
+            terms = Counter(tokenize(response_text(response.response)))
+            if not terms:
+                continue
+            doc_id = len(self.doc_lengths)
+            length = sum(terms.values())
+            self.docs[doc_id] = (survey.survey_type, survey.survey_id, response.question_id, response.response)
+            self.doc_terms[doc_id] = terms
+            self.doc_types.append(type_code)
+            self.doc_questions.append(response.question_id)
+            self.doc_lengths.append(length)
+            self.total_length += length
+            for term, frequency in terms.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    for trigram in trigrams(term):
+                        self.term_trigrams.setdefault(trigram, set()).add(term)
+                postings[doc_id] = frequency
+                self._posting_arrays.pop(term, None)
+            doc_ids.append(doc_id)
+        self.survey_docs[(survey.survey_type, survey.survey_id)] = doc_ids
+
+    def _remove_survey(self, survey_type: str, survey_id: str):
+        # Removed doc ids are not reused; they simply no longer appear in any postings
+        for doc_id in self.survey_docs.pop((survey_type, survey_id), []):
+            del self.docs[doc_id]
+            self.total_length -= self.doc_lengths[doc_id]
+            for term in self.doc_terms.pop(doc_id):
+                postings = self.postings[term]
+                del postings[doc_id]
+                self._posting_arrays.pop(term, None)
+                if not postings:
+                    del self.postings[term]
+                    for trigram in trigrams(term):
+                        self.term_trigrams[trigram].discard(term)
+
+    def update(self, surveys: list, version: str = None, base_version: str = None) -> bool:
+        """
+        Indexes newly saved surveys, replacing any earlier copy of the same survey.
+
+        Args:
+            surveys (list): Survey objects that were just saved.
+            version (str, optional): Store version after the save.
+            base_version (str, optional): Store version before the save. If the index no longer
+                reflects it, the surveys are not indexed and the index is marked stale instead.
+
+        Returns:
+            bool: Whether the surveys were indexed.
+        """
+        with self._lock:
+            if base_version is not None and self.version != base_version:
+                self.version = None
+                return False
+            for survey in surveys:
+                self._remove_survey(survey.survey_type, survey.survey_id)
+                self._add_survey(survey)
+            if version is not None:
+                self.version = version
+            return True
+
+    def rebuild(self, surveys, version: str = None):
+        """Replaces the index contents with the given surveys."""
+        fresh = SearchIndex()
+        for survey in surveys:
+            fresh._add_survey(survey)
+        fresh.version = version
+        with self._lock:
+            for name, value in vars(fresh).items():
+                if name != "_lock":
+                    setattr(self, name, value)
+        log_stage("Search Index Rebuilt 🔎", f"{len(self.survey_docs)} survey(s), {len(self.docs)} response(s), "
+                                             f"{len(self.postings)} term(s).")
+
+    def rebuild_from_store(self, store, version: str):
+        self.rebuild(store.iter_surveys(), version)
+
+    def _expand(self, term: str) -> list:
+        """Returns (index term, similarity) pairs a query term matches: itself plus close OCR variants."""
+        matches = {term: 1.0} if term in self.postings else {}
+        if len(term) < FUZZY_MIN_LENGTH:
+            return list(matches.items())
+
+        query_trigrams = trigrams(term)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.term_trigrams.get(trigram, ()))
+        candidates = []
+        for candidate, count in shared.items():
+            if candidate == term:
+                continue
+            # A term of n characters has n boundary-padded trigrams
+            similarity = min(2 * count / (len(query_trigrams) + len(candidate)), 1.0)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                candidates.append((similarity, candidate))
+        for similarity, candidate in heapq.nlargest(FUZZY_MAX_EXPANSIONS, candidates):
+            matches[candidate] = similarity
+        return list(matches.items())
+
+    def _posting_array(self, term: str) -> tuple:
+        """Returns a term's postings as (doc ids, frequencies) numpy arrays."""
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            postings = self.postings[term]
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+            self._posting_arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, survey_type: str = None, question_id: int = None,
+               limit: int = DEFAULT_SEARCH_LIMIT) -> dict:
+        """
+        Finds the responses that best match a query.
+
+        Args:
+            query (str): Free text.
+            survey_type (str, optional): Only search this survey type.
+            question_id (int, optional): Only search answers to this question.
+            limit (int, optional): Most hits returned.
+
+        Returns:
+            dict: {"total": matching responses, "hits": [{"survey_type", "survey_id", "question_id",
+                "response", "score"}, ...]} with the best hits first.
+        """
+        with self._lock:
+            doc_count = len(self.docs)
+            terms = set(tokenize(query))
+            if not doc_count or not terms or (survey_type is not None and survey_type not in self.type_codes):
+                return {"total": 0, "hits": []}
+
+            lengths = np.frombuffer(self.doc_lengths, dtype=np.float64)
+            allowed = None
+            if survey_type is not None:
+                allowed = np.frombuffer(self.doc_types, dtype=np.int32) == self.type_codes[survey_type]
+            if question_id is not None:
+                on_question = np.frombuffer(self.doc_questions, dtype=np.int32) == question_id
+                allowed = on_question if allowed is None else allowed & on_question
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self.total_length / doc_count))
+
+            scores = np.zeros(len(lengths))
+            for term in terms:
+                # A term counts once per response, through its best-matching spelling
+                term_scores = np.zeros(len(lengths))
+                for match, similarity in self._expand(term):
+                    doc_ids, frequencies = self._posting_array(match)
+                    idf = math.log(1 + (doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                    if allowed is not None:
+                        keep = allowed[doc_ids]
+                        doc_ids, frequencies = doc_ids[keep], frequencies[keep]
+                    weights = similarity * idf * frequencies * (BM25_K1 + 1) / (frequencies + length_norm[doc_ids])
+                    term_scores[doc_ids] = np.maximum(term_scores[doc_ids], weights)
+                scores += term_scores
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            hits = []
+            for doc_id in sorted(matched.tolist(), key=lambda doc_id: (-scores[doc_id], doc_id)):
+                found_type, survey_id, found_question, response = self.docs[doc_id]
+                hits.append({"survey_type": found_type, "survey_id": survey_id, "question_id": found_question,
+                             "response": response, "score": round(float(scores[doc_id]), 4)})
+            return {"total": int(np.count_nonzero(scores)), "hits": hits}
+
+_search_indexes = StoreRegistry(SearchIndex)
+
+def get_search_index(store) -> SearchIndex:
+    """Returns the search index for a survey store, synced with its current contents."""
+    index = _search_indexes.for_store(store)
+    index.sync(store)
+    return index
+
+def cached_search_index(store_path: str):
+    """Returns the search index already built for a store path, or None."""
+    return _search_indexes.cached(store_path)
@@ -0,0 +1,47 @@
+import threading
+
+class StoreIndex:
+    """
+    Base for in-memory indexes derived from a survey store's contents.
+    - version records the store version the index reflects
+    - sync() rebuilds the index from the store whenever the store changed behind it
+    """
+    version = None
+
+    def rebuild_from_store(self, store, version: str):
+        """Replaces the index contents with the store's surveys, as of the given store version."""
+        raise NotImplementedError
+
+    def sync(self, store):
+        """Rebuilds the index from the store if the store changed since the index was last updated."""
+        version = store.version()
+        if version != self.version:
+            self.rebuild_from_store(store, version)
+
+class StoreRegistry:
+    """
+    Keeps one object (index or cache) per survey store path, shared by the API and by
+    ingestion runs in the same process.
+    """
+    def __init__(self, factory):
+        """
+        Initialize an empty registry.
+
+        Args:
+            factory (callable): Creates the object for a store seen for the first time.
+        """
+        self.factory = factory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def for_store(self, store):
+        """Returns the store's object, creating it on first use."""
+        with self._lock:
+            entry = self._entries.get(store.path)
+            if entry is None:
+                entry = self._entries[store.path] = self.factory()
+        return entry
+
+    def cached(self, store_path: str):
+        """Returns the object already created for a store path, or None."""
+        return self._entries.get(store_path)
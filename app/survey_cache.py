@@ -0,0 +1,119 @@
+import json
+import base64
+import bisect
+import threading
+from app.store_index import StoreRegistry
+from app.console_logger import log_stage
+
+# Page size for survey listings when the request does not ask for one, and the largest page served
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(key: tuple) -> str:
+    """Encodes the (survey_type, survey_id) of the last survey on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        survey_type, survey_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}.") from e
+    return str(survey_type), str(survey_id)
+
+class SurveySnapshot:
+    """
+    Every stored survey in dictionary format, as of one store version.
+
+    Surveys are sorted by (survey_type, survey_id), which is also the pagination order,
+    so a cursor stays valid when surveys are added or replaced between pages.
+    """
+    def __init__(self, version: str, surveys: list):
+        """
+        Initialize a snapshot.
+
+        Args:
+            version (str): Store version the surveys were read at.
+            surveys (list): Survey dictionaries.
+        """
+        self.version = version
+        self.surveys = sorted(surveys, key=lambda survey: (survey["survey_type"], survey["survey_id"]))
+        self.keys = [(survey["survey_type"], survey["survey_id"]) for survey in self.surveys]
+        self.id_positions = {}  # survey_id -> ascending positions in keys, for ?survey_id= listings
+        for position, (_, survey_id) in enumerate(self.keys):
+            self.id_positions.setdefault(survey_id, []).append(position)
+
+    def get(self, survey_type: str, survey_id: str):
+        """Returns one survey dictionary, or None."""
+        position = bisect.bisect_left(self.keys, (survey_type, survey_id))
+        if position < len(self.keys) and self.keys[position] == (survey_type, survey_id):
+            return self.surveys[position]
+        return None
+
+    def page(self, survey_type: str = None, survey_id: str = None, cursor: tuple = None,
+             limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Returns one page of surveys after the cursor.
+
+        Args:
+            survey_type (str, optional): Only list surveys of this type.
+            survey_id (str, optional): Only list surveys with this id.
+            cursor (tuple, optional): (survey_type, survey_id) of the last survey on the previous page.
+            limit (int, optional): Page size.
+
+        Returns:
+            tuple: (survey dictionaries, key of the last one if more matching surveys follow, else None).
+        """
+        start = bisect.bisect_right(self.keys, cursor) if cursor else 0
+        if survey_type is not None:
+            # Surveys of one type are contiguous, so jump straight to them
+            start = max(start, bisect.bisect_left(self.keys, (survey_type,)))
+            end = bisect.bisect_left(self.keys, (survey_type + "\0",))
+        else:
+            end = len(self.keys)
+
+        if survey_id is None:
+            positions = range(start, end)
+        else:
+            # Filter before slicing the page, so a cursor is only returned when another match exists
+            matches = self.id_positions.get(survey_id, [])
+            positions = matches[bisect.bisect_left(matches, start):bisect.bisect_left(matches, end)]
+
+        page = [self.surveys[position] for position in positions[:limit]]
+        next_key = self.keys[positions[limit - 1]] if len(positions) > limit else None
+        return page, next_key
+
+class SurveyReadCache:
+    """
+    In-memory copy of a survey store for the read API.
+
+    The store is only re-read when its version changes, so serving a request costs
+    one version check plus the work for the page itself.
+    """
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def get(self, store) -> SurveySnapshot:
+        """Returns a snapshot matching the store's current version, reloading it if the store changed."""
+        version = store.version()
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != version:
+            with self._lock:
+                if self.snapshot is None or self.snapshot.version != version:
+                    self.snapshot = SurveySnapshot(version, [survey.to_dict() for survey in store.iter_surveys()])
+                    log_stage("Survey Cache Reloaded 🔄", f"{len(self.snapshot.surveys)} survey(s) at version {version}.")
+                snapshot = self.snapshot
+        return snapshot
+
+_read_caches = StoreRegistry(SurveyReadCache)
+
+def get_survey_snapshot(store) -> SurveySnapshot:
+    """Returns the cached snapshot of a survey store, reloading it if the store changed."""
+    return _read_caches.for_store(store).get(store)
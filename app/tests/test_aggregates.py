@@ -0,0 +1,51 @@
+from app.aggregates import AnswerAggregates, get_aggregates
+from app.datastore import open_store
+from app.models import Response, Survey, SurveyTable
+
+SURVEYS = [
+    Survey("Resident", "resident1.pdf", [Response(1, "4 - Interested"), Response(2, ["Evenings", "Weekends"])]),
+    Survey("Resident", "resident2.pdf", [Response(1, "4 - Interested"), Response(2, ["Evenings"])]),
+    Survey("Stakeholder", "stakeholder1.pdf", [Response(1, "Yes")]),
+]
+
+def test_rebuild_counts_answers_per_question():
+    """Test that a full rebuild counts every answer, splitting list responses into their entries."""
+    index = AnswerAggregates()
+    index.rebuild(SurveyTable.from_surveys(SURVEYS))
+
+    assert index.summary("Resident") == {
+        "survey_type": "Resident",
+        "surveys": 2,
+        "questions": {
+            "1": {"responses": 2, "answers": {"4 - Interested": 2}},
+            "2": {"responses": 2, "answers": {"Evenings": 2, "Weekends": 1}},
+        },
+    }
+    assert index.question("Stakeholder", 1) == {"responses": 1, "answers": {"Yes": 1}}
+    assert index.question("Stakeholder", 2) is None
+
+def test_incremental_update_matches_rebuild():
+    """Test that adding and replacing surveys one batch at a time gives the same counts as a rebuild."""
+    rescanned = Survey("Resident", "resident1.pdf", [Response(1, "5 - Very Interested")])
+    incremental = AnswerAggregates()
+    incremental.update(SURVEYS[:2])
+    incremental.update(SURVEYS[2:])
+    incremental.update([rescanned], replaced=[SURVEYS[0]])
+
+    rebuilt = AnswerAggregates()
+    rebuilt.rebuild(SurveyTable.from_surveys([rescanned] + SURVEYS[1:]))
+
+    for survey_type in ("Resident", "Stakeholder"):
+        assert incremental.summary(survey_type) == rebuilt.summary(survey_type)
+
+def test_get_aggregates_rebuilds_only_when_store_changes(tmp_path):
+    """Test that the shared index is rebuilt after the store changes and reused otherwise."""
+    store = open_store(str(tmp_path / "survey_data.db"))
+    store.save_surveys(SURVEYS[:1])
+
+    index = get_aggregates(store)
+    version = index.version
+    assert get_aggregates(store) is index and index.version == version
+
+    store.save_surveys(SURVEYS[1:])
+    assert get_aggregates(store).summary("Resident")["surveys"] == 2
@@ -5,3 +5,15 @@ def test_app_creation():
     app = create_app()
     assert app is not None
     assert app.config["TESTING"] is False  # Default should be False
+
+
+def test_app_import_defers_ocr_libraries():
+    """Ensure importing the web app does not load OpenCV, pytesseract or pdf2image."""
+    import subprocess
+    import sys
+    check = ("import sys, app; "
+             "loaded = [m for m in ('cv2', 'pytesseract', 'pdf2image') "
+             "if m in sys.modules and type(sys.modules[m]).__name__ == 'module']; "
+             "print(','.join(loaded))")
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
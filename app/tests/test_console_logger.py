@@ -0,0 +1,44 @@
+import io
+import json
+import logging
+import pytest
+from app.console_logger import configure_logging, flush_logging, log_stage
+
+@pytest.fixture
+def log_output():
+    """Routes the app logger into a buffer and restores the defaults afterwards."""
+    buffer = io.StringIO()
+    yield buffer
+    configure_logging()
+
+def test_log_stage_console_block(log_output):
+    """Test that the console format keeps the original separator block."""
+    configure_logging("INFO", "console", log_output)
+    log_stage("Survey Info Retrieved! ✅", "Found 2 file(s).", {"file_count": 2})
+    flush_logging()
+
+    assert log_output.getvalue() == ("\n" + "=" * 50 + "\nSurvey Info Retrieved! ✅\n   ➝ Found 2 file(s).\n"
+                                     "   ✅ Result: {'file_count': 2}\n" + "=" * 50 + "\n\n")
+
+def test_log_stage_json_lines(log_output):
+    """Test that the JSON format writes one object per stage, with args applied to the title."""
+    configure_logging("DEBUG", "json", log_output)
+    log_stage("Processing Page %d... 🔄", level=logging.DEBUG, args=(3,))
+    log_stage("Page Stats 📑", result={"pages": 3})
+    flush_logging()
+
+    entries = [json.loads(line) for line in log_output.getvalue().splitlines()]
+    assert [(e["level"], e["title"]) for e in entries] == [("DEBUG", "Processing Page 3... 🔄"), ("INFO", "Page Stats 📑")]
+    assert entries[1]["result"] == {"pages": 3}
+
+def test_disabled_level_skips_formatting(log_output):
+    """Test that a stage below the configured level is dropped before its args are formatted."""
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("formatted a disabled log stage")
+
+    configure_logging("INFO", "console", log_output)
+    log_stage("Page %s", result=Unformattable(), level=logging.DEBUG, args=(Unformattable(),))
+    flush_logging()
+
+    assert log_output.getvalue() == ""
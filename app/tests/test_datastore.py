@@ -0,0 +1,68 @@
+import json
+import pytest
+from app.models import Response, Survey
+from app.datastore import JSONSurveyStore, SQLiteSurveyStore, open_store
+
+@pytest.fixture(params=["survey_data.db", "survey_data.json"])
+def store(request, tmp_path):
+    """Opens an empty store for each backend."""
+    return open_store(str(tmp_path / request.param))
+
+def test_store_save_and_filter(store):
+    """Test that saved surveys can be listed and filtered by type and id."""
+    store.save_surveys([
+        Survey("Resident", "resident1.pdf", [Response(1, ["4 - Interested"]), Response(2, ["Evenings"])]),
+        Survey("Stakeholder", "stakeholder1.pdf", [Response(1, ["Yes"])]),
+        Survey("Resident", "resident2.pdf", []),
+    ])
+
+    assert [s.survey_id for s in store.iter_surveys("Resident")] == ["resident1.pdf", "resident2.pdf"]
+    assert store.get_survey("Resident", "resident1.pdf").to_dict()["responses"] == [
+        {"question_id": 1, "response": ["4 - Interested"]},
+        {"question_id": 2, "response": ["Evenings"]},
+    ]
+    assert store.get_survey("Resident", "resident2.pdf").responses == []
+    assert store.get_survey("Stakeholder", "resident1.pdf") is None
+    assert store.survey_keys() == {("Resident", "resident1.pdf"), ("Resident", "resident2.pdf"),
+                                   ("Stakeholder", "stakeholder1.pdf")}
+
+def test_store_save_replaces_existing_survey(store):
+    """Test that saving a survey again replaces it and changes the store version."""
+    store.save_surveys([Survey("Resident", "resident1.pdf", [Response(1, ["3 - Neutral"])])])
+    version = store.version()
+
+    store.save_surveys([Survey("Resident", "resident1.pdf", [Response(1, ["5 - Very Interested"])])])
+
+    assert store.version() != version
+    assert store.to_dict()["Resident"] == [{
+        "survey_type": "Resident",
+        "survey_id": "resident1.pdf",
+        "responses": [{"question_id": 1, "response": ["5 - Very Interested"]}],
+    }]
+
+def test_sqlite_store_migrates_legacy_json_once(tmp_path):
+    """Test that the JSON file beside a new SQLite store is imported, with duplicates collapsed, only once."""
+    legacy = {"Resident": [
+        {"survey_type": "Resident", "survey_id": "mock_survey.pdf", "responses": []},
+        {"survey_type": "Resident", "survey_id": "mock_survey.pdf", "responses": [{"question_id": 1, "response": ["4"]}]},
+    ], "Stakeholder": []}
+    (tmp_path / "survey_data.json").write_text(json.dumps(legacy))
+
+    store = open_store(str(tmp_path / "survey_data.db"))
+    assert isinstance(store, SQLiteSurveyStore)
+    assert store.to_dict()["Resident"] == [legacy["Resident"][1]]
+
+    (tmp_path / "survey_data.json").write_text(json.dumps({"Resident": [], "Stakeholder": []}))
+    store.save_surveys([Survey("Resident", "resident1.pdf", [])])
+    reopened = open_store(str(tmp_path / "survey_data.db"))
+    assert reopened.survey_keys() == {("Resident", "mock_survey.pdf"), ("Resident", "resident1.pdf")}
+
+def test_json_store_refuses_corrupt_file(tmp_path):
+    """Test that a corrupt JSON store raises instead of being overwritten with an empty one."""
+    path = tmp_path / "survey_data.json"
+    path.write_text('{"Resident": [')
+    store = JSONSurveyStore(str(path))
+
+    with pytest.raises(ValueError):
+        store.save_surveys([Survey("Resident", "resident1.pdf", [])])
+    assert path.read_text() == '{"Resident": ['
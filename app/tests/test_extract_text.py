@@ -1,5 +1,5 @@
 import os
-import json
+import shutil
 import pytest
 import sys
 
@@ -12,7 +12,12 @@ try:
 except ImportError:
     raise ImportError("⚠️ 'fpdf' module not found! Install it using: pip install fpdf")
 
-from app.extract_text import save_to_json, extract_text_from_pdf, DATASTORE_PATH
+import numpy as np
+from PIL import Image
+
+from app import extract_text, manifest, ocr_cache
+from app.datastore import open_store
+from app.extract_text import save_to_json, extract_text_from_pdf, iter_pages, preprocess_image
 from app.models import Survey
 
 @pytest.fixture
@@ -30,6 +35,21 @@ def mock_pdf(tmp_path):
     return str(pdf_path)
 
 
+@pytest.fixture
+def mock_multipage_pdf(tmp_path):
+    """Creates a mock PDF with one question per page."""
+    pdf_path = tmp_path / "mock_multipage_survey.pdf"
+
+    pdf = FPDF()
+    pdf.set_font("Arial", size=12)
+    for i, question in enumerate(["How interested are you in taking classes?",
+                                  "What time of day works best for you?",
+                                  "Would you attend classes online?"], start=1):
+        pdf.add_page()
+        pdf.cell(200, 10, txt=f"{i}. {question}", ln=True, align="L")
+    pdf.output(str(pdf_path))
+
+    return str(pdf_path)
 
 def test_extract_text_from_pdf(mock_pdf):
     """Test that text is correctly extracted from a sample PDF."""
@@ -43,9 +63,168 @@ def test_extract_text_from_pdf(mock_pdf):
     assert found, f"Extracted text did not contain expected question. OCR output: {extracted_text}"
 
 
+@pytest.mark.skipif(shutil.which("pdftoppm") is None, reason="needs poppler to render PDFs")
+def test_extract_text_from_pdf_parallel_matches_serial(mock_multipage_pdf):
+    """Test that the page-parallel path returns the same lines, in the same order, as the serial path."""
+    serial_text = extract_text_from_pdf(mock_multipage_pdf, max_workers=1)
+    parallel_text = extract_text_from_pdf(mock_multipage_pdf, max_workers=2)
+
+    assert parallel_text == serial_text
+    assert any("What time of day works best" in line for line in parallel_text)
+
+@pytest.mark.skipif(shutil.which("pdftoppm") is None, reason="needs poppler to render PDFs")
+def test_iter_pages_streams_grayscale_pages(mock_multipage_pdf):
+    """Test that pages are rendered one window at a time, in order, straight to grayscale."""
+    pages = [(page_number, image.mode) for page_number, image in iter_pages(mock_multipage_pdf, dpi=72, window=2)]
+
+    assert pages == [(1, "L"), (2, "L"), (3, "L")]
+
+
+def test_preprocess_image_accepts_grayscale_and_rgb():
+    """Test that grayscale renders skip color conversion and give the same result as RGB input."""
+    gray = np.full((64, 64), 255, dtype=np.uint8)
+    gray[20:40, 10:50] = 0
+    rgb = Image.fromarray(gray).convert("RGB")
+
+    assert np.array_equal(preprocess_image(Image.fromarray(gray)), preprocess_image(rgb))
+
+def test_get_ocr_engine_falls_back_to_pytesseract(monkeypatch):
+    """Test that "auto" uses pytesseract without tesserocr, and that the engine is reused within a process."""
+    monkeypatch.setattr(extract_text, "tesserocr", None)
+    monkeypatch.setattr(extract_text, "OCR_ENGINE", "auto")
+    monkeypatch.setattr(extract_text, "_ocr_engine", None)
+
+    engine = extract_text.get_ocr_engine()
+    assert isinstance(engine, extract_text.PytesseractEngine)
+    assert extract_text.get_ocr_engine() is engine
+
+
+def test_resolve_ocr_engine_name_rejects_missing_tesserocr(monkeypatch):
+    """Test that explicitly asking for tesserocr without the package installed is an error."""
+    monkeypatch.setattr(extract_text, "tesserocr", None)
+
+    with pytest.raises(ValueError):
+        extract_text.resolve_ocr_engine_name("tesserocr")
+    with pytest.raises(ValueError):
+        extract_text.resolve_ocr_engine_name("easyocr")
+
+def page_image(size: int, ink_box: tuple = None) -> Image.Image:
+    """Returns a white grayscale page, with a black block of "writing" in the given (top, bottom, left, right) box."""
+    page = np.full((size, size), 255, dtype=np.uint8)
+    if ink_box is not None:
+        top, bottom, left, right = ink_box
+        page[top:bottom, left:right] = 0
+    return Image.fromarray(page)
+
+
+class ScriptedEngine:
+    """OCR engine stand-in that returns a fixed confidence per page segmentation mode."""
+    def __init__(self, confidences):
+        self.confidences = confidences
+        self.calls = []
+
+    def recognize(self, image, psm=None):
+        self.calls.append((np.asarray(image).shape, psm))
+        return f"read with psm {psm}", self.confidences[psm]
+
+
+def test_ocr_pdf_page_escalates_low_confidence_pages(monkeypatch):
+    """Test that a page below the confidence threshold is re-rendered and re-read with the quality tier."""
+    engine = ScriptedEngine({6: 40.0, 3: 93.0})
+    monkeypatch.setattr(extract_text, "get_ocr_engine", lambda: engine)
+    monkeypatch.setattr(extract_text, "render_page",
+                        lambda pdf_path, page_number, dpi: page_image(dpi, (0, dpi, 0, dpi)))
+
+    page = extract_text.ocr_pdf_page("survey.pdf", 2)
+
+    assert set(page.pop("timings")) == {"render", "preprocess", "ocr"}
+    assert page == {"page": 2, "lines": ["read with psm 3"], "confidence": 93.0, "tier": "quality", "status": "full"}
+    assert engine.calls == [((150, 150), 6), ((200, 200), 3)]
+
+
+def test_ocr_pdf_page_keeps_confident_fast_pass(monkeypatch):
+    """Test that a confident fast pass is not re-read."""
+    engine = ScriptedEngine({6: 85.0, 3: 93.0})
+    monkeypatch.setattr(extract_text, "get_ocr_engine", lambda: engine)
+
+    page = extract_text.ocr_pdf_page("survey.pdf", 1, image=page_image(150, (0, 150, 0, 150)))
+
+    assert page["tier"] == "fast"
+    assert len(engine.calls) == 1
+
+
+def test_ocr_pdf_page_skips_blank_pages(monkeypatch):
+    """Test that a blank page is never sent to OCR."""
+    engine = ScriptedEngine({6: 85.0, 3: 93.0})
+    monkeypatch.setattr(extract_text, "get_ocr_engine", lambda: engine)
+
+    page = extract_text.ocr_pdf_page("survey.pdf", 4, image=page_image(400))
 
-def test_save_to_json(mock_pdf, tmp_path):
+    assert page.pop("timings") == {"render": 0.0, "preprocess": 0.0, "ocr": 0.0}
+    assert page == {"page": 4, "lines": [], "confidence": None, "tier": None, "status": "blank"}
+    assert engine.calls == []
+    assert extract_text.page_stats([page]) == {"pages": 1, "blank_skipped": 1, "cropped": 0, "escalated": 0}
+
+
+def test_tesseract_version_comes_from_the_engine_in_use(monkeypatch):
+    """Test that tesserocr reports its own version, and a missing tesseract CLI gives None instead of an error."""
+    import types
+    monkeypatch.setattr(extract_text, "tesserocr",
+                        types.SimpleNamespace(tesseract_version=lambda: "tesseract 5.3.0\n leptonica-1.82.0"))
+    monkeypatch.setattr(extract_text, "TESSERACT_CMD", os.path.join("missing", "tesseract"))
+    extract_text._tesseract_version.cache_clear()
+
+    monkeypatch.setattr(extract_text, "OCR_ENGINE", "tesserocr")
+    assert extract_text.ocr_settings()["tesseract_version"] == "tesseract 5.3.0"
+
+    monkeypatch.setattr(extract_text, "OCR_ENGINE", "pytesseract")
+    assert extract_text.ocr_settings()["tesseract_version"] is None
+    extract_text._tesseract_version.cache_clear()
+
+
+def test_single_text_line_is_not_blank():
+    """Test that an A4 page at 150 dpi holding one short line of 12pt-sized text is not treated as blank."""
+    import cv2
+    page = np.full((1754, 1240), 255, dtype=np.uint8)
+    cv2.putText(page, "4 - Interested", (120, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 1)
+
+    assert extract_text.find_content_box(Image.fromarray(page)) is not None
+
+
+@pytest.mark.skipif(shutil.which("pdftoppm") is None, reason="needs poppler to render PDFs")
+def test_rendered_single_line_pdf_is_not_blank(tmp_path, monkeypatch):
+    """Test that a rendered fpdf page with one printed line keeps its content."""
+    pdf_path = tmp_path / "one_line.pdf"
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt="1. How interested are you in taking classes?", ln=True, align="L")
+    pdf.output(str(pdf_path))
+    monkeypatch.setattr(extract_text, "POPPLER_PATH", None)  # Use the pdftoppm found on PATH
+    page = extract_text.render_page(str(pdf_path), 1, dpi=150)
+
+    assert extract_text.find_content_box(page) is not None
+
+
+def test_ocr_pdf_page_crops_to_content(monkeypatch):
+    """Test that only the content area, plus a margin, is sent to OCR."""
+    engine = ScriptedEngine({6: 85.0, 3: 93.0})
+    monkeypatch.setattr(extract_text, "get_ocr_engine", lambda: engine)
+    monkeypatch.setattr(extract_text, "CONTENT_CROP_MARGIN", 0.01)
+
+    page = extract_text.ocr_pdf_page("survey.pdf", 1, image=page_image(400, (100, 140, 50, 250)))
+
+    assert page["status"] == "cropped"
+    assert engine.calls == [((48, 208), 6)]
+
+
+def test_save_to_json(mock_pdf, tmp_path, monkeypatch):
     """Test extraction and saving process."""
+    # Keep the test run out of the real data store, manifest and OCR cache
+    monkeypatch.setattr(extract_text, "DATASTORE_PATH", str(tmp_path / "survey_data.db"))
+    monkeypatch.setattr(manifest, "MANIFEST_PATH", str(tmp_path / "survey_manifest.json"))
+    monkeypatch.setattr(ocr_cache, "OCR_CACHE_DIR", str(tmp_path / "ocr_cache"))
+
     test_survey_type = "Resident"
     test_survey_folder = tmp_path / "resident"
     test_survey_folder.mkdir()
@@ -58,11 +237,10 @@ def test_save_to_json(mock_pdf, tmp_path):
     # Run the save_to_json function
     save_to_json(test_survey_type, str(test_survey_folder))
 
-    # Ensure the JSON file was created
-    assert os.path.exists(DATASTORE_PATH)
+    # Ensure the survey store was created
+    assert os.path.exists(extract_text.DATASTORE_PATH)
 
-    with open(DATASTORE_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = open_store(extract_text.DATASTORE_PATH).to_dict()
 
     assert test_survey_type in data
     assert len(data[test_survey_type]) > 0
@@ -84,3 +262,38 @@ def test_survey_model():
     assert survey_dict["survey_id"] == "mock_survey.pdf"
     assert isinstance(survey_dict["responses"], list)
     assert len(survey_dict["responses"]) == 2
+
+
+def test_parse_survey_responses_tracks_lowest_confidence():
+    """Test that each response carries the lowest confidence of the pages its lines came from."""
+    lines = ["1. How interested are you?", "4 - Interested", "2. What times work?", "Evenings", "Weekends"]
+    confidences = [95.0, 95.0, 95.0, 95.0, 61.0]
+
+    survey = extract_text.parse_survey_responses("Resident", "resident1.pdf", lines, confidences)
+
+    assert [r.confidence for r in survey.responses] == [95.0, 61.0]
+
+
+def test_parse_survey_responses_reads_past_question_twenty():
+    """Test that numbered questions beyond 20 start a new response instead of being merged into the previous one."""
+    lines = []
+    for number in range(1, 26):
+        lines += [f"{number}. Question {number}", f"Answer {number}"]
+
+    survey = extract_text.parse_survey_responses("Resident", "resident1.pdf", lines)
+
+    assert len(survey.responses) == 25
+    assert survey.responses[-1].to_dict() == {"question_id": 25, "response": ["Answer 25"]}
+
+
+def test_iter_survey_responses_yields_before_input_ends():
+    """Test that a response is yielded as soon as the next question header arrives."""
+    def lines():
+        yield "1. How interested are you?"
+        yield "4 - Interested"
+        yield "2. What times work?"
+        raise AssertionError("read past the header that closes question 1")
+
+    responses = extract_text.iter_survey_responses(lines())
+
+    assert next(responses).to_dict() == {"question_id": 1, "response": ["4 - Interested"]}
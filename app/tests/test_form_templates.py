@@ -0,0 +1,93 @@
+import json
+import numpy as np
+import pytest
+from app.form_templates import (FormTemplate, QuestionRegion, ink_densities, load_form_template,
+                                read_marked_options, read_page_regions)
+
+RATING_OPTIONS = [
+    {"value": f"{i} - {label}", "box": [0.1 + 0.1 * (i - 1), 0.1, 0.15 + 0.1 * (i - 1), 0.15]}
+    for i, label in enumerate(["Not Interested", "Slightly", "Somewhat", "Interested", "Very Interested"], start=1)
+]
+
+def blank_page(size: int = 400) -> np.ndarray:
+    """Returns a white thresholded page."""
+    return np.full((size, size), 255, dtype=np.uint8)
+
+def mark(page: np.ndarray, box: list):
+    """Fills the middle of a fractional box, like a pen mark inside a checkbox."""
+    height, width = page.shape
+    left, top, right, bottom = box
+    page[int(top * height) + 5:int(bottom * height) - 5, int(left * width) + 5:int(right * width) - 5] = 0
+
+class FakeEngine:
+    """Stands in for the OCR engine and records what it was asked to read."""
+    def __init__(self):
+        self.calls = 0
+
+    def recognize(self, image, psm=None):
+        self.calls += 1
+        return "Evening classes\n\nnear the library\n", 91.5
+
+def test_ink_densities():
+    """Test that a filled box reads as dense ink and an empty box as zero."""
+    page = blank_page()
+    mark(page, RATING_OPTIONS[3]["box"])
+
+    densities = ink_densities(page, [option["box"] for option in RATING_OPTIONS])
+
+    assert densities[3] > 0.5
+    assert np.count_nonzero(densities) == 1
+
+def test_read_marked_options_single_and_multiple():
+    """Test that rating questions return one value and multiple-choice questions return a list."""
+    page = blank_page()
+    mark(page, RATING_OPTIONS[1]["box"])
+    mark(page, RATING_OPTIONS[3]["box"])
+
+    rating = QuestionRegion(1, 1, "rating", RATING_OPTIONS)
+    choice = QuestionRegion(2, 1, "choice", RATING_OPTIONS, multiple=True)
+    unanswered = QuestionRegion(3, 1, "rating", RATING_OPTIONS)
+
+    assert read_marked_options(page, rating) in ("2 - Slightly", "4 - Interested")
+    assert read_marked_options(page, choice) == ["2 - Slightly", "4 - Interested"]
+    assert read_marked_options(blank_page(), unanswered) is None
+
+def test_read_page_regions_only_ocrs_text_regions():
+    """Test that checkbox answers skip OCR and only a non-empty text region is sent to the engine."""
+    page = blank_page()
+    mark(page, RATING_OPTIONS[4]["box"])
+    mark(page, [0.1, 0.5, 0.9, 0.7])
+    questions = [
+        QuestionRegion(2, 1, "text", box=[0.1, 0.5, 0.9, 0.7]),
+        QuestionRegion(1, 1, "rating", RATING_OPTIONS),
+        QuestionRegion(3, 1, "text", box=[0.1, 0.8, 0.9, 0.95]),
+    ]
+    engine = FakeEngine()
+
+    responses = read_page_regions(page, questions, engine)
+
+    assert [r.to_dict() for r in responses] == [
+        {"question_id": 1, "response": "5 - Very Interested"},
+        {"question_id": 2, "response": ["Evening classes", "near the library"], "confidence": 91.5},
+    ]
+    assert engine.calls == 1
+
+def test_load_form_template(tmp_path):
+    """Test that templates load by survey type and that missing templates return None."""
+    template_json = {"survey_type": "Resident", "questions": [
+        {"question_id": 1, "page": 1, "kind": "rating", "options": RATING_OPTIONS},
+        {"question_id": 2, "page": 2, "kind": "text", "box": [0.1, 0.5, 0.9, 0.7]},
+    ]}
+    (tmp_path / "resident.json").write_text(json.dumps(template_json))
+
+    template = load_form_template("Resident", str(tmp_path))
+
+    assert isinstance(template, FormTemplate)
+    assert template.pages() == [1, 2]
+    assert template.digest
+    assert load_form_template("Stakeholder", str(tmp_path)) is None
+
+def test_question_region_rejects_invalid_kind():
+    """Test that an unknown question kind raises an error."""
+    with pytest.raises(ValueError):
+        QuestionRegion(1, 1, "slider", RATING_OPTIONS)
@@ -0,0 +1,245 @@
+import os
+import pytest
+import app.ingest as ingest
+from app.ingest import find_survey_pdfs, ingest_surveys
+from app.ocr_cache import OCRCache
+from app.manifest import FileManifest
+from app.datastore import open_store
+from app.aggregates import get_aggregates
+from app.search import get_search_index
+from app.form_templates import FormTemplate
+
+@pytest.fixture
+def mock_survey_folders(tmp_path):
+    """Creates resident and stakeholder folders with placeholder PDFs."""
+    resident_dir = tmp_path / "surveys" / "resident"
+    stakeholder_dir = tmp_path / "surveys" / "stakeholder"
+    resident_dir.mkdir(parents=True)
+    stakeholder_dir.mkdir(parents=True)
+
+    (resident_dir / "resident2.pdf").write_bytes(b"%PDF-1.4 resident2")
+    (resident_dir / "resident1.pdf").write_bytes(b"%PDF-1.4 resident1")
+    (resident_dir / "notes.txt").write_text("not a survey")
+    (stakeholder_dir / "stakeholder1.PDF").write_bytes(b"%PDF-1.4 stakeholder1")
+
+    return {"Resident": str(resident_dir), "Stakeholder": str(stakeholder_dir)}
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """Replaces per-document OCR with canned text so only the scheduler is exercised."""
+    calls = []
+
+    def fake_extract_pages_from_pdf(pdf_path, max_workers=None, dpi=None):
+        calls.append(pdf_path)
+        return [{"page": 1, "lines": ["1. How interested are you in taking classes?", "4 - Interested"],
+                 "confidence": 88.0, "tier": "fast"}]
+
+    monkeypatch.setattr(ingest, "extract_pages_from_pdf", fake_extract_pages_from_pdf)
+    monkeypatch.setattr(ingest, "ocr_settings", lambda template=None: {"threshold_block_size": 31})
+    return calls
+
+@pytest.fixture
+def ingest_state(tmp_path):
+    """Keyword arguments pointing the data store, cache and manifest into tmp_path."""
+    return {
+        "max_workers": 1,
+        "datastore_path": str(tmp_path / "survey_data.db"),
+        "cache": OCRCache(str(tmp_path / "cache")),
+        "manifest": FileManifest(str(tmp_path / "survey_manifest.json")),
+    }
+
+def test_find_survey_pdfs(mock_survey_folders):
+    """Test that PDFs from every folder are queued, in order, and other files are ignored."""
+    jobs = find_survey_pdfs(mock_survey_folders)
+
+    assert [(survey_type, filename) for survey_type, filename, _ in jobs] == [
+        ("Resident", "resident1.pdf"),
+        ("Resident", "resident2.pdf"),
+        ("Stakeholder", "stakeholder1.PDF"),
+    ]
+
+def test_subfolder_pdfs_are_ingested_under_distinct_ids(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that PDFs in subfolders are found, and same-named files in different subfolders do not collide."""
+    for subfolder in ("2023", "2024"):
+        os.makedirs(os.path.join(mock_survey_folders["Resident"], subfolder))
+        with open(os.path.join(mock_survey_folders["Resident"], subfolder, "scan.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4 " + subfolder.encode())
+
+    assert [survey_id for survey_type, survey_id, _ in find_survey_pdfs(mock_survey_folders)
+            if survey_type == "Resident"] == ["2023/scan.pdf", "2024/scan.pdf", "resident1.pdf", "resident2.pdf"]
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    stored = open_store(ingest_state["datastore_path"]).survey_keys()
+    assert {("Resident", "2023/scan.pdf"), ("Resident", "2024/scan.pdf")} <= stored
+
+def test_find_survey_pdfs_missing_folder(tmp_path):
+    """Test that a missing folder is skipped instead of raising."""
+    assert find_survey_pdfs({"Resident": str(tmp_path / "missing")}) == []
+
+def test_ingest_surveys_merges_all_types(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that surveys of both types land in one data store without duplicates."""
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    ingest_surveys(mock_survey_folders, **ingest_state)
+
+    data = open_store(ingest_state["datastore_path"]).to_dict()
+
+    assert [s["survey_id"] for s in data["Resident"]] == ["resident1.pdf", "resident2.pdf"]
+    assert [s["survey_id"] for s in data["Stakeholder"]] == ["stakeholder1.PDF"]
+    assert data["Resident"][0]["responses"] == [{"question_id": 1, "response": ["4 - Interested"], "confidence": 88.0}]
+
+def test_ingest_surveys_skips_unchanged_files(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that a second run over an unchanged tree neither OCRs nor checks the cache."""
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    assert len(fake_ocr) == 3
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    assert len(fake_ocr) == 3
+    assert ingest_state["cache"].stats() == {"hits": 0, "misses": 3}
+
+def test_ingest_surveys_replaces_modified_files(mock_survey_folders, fake_ocr, ingest_state, monkeypatch):
+    """Test that an edited PDF is re-extracted and replaces its old entry instead of being appended."""
+    ingest_surveys(mock_survey_folders, **ingest_state)
+
+    edited_pdf = os.path.join(mock_survey_folders["Resident"], "resident1.pdf")
+    with open(edited_pdf, "ab") as f:
+        f.write(b" rescanned")
+    monkeypatch.setattr(ingest, "extract_pages_from_pdf", lambda pdf_path, max_workers=None, dpi=None: [
+        {"page": 1, "lines": ["1. Rescanned?", "5 - Very Interested"], "confidence": 64.0, "tier": "quality"}])
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    data = open_store(ingest_state["datastore_path"]).to_dict()
+
+    assert [s["survey_id"] for s in data["Resident"]] == ["resident1.pdf", "resident2.pdf"]
+    assert data["Resident"][0]["responses"] == [
+        {"question_id": 1, "response": ["5 - Very Interested"], "confidence": 64.0}]
+
+def test_ingest_surveys_reuses_cached_text(mock_survey_folders, fake_ocr, ingest_state, tmp_path):
+    """Test that content already in the OCR cache is not OCR'd again for a fresh data store."""
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    assert len(fake_ocr) == 3
+
+    ingest_state.update(datastore_path=str(tmp_path / "other.db"),
+                        manifest=FileManifest(str(tmp_path / "other_manifest.json")))
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    assert len(fake_ocr) == 3
+    assert ingest_state["cache"].stats() == {"hits": 3, "misses": 3}
+
+def test_ingest_surveys_uses_form_template(mock_survey_folders, fake_ocr, ingest_state, monkeypatch):
+    """Test that forms with a template are read from their regions instead of full-page OCR."""
+    template = FormTemplate("Resident", [], digest="resident-v1")
+    monkeypatch.setattr(ingest, "extract_responses_with_template",
+                        lambda pdf_path, template: [{"question_id": 1, "response": "4 - Interested"}])
+
+    ingest_surveys(mock_survey_folders, templates={"Resident": template}, **ingest_state)
+    data = open_store(ingest_state["datastore_path"]).to_dict()
+
+    assert fake_ocr == [os.path.join(mock_survey_folders["Stakeholder"], "stakeholder1.PDF")]
+    assert data["Resident"][0]["responses"] == [{"question_id": 1, "response": "4 - Interested"}]
+
+def test_ingest_surveys_updates_built_aggregates(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that an already built aggregate index is updated by ingestion without a rebuild."""
+    store = open_store(ingest_state["datastore_path"])
+    aggregates = get_aggregates(store)
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+
+    assert aggregates.version == store.version()
+    assert aggregates.question("Resident", 1) == {"responses": 2, "answers": {"4 - Interested": 2}}
+
+def test_ingest_surveys_updates_built_search_index(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that an already built search index is updated by ingestion without a rebuild."""
+    store = open_store(ingest_state["datastore_path"])
+    index = get_search_index(store)
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+
+    assert index.version == store.version()
+    assert index.search("interested", survey_type="Resident")["total"] == 2
+
+def test_rebuild_between_save_and_update_is_not_counted_twice(tmp_path, monkeypatch):
+    """Test that a sync rebuilding the indexes after a save makes the incremental update stand down."""
+    from app.models import Response, Survey
+    store = open_store(str(tmp_path / "survey_data.db"))
+    store.save_surveys([Survey("Resident", "resident1.pdf", [Response(1, "4 - Interested")])])
+    aggregates, index = get_aggregates(store), get_search_index(store)
+
+    save_surveys = store.save_surveys
+    def save_then_sync(surveys):
+        save_surveys(surveys)
+        get_aggregates(store)
+        get_search_index(store)
+    monkeypatch.setattr(store, "save_surveys", save_then_sync)
+
+    ingest.save_ingested_surveys(store, [Survey("Resident", "resident2.pdf", [Response(1, "4 - Interested")])],
+                                 aggregates, index)
+
+    for built in (get_aggregates(store), get_search_index(store)):
+        assert built.version == store.version()
+    assert aggregates.summary("Resident")["surveys"] == 2
+    assert aggregates.question("Resident", 1) == {"responses": 2, "answers": {"4 - Interested": 2}}
+    assert index.search("interested", survey_type="Resident")["total"] == 2
+
+def test_ingest_surveys_saves_batch_when_one_pdf_fails(mock_survey_folders, fake_ocr, ingest_state, monkeypatch):
+    """Test that a PDF failing extraction is reported without losing the rest of the batch, and retried by the next run."""
+    good_extract = ingest.extract_pages_from_pdf
+    bad_pdf = os.path.join(mock_survey_folders["Resident"], "resident1.pdf")
+
+    def flaky_extract(pdf_path, max_workers=None, dpi=None):
+        if pdf_path == bad_pdf:
+            raise RuntimeError("corrupt scan")
+        return good_extract(pdf_path, max_workers, dpi)
+    monkeypatch.setattr(ingest, "extract_pages_from_pdf", flaky_extract)
+
+    failed = []
+    surveys = ingest_surveys(mock_survey_folders, failed=failed, **ingest_state)
+
+    assert failed == [bad_pdf]
+    assert sorted(survey.survey_id for survey in surveys) == ["resident2.pdf", "stakeholder1.PDF"]
+    assert ingest_state["manifest"].entry(bad_pdf)["outcome"] == "failed"
+
+    monkeypatch.setattr(ingest, "extract_pages_from_pdf", good_extract)
+    assert [survey.survey_id for survey in ingest_surveys(mock_survey_folders, **ingest_state)] == ["resident1.pdf"]
+    assert "outcome" not in ingest_state["manifest"].entry(bad_pdf)
+
+def test_pending_survey_pdfs_skips_failed_and_empty_pdfs(mock_survey_folders, fake_ocr, ingest_state, monkeypatch):
+    """Test that PDFs which failed or extracted no text are not pending again until they change."""
+    good_extract = ingest.extract_pages_from_pdf
+    bad_pdf = os.path.join(mock_survey_folders["Resident"], "resident1.pdf")
+    blank_pdf = os.path.join(mock_survey_folders["Resident"], "resident2.pdf")
+
+    def uneven_extract(pdf_path, max_workers=None, dpi=None):
+        if pdf_path == bad_pdf:
+            raise RuntimeError("corrupt scan")
+        return [] if pdf_path == blank_pdf else good_extract(pdf_path, max_workers, dpi)
+    monkeypatch.setattr(ingest, "extract_pages_from_pdf", uneven_extract)
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    pending_args = {"datastore_path": ingest_state["datastore_path"], "manifest": ingest_state["manifest"]}
+    assert ingest.pending_survey_pdfs(mock_survey_folders, **pending_args) == []
+
+    with open(bad_pdf, "ab") as f:
+        f.write(b" rescanned")
+    assert [pdf_path for _, _, pdf_path in ingest.pending_survey_pdfs(mock_survey_folders, **pending_args)] == [bad_pdf]
+
+def test_ingest_surveys_skips_pdf_deleted_after_scan(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that a PDF removed between the folder scan and the manifest check does not abort the batch."""
+    pdfs = find_survey_pdfs(mock_survey_folders)
+    os.remove(os.path.join(mock_survey_folders["Resident"], "resident1.pdf"))
+
+    surveys = ingest_surveys(mock_survey_folders, pdfs=pdfs, **ingest_state)
+
+    assert sorted(survey.survey_id for survey in surveys) == ["resident2.pdf", "stakeholder1.PDF"]
+
+def test_pending_survey_pdfs(mock_survey_folders, fake_ocr, ingest_state):
+    """Test that nothing is pending after ingestion until a PDF changes."""
+    pending_args = {"datastore_path": ingest_state["datastore_path"], "manifest": ingest_state["manifest"]}
+    assert len(ingest.pending_survey_pdfs(mock_survey_folders, **pending_args)) == 3
+
+    ingest_surveys(mock_survey_folders, **ingest_state)
+    assert ingest.pending_survey_pdfs(mock_survey_folders, **pending_args) == []
+
+    edited_pdf = os.path.join(mock_survey_folders["Resident"], "resident1.pdf")
+    with open(edited_pdf, "ab") as f:
+        f.write(b" rescanned")
+    assert [filename for _, filename, _ in ingest.pending_survey_pdfs(mock_survey_folders, **pending_args)] == [
+        "resident1.pdf"]
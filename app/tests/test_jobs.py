@@ -0,0 +1,91 @@
+import os
+import threading
+import pytest
+import app.jobs as jobs
+from app.jobs import JobQueue, QueueFull, SurveyExists
+from app.datastore import open_store
+from app.manifest import FileManifest
+
+@pytest.fixture
+def job_queue(tmp_path, monkeypatch):
+    """A thread-only job queue writing into tmp_path, with OCR replaced by canned pages."""
+    monkeypatch.setattr(jobs, "load_form_template", lambda survey_type: None)
+    monkeypatch.setattr(jobs, "extract_pdf", lambda pdf_path, page_workers, template: [
+        {"page": 1, "lines": ["1. How interested are you?", "4 - Interested"], "confidence": 90.0, "tier": "fast"}])
+    return JobQueue(str(tmp_path / "survey_data.db"), workers=1, max_queued=1,
+                    upload_dir=str(tmp_path / "uploads"),
+                    survey_folders={"Resident": str(tmp_path / "surveys" / "resident")},
+                    manifest=FileManifest(str(tmp_path / "survey_manifest.json")), use_processes=False)
+
+def write_pdf(path):
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4 upload")
+
+def test_job_saves_survey_and_files_pdf(job_queue, tmp_path):
+    """Test that a finished job stores its survey, files the PDF and records it in the manifest."""
+    job_id = job_queue.submit("Resident", "resident1.pdf", write_pdf)
+    job_queue.join()
+
+    job = job_queue.status(job_id)
+    pdf_path = str(tmp_path / "surveys" / "resident" / "resident1.pdf")
+    assert job["status"] == "done"
+    assert job["result"]["responses"] == [{"question_id": 1, "response": ["4 - Interested"], "confidence": 90.0}]
+    assert open_store(job_queue.datastore_path).get_survey("Resident", "resident1.pdf") is not None
+    assert job_queue.manifest.check(pdf_path)[0] == "unchanged"
+
+def test_job_keeps_manifest_entries_written_by_others(job_queue, tmp_path):
+    """Test that filing an upload does not drop manifest entries another ingestion run saved meanwhile."""
+    other_pdf = tmp_path / "surveys" / "resident" / "resident0.pdf"
+    other_pdf.parent.mkdir(parents=True)
+    write_pdf(other_pdf)
+    other = FileManifest(job_queue.manifest.manifest_path)
+    other.record(str(other_pdf), other.check(str(other_pdf))[1], survey_type="Resident", survey_id="resident0.pdf")
+    other.save()
+
+    job_queue.submit("Resident", "resident1.pdf", write_pdf)
+    job_queue.join()
+
+    assert FileManifest(job_queue.manifest.manifest_path).check(str(other_pdf))[0] == "unchanged"
+
+def test_job_failure_is_reported(job_queue, monkeypatch):
+    """Test that an extraction error marks the job failed instead of killing the worker."""
+    def broken_extract(pdf_path, page_workers, template):
+        raise RuntimeError("unreadable PDF")
+    monkeypatch.setattr(jobs, "extract_pdf", broken_extract)
+
+    job_id = job_queue.submit("Resident", "resident1.pdf", write_pdf)
+    job_queue.join()
+
+    assert job_queue.status(job_id)["status"] == "failed"
+    assert job_queue.status(job_id)["error"] == "unreadable PDF"
+
+def test_submit_rejects_when_queue_is_full(job_queue, monkeypatch):
+    """Test that uploads beyond the queue size are rejected while the worker is busy."""
+    release = threading.Event()
+    running = threading.Event()
+
+    def slow_extract(pdf_path, page_workers, template):
+        running.set()
+        release.wait(5)
+        return []
+    monkeypatch.setattr(jobs, "extract_pdf", slow_extract)
+
+    job_queue.submit("Resident", "resident1.pdf", write_pdf)
+    running.wait(5)
+    job_queue.submit("Resident", "resident2.pdf", write_pdf)
+    with pytest.raises(QueueFull):
+        job_queue.submit("Resident", "resident3.pdf", write_pdf)
+
+    release.set()
+    job_queue.join()
+
+def test_submit_rejects_duplicate_survey_name(job_queue, monkeypatch):
+    """Test that an upload reusing a stored or in-progress survey's name is rejected instead of overwriting it."""
+    job_queue.submit("Resident", "scan.pdf", write_pdf)
+    with pytest.raises(SurveyExists):
+        job_queue.submit("Resident", "scan.pdf", write_pdf)  # Still queued or running
+    job_queue.join()
+
+    with pytest.raises(SurveyExists):
+        job_queue.submit("Resident", "scan.pdf", write_pdf)  # Stored and filed
+    assert len(os.listdir(job_queue.upload_dir)) == 0
@@ -0,0 +1,42 @@
+import os
+import pytest
+from app.manifest import FileManifest, file_digest
+
+@pytest.fixture
+def mock_pdf_file(tmp_path):
+    """Creates a small file standing in for a scanned PDF."""
+    pdf_path = tmp_path / "survey.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 mock survey")
+    return str(pdf_path)
+
+def test_manifest_new_then_unchanged(mock_pdf_file, tmp_path):
+    """Test that a recorded file is reported unchanged, including after a reload."""
+    manifest = FileManifest(str(tmp_path / "manifest.json"))
+    status, record = manifest.check(mock_pdf_file)
+    assert status == "new"
+    assert record["sha256"] == file_digest(mock_pdf_file)
+
+    manifest.record(mock_pdf_file, record, survey_type="Resident", survey_id="survey.pdf")
+    manifest.save()
+
+    reloaded = FileManifest(str(tmp_path / "manifest.json"))
+    status, record = reloaded.check(mock_pdf_file)
+    assert status == "unchanged"
+    assert record["survey_type"] == "Resident"
+
+def test_manifest_touched_file_is_unchanged(mock_pdf_file, tmp_path):
+    """Test that a new mtime with identical content is not treated as a modification."""
+    manifest = FileManifest(str(tmp_path / "manifest.json"))
+    manifest.record(mock_pdf_file, manifest.check(mock_pdf_file)[1])
+
+    os.utime(mock_pdf_file, (1, 1))
+    assert manifest.check(mock_pdf_file)[0] == "unchanged"
+
+def test_manifest_detects_modified_file(mock_pdf_file, tmp_path):
+    """Test that edited content is reported as modified."""
+    manifest = FileManifest(str(tmp_path / "manifest.json"))
+    manifest.record(mock_pdf_file, manifest.check(mock_pdf_file)[1])
+
+    with open(mock_pdf_file, "ab") as f:
+        f.write(b" rescanned")
+    assert manifest.check(mock_pdf_file)[0] == "modified"
@@ -0,0 +1,52 @@
+from app.metrics import MetricsRegistry, REGISTRY
+from app.extract_text import record_page_metrics
+
+def test_registry_renders_prometheus_text():
+    """Test that counters, gauges and histograms render in the Prometheus text format."""
+    registry = MetricsRegistry()
+    registry.counter("pages_total", "Pages read.")
+    registry.gauge("pages_per_second", "Throughput.")
+    registry.histogram("stage_seconds", "Stage time.", buckets=(0.1, 1.0))
+
+    registry.inc("pages_total", status="full")
+    registry.inc("pages_total", 2, status="full")
+    registry.set("pages_per_second", 4.5)
+    registry.observe("stage_seconds", 0.05, stage="ocr")
+    registry.observe("stage_seconds", 0.5, stage="ocr")
+    registry.observe("stage_seconds", 3.0, stage="ocr")
+
+    assert registry.render().splitlines() == [
+        "# HELP pages_per_second Throughput.",
+        "# TYPE pages_per_second gauge",
+        "pages_per_second 4.5",
+        "# HELP pages_total Pages read.",
+        "# TYPE pages_total counter",
+        'pages_total{status="full"} 3',
+        "# HELP stage_seconds Stage time.",
+        "# TYPE stage_seconds histogram",
+        'stage_seconds_bucket{stage="ocr",le="0.1"} 1',
+        'stage_seconds_bucket{stage="ocr",le="1.0"} 2',
+        'stage_seconds_bucket{stage="ocr",le="+Inf"} 3',
+        'stage_seconds_sum{stage="ocr"} 3.55',
+        'stage_seconds_count{stage="ocr"} 3',
+    ]
+
+def test_timed_observes_block_duration():
+    """Test that a timed block adds one observation."""
+    registry = MetricsRegistry()
+    registry.histogram("stage_seconds", "Stage time.")
+
+    with registry.timed("stage_seconds", stage="parse"):
+        pass
+
+    assert registry.value("stage_seconds", stage="parse")["count"] == 1
+
+def test_record_page_metrics():
+    """Test that page timings returned by the OCR workers land in the stage histogram."""
+    before = REGISTRY.value("stlovp_stage_seconds", stage="ocr")
+    before_count = before["count"] if before else 0
+
+    record_page_metrics([{"page": 1, "lines": [], "status": "cropped",
+                          "timings": {"render": 0.2, "preprocess": 0.01, "ocr": 0.4}}])
+
+    assert REGISTRY.value("stlovp_stage_seconds", stage="ocr")["count"] == before_count + 1
@@ -1,5 +1,6 @@
+import json
 import pytest
-from app.models import Response, Survey
+from app.models import Response, Survey, SurveyTable, response_text
 
 def test_response_creation():
     """Test that a response object is correctly created."""
@@ -30,6 +31,13 @@ def test_survey_creation():
     assert len(survey.responses) == 2
 
 
+def test_response_confidence_round_trip():
+    """Test that OCR confidence is kept in the dictionary format only when it is known."""
+    response = Response(3, ["Evenings"], confidence=72.5)
+    assert response.to_dict() == {"question_id": 3, "response": ["Evenings"], "confidence": 72.5}
+    assert Response.from_dict(response.to_dict()).confidence == 72.5
+
+
 def test_survey_invalid_type():
     """Test that an invalid survey type raises an error."""
     with pytest.raises(ValueError):
@@ -53,3 +61,50 @@ def test_survey_to_dict():
         ]
     }
 
+
+def test_survey_from_dict():
+    """Test that a survey round-trips through its dictionary format."""
+    data = {
+        "survey_type": "Stakeholder",
+        "survey_id": "stakeholder1.pdf",
+        "responses": [{"question_id": 1, "response": ["Yes"]}]
+    }
+    survey = Survey.from_dict(data)
+
+    assert isinstance(survey.responses[0], Response)
+    assert survey.to_dict() == data
+
+
+def test_models_use_slots():
+    """Test that responses and surveys carry no per-instance __dict__."""
+    response = Response(1, "4 - Interested")
+    with pytest.raises(AttributeError):
+        response.note = "extra"
+    assert not hasattr(Survey("Resident", "resident1.pdf", [response]), "__dict__")
+
+
+def test_survey_table_round_trip():
+    """Test that surveys survive the columnar table unchanged and repeated answers are stored once."""
+    surveys = [
+        {"survey_type": "Resident", "survey_id": "resident1.pdf", "responses": [
+            {"question_id": 1, "response": "4 - Interested", "confidence": 91.5},
+            {"question_id": 2, "response": ["Job Skills", "Life Skills"]},
+            {"question_id": 3, "response": 4}]},
+        {"survey_type": "Stakeholder", "survey_id": "stakeholder1.pdf", "responses": []},
+        {"survey_type": "Resident", "survey_id": "resident2.pdf", "responses": [
+            {"question_id": 1, "response": "4 - Interested"},
+            {"question_id": 3, "response": "4"}]},
+    ]
+
+    table = SurveyTable.from_dicts(surveys)
+
+    assert table.to_dicts() == surveys
+    assert table.to_json() == json.dumps(surveys)
+    assert len(table.answers) == 4
+    assert list(table.survey_index()) == [0, 0, 0, 2, 2]
+    assert [s.to_dict() for s in table.to_surveys()] == surveys
+
+def test_response_text_joins_lines():
+    """Test that multi-line responses become one newline-separated text."""
+    assert response_text(["Computer classes", "Job training"]) == "Computer classes\nJob training"
+    assert response_text(4) == "4"
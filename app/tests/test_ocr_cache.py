@@ -0,0 +1,47 @@
+import os
+import pytest
+from app.ocr_cache import OCRCache
+
+@pytest.fixture
+def mock_pdf_file(tmp_path):
+    """Creates a small file standing in for a scanned PDF."""
+    pdf_path = tmp_path / "survey.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 mock survey")
+    return str(pdf_path)
+
+def test_cache_miss_then_hit(mock_pdf_file, tmp_path):
+    """Test that stored text is returned on the next lookup and counted as a hit."""
+    cache = OCRCache(str(tmp_path / "cache"))
+    key = cache.key_for(mock_pdf_file, {"threshold_block_size": 31})
+
+    assert cache.get(key) is None
+    cache.put(key, ["1. How interested are you?", "4 - Interested"])
+
+    assert cache.get(key) == ["1. How interested are you?", "4 - Interested"]
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+def test_cache_key_changes_with_content_and_settings(mock_pdf_file, tmp_path):
+    """Test that editing the PDF or changing a setting produces a different key."""
+    cache = OCRCache(str(tmp_path / "cache"))
+    key = cache.key_for(mock_pdf_file, {"threshold_block_size": 31})
+
+    assert cache.key_for(mock_pdf_file, {"threshold_block_size": 15}) != key
+
+    with open(mock_pdf_file, "ab") as f:
+        f.write(b" edited")
+    assert cache.key_for(mock_pdf_file, {"threshold_block_size": 31}) != key
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the oldest untouched entry is evicted once the size cap is exceeded."""
+    cache = OCRCache(str(tmp_path / "cache"), max_bytes=250)
+    value = ["x" * 100]
+
+    cache.put("aa" + "0" * 62, value)
+    cache.put("bb" + "0" * 62, value)
+    os.utime(cache._entry_path("aa" + "0" * 62), (1, 1))
+    os.utime(cache._entry_path("bb" + "0" * 62), (2, 2))
+    cache.put("cc" + "0" * 62, value)
+
+    assert cache.get("aa" + "0" * 62) is None
+    assert cache.get("bb" + "0" * 62) == value
+    assert cache.get("cc" + "0" * 62) == value
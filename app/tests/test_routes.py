@@ -1,5 +1,6 @@
 import pytest
 from app import create_app
+from app.models import Response, Survey
 
 @pytest.fixture
 def client():
@@ -14,3 +15,118 @@ def test_hello_world(client):
     response = client.get("/")
     assert response.status_code == 200
     assert response.get_json() == {"message": "Hello from my_function!"}
+
+def test_aggregate_endpoints(tmp_path):
+    """Test that answer distributions are served per survey type and per question."""
+    app = create_app()
+    app.config.update(TESTING=True, DATASTORE_PATH=str(tmp_path / "survey_data.db"))
+    with app.app_context():
+        from app.routes import get_store
+        get_store().save_surveys([Survey("Resident", "resident1.pdf", [Response(1, "4 - Interested")])])
+
+    with app.test_client() as client:
+        summary = client.get("/api/aggregates/resident").get_json()
+        question = client.get("/api/aggregates/Resident/1").get_json()
+
+        assert summary["surveys"] == 1
+        assert question == {"survey_type": "Resident", "question_id": 1, "responses": 1,
+                            "answers": {"4 - Interested": 1}}
+        assert client.get("/api/aggregates/Resident/7").status_code == 404
+        assert client.get("/api/aggregates/unknown").status_code == 404
+
+def test_search_endpoint(tmp_path):
+    """Test that responses are searchable by text, survey type and question."""
+    app = create_app()
+    app.config.update(TESTING=True, DATASTORE_PATH=str(tmp_path / "survey_data.db"))
+    with app.app_context():
+        from app.routes import get_store
+        get_store().save_surveys([Survey("Resident", "resident1.pdf", [Response(1, "4 - Interested"),
+                                                                       Response(2, ["Computer classes"])])])
+
+    with app.test_client() as client:
+        result = client.get("/api/search?q=c0mputer&type=resident").get_json()
+
+        assert result["query"] == "c0mputer" and result["total"] == 1
+        assert result["hits"][0]["survey_id"] == "resident1.pdf" and result["hits"][0]["question_id"] == 2
+        assert client.get("/api/search?q=interested&question_id=2").get_json()["total"] == 0
+        assert client.get("/api/search").status_code == 400
+        assert client.get("/api/search?q=x&limit=many").status_code == 400
+        assert client.get("/api/search?q=x&type=unknown").status_code == 404
+
+@pytest.fixture
+def survey_client(tmp_path):
+    """Test client over a store holding three resident surveys and one stakeholder survey."""
+    app = create_app()
+    app.config.update(TESTING=True, DATASTORE_PATH=str(tmp_path / "survey_data.db"))
+    with app.app_context():
+        from app.routes import get_store
+        get_store().save_surveys([Survey("Resident", f"resident{i}.pdf", [Response(1, "4 - Interested")])
+                                  for i in (1, 2, 3)] + [Survey("Stakeholder", "stakeholder1.pdf", [])])
+    with app.test_client() as client:
+        yield client
+
+def test_list_surveys_paginates_with_cursor(survey_client):
+    """Test that surveys of one type are listed page by page until the cursor runs out."""
+    first = survey_client.get("/api/surveys?type=resident&limit=2").get_json()
+    second = survey_client.get(f"/api/surveys?type=resident&limit=2&cursor={first['next_cursor']}").get_json()
+
+    assert [s["survey_id"] for s in first["surveys"]] == ["resident1.pdf", "resident2.pdf"]
+    assert [s["survey_id"] for s in second["surveys"]] == ["resident3.pdf"]
+    assert second["next_cursor"] is None
+    assert survey_client.get("/api/surveys?cursor=not-a-cursor").status_code == 400
+
+def test_get_survey(survey_client):
+    """Test that a single survey is returned by type and id."""
+    response = survey_client.get("/api/surveys/Stakeholder/stakeholder1.pdf")
+
+    assert response.get_json() == {"survey_type": "Stakeholder", "survey_id": "stakeholder1.pdf", "responses": []}
+    assert survey_client.get("/api/surveys/Stakeholder/missing.pdf").status_code == 404
+    assert survey_client.get("/api/surveys/Resident/2024/missing.pdf").status_code == 404
+
+def test_survey_etag_returns_not_modified_until_store_changes(survey_client):
+    """Test that polling with the previous ETag gets a 304 until a survey is saved."""
+    etag = survey_client.get("/api/surveys").headers["ETag"]
+
+    assert survey_client.get("/api/surveys", headers={"If-None-Match": etag}).status_code == 304
+
+    with survey_client.application.app_context():
+        from app.routes import get_store
+        get_store().save_surveys([Survey("Resident", "resident4.pdf", [])])
+    assert survey_client.get("/api/surveys", headers={"If-None-Match": etag}).status_code == 200
+
+def test_export_streams_csv(survey_client):
+    """Test that the export endpoint streams one CSV row per response, filtered by survey type."""
+    response = survey_client.get("/api/export?type=resident")
+
+    assert response.mimetype == "text/csv"
+    assert "surveys.csv" in response.headers["Content-Disposition"]
+    assert "Content-Length" not in response.headers
+    assert response.get_data(as_text=True).splitlines() == [
+        "survey_type,survey_id,question_id,response,confidence"] + [
+        f"Resident,resident{i}.pdf,1,4 - Interested," for i in (1, 2, 3)]
+    assert survey_client.get("/api/export?format=xlsx").status_code == 400
+    assert survey_client.get("/api/export?type=unknown").status_code == 404
+
+def test_upload_validation(client):
+    """Test that uploads without a valid survey type or PDF are rejected before queuing."""
+    from io import BytesIO
+    assert client.post("/api/uploads", data={"survey_type": "Other",
+                                            "file": (BytesIO(b"%PDF"), "a.pdf")}).status_code == 400
+    assert client.post("/api/uploads", data={"survey_type": "Resident",
+                                            "file": (BytesIO(b"text"), "a.txt")}).status_code == 400
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+def test_upload_of_existing_survey_name_conflicts(survey_client):
+    """Test that uploading a PDF named like a stored survey is rejected rather than overwriting it."""
+    from io import BytesIO
+    response = survey_client.post("/api/uploads", data={"survey_type": "resident",
+                                                        "file": (BytesIO(b"%PDF"), "resident1.pdf")})
+    assert response.status_code == 409
+
+def test_metrics_endpoint(client):
+    """Test that /metrics serves the registry in the Prometheus text format."""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "# TYPE stlovp_stage_seconds histogram" in response.get_data(as_text=True)
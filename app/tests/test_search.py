@@ -0,0 +1,70 @@
+from app.search import SearchIndex, tokenize, get_search_index
+from app.datastore import open_store
+from app.models import Response, Survey
+
+SURVEYS = [
+    Survey("Resident", "resident1.pdf", [Response(1, "4 - Interested"),
+                                         Response(2, ["Computer classes", "Evenings after work"])]),
+    Survey("Resident", "resident2.pdf", [Response(1, "2 - Slightly Interested"),
+                                         Response(2, ["Childcare would help me attend"])]),
+    Survey("Stakeholder", "stakeholder1.pdf", [Response(2, ["Job skills and resume help"])]),
+]
+
+def test_tokenize_normalizes_ocr_noise():
+    """Test that case, punctuation and digit-for-letter misreads inside words are normalized away."""
+    assert tokenize("C0mputer  Classes!") == ["computer", "classes"]
+    assert tokenize("Job 5kills, |ater") == ["job", "skills", "later"]
+    assert tokenize("4 - Interested") == ["4", "interested"]
+
+def test_search_ranks_and_filters():
+    """Test that hits come back best first and honour the survey type and question filters."""
+    index = SearchIndex()
+    index.update(SURVEYS)
+
+    hits = index.search("computer classes")["hits"]
+    assert (hits[0]["survey_id"], hits[0]["question_id"]) == ("resident1.pdf", 2)
+    assert hits[0]["response"] == ["Computer classes", "Evenings after work"]
+
+    assert index.search("help", survey_type="Stakeholder")["total"] == 1
+    assert [hit["question_id"] for hit in index.search("interested", question_id=1)["hits"]] == [1, 1]
+    assert index.search("interested", question_id=2)["total"] == 0
+
+def test_search_matches_ocr_misreads():
+    """Test that a query finds responses whose words OCR misread, and the other way round."""
+    index = SearchIndex()
+    index.update([Survey("Resident", "noisy.pdf", [Response(2, ["Chi1dcare wou1d he1p"]),
+                                                   Response(3, ["Evenlngs after wark"])])])
+
+    assert index.search("childcare")["hits"][0]["question_id"] == 2
+    assert index.search("evenings")["hits"][0]["question_id"] == 3
+
+    index = SearchIndex()
+    index.update(SURVEYS)
+    assert index.search("computr")["hits"][0]["survey_id"] == "resident1.pdf"
+
+def test_incremental_update_matches_rebuild():
+    """Test that replacing a survey through update() leaves the same index as a rebuild."""
+    rescanned = Survey("Resident", "resident1.pdf", [Response(2, ["Weekends only"])])
+    incremental = SearchIndex()
+    incremental.update(SURVEYS)
+    incremental.update([rescanned])
+
+    rebuilt = SearchIndex()
+    rebuilt.rebuild([rescanned] + SURVEYS[1:])
+
+    assert incremental.search("computer")["total"] == 0
+    for query in ("weekends", "interested", "help"):
+        assert incremental.search(query) == rebuilt.search(query)
+    assert set(incremental.postings) == set(rebuilt.postings)
+
+def test_get_search_index_rebuilds_only_when_store_changes(tmp_path):
+    """Test that the shared index is rebuilt after the store changes and reused otherwise."""
+    store = open_store(str(tmp_path / "survey_data.db"))
+    store.save_surveys(SURVEYS[:1])
+
+    index = get_search_index(store)
+    version = index.version
+    assert get_search_index(store) is index and index.version == version
+
+    store.save_surveys(SURVEYS[1:])
+    assert get_search_index(store).search("resume")["total"] == 1
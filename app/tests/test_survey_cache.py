@@ -0,0 +1,35 @@
+import pytest
+from app.survey_cache import SurveySnapshot, encode_cursor, decode_cursor
+
+def survey(survey_type, survey_id):
+    return {"survey_type": survey_type, "survey_id": survey_id, "responses": []}
+
+def test_snapshot_page_filters_and_resumes_after_cursor():
+    """Test that pages are sorted, respect type and id filters, and resume after the cursor."""
+    snapshot = SurveySnapshot("1", [survey("Stakeholder", "s1.pdf"), survey("Resident", "r2.pdf"),
+                                    survey("Resident", "r1.pdf")])
+
+    page, next_key = snapshot.page(limit=2)
+    assert [s["survey_id"] for s in page] == ["r1.pdf", "r2.pdf"]
+    assert snapshot.page(cursor=next_key)[0] == [survey("Stakeholder", "s1.pdf")]
+    assert snapshot.page("Resident", limit=2) == ([survey("Resident", "r1.pdf"), survey("Resident", "r2.pdf")], None)
+    assert snapshot.page(survey_id="r2.pdf")[0] == [survey("Resident", "r2.pdf")]
+
+def test_filtered_page_only_returns_cursor_when_more_matches_follow():
+    """Test that an id-filtered page is filled from matches only and ends without a cursor on the last match."""
+    snapshot = SurveySnapshot("1", [survey("Resident", "a.pdf"), survey("Resident", "b.pdf"),
+                                    survey("Stakeholder", "a.pdf"), survey("Stakeholder", "c.pdf")])
+
+    assert snapshot.page(survey_id="a.pdf", limit=1) == ([survey("Resident", "a.pdf")], ("Resident", "a.pdf"))
+    assert snapshot.page(survey_id="a.pdf", cursor=("Resident", "a.pdf"), limit=1) == (
+        [survey("Stakeholder", "a.pdf")], None)
+    assert snapshot.page(survey_id="a.pdf", limit=2) == (
+        [survey("Resident", "a.pdf"), survey("Stakeholder", "a.pdf")], None)
+    assert snapshot.page("Resident", survey_id="a.pdf", limit=1) == ([survey("Resident", "a.pdf")], None)
+    assert snapshot.page(survey_id="missing.pdf") == ([], None)
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the key they were made from and garbage is rejected."""
+    assert decode_cursor(encode_cursor(("Resident", "r1.pdf"))) == ("Resident", "r1.pdf")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,129 @@
+import os
+import threading
+import pytest
+import app.watcher as watcher_module
+from app.watcher import SurveyWatcher, scan_survey_tree, looks_complete
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def write_pdf(path, body=b"%PDF-1.4 survey\n%%EOF\n"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+
+@pytest.fixture
+def watched(tmp_path):
+    """A watcher over a resident folder with a fake clock, recording every ingested batch."""
+    folders = {"Resident": str(tmp_path / "resident")}
+    os.makedirs(folders["Resident"])
+    batches = []
+    clock = FakeClock()
+    watcher = SurveyWatcher(folders, ingest=batches.append, debounce=2.0, use_inotify=False, clock=clock)
+    return watcher, folders["Resident"], batches, clock
+
+def test_scan_survey_tree_recurses(tmp_path):
+    """Test that PDFs in subfolders are indexed and other files are ignored."""
+    write_pdf(str(tmp_path / "resident" / "resident1.pdf"))
+    write_pdf(str(tmp_path / "resident" / "2024" / "resident2.PDF"))
+    write_pdf(str(tmp_path / "resident" / "notes.txt"))
+
+    index = scan_survey_tree({"Resident": str(tmp_path / "resident"), "Stakeholder": str(tmp_path / "missing")})
+
+    assert sorted(os.path.basename(path) for path in index) == ["resident1.pdf", "resident2.PDF"]
+    assert {survey_type for survey_type, _, _ in index.values()} == {"Resident"}
+
+def test_watcher_debounces_and_ingests_changes_once(watched):
+    """Test that a new PDF is ingested once it settles, and again only after it changes."""
+    watcher, folder, batches, clock = watched
+    pdf_path = os.path.join(folder, "resident1.pdf")
+    write_pdf(pdf_path)
+
+    assert watcher.step() == []          # Just arrived
+    clock.now = 2.5
+    assert watcher.step() == [("Resident", "resident1.pdf", pdf_path)]
+    clock.now = 10.0
+    assert watcher.step() == []          # Unchanged
+
+    write_pdf(pdf_path, b"%PDF-1.4 rescanned survey\n%%EOF\n")
+    assert watcher.step() == []
+    clock.now = 12.5
+    assert watcher.step() == [("Resident", "resident1.pdf", pdf_path)]
+    assert len(batches) == 2
+
+def test_watcher_waits_for_partially_written_file(watched):
+    """Test that a file still growing, or missing its %%EOF marker, is not ingested."""
+    watcher, folder, batches, clock = watched
+    pdf_path = os.path.join(folder, "resident1.pdf")
+    write_pdf(pdf_path, b"%PDF-1.4 first half")
+    assert not looks_complete(pdf_path)
+
+    watcher.step()
+    clock.now = 5.0
+    assert watcher.step() == []
+
+    write_pdf(pdf_path, b"%PDF-1.4 first half, second half\n%%EOF\n")
+    assert watcher.step() == []          # Changed, so its timer restarts
+    clock.now = 7.5
+    assert watcher.step() == [("Resident", "resident1.pdf", pdf_path)]
+
+def test_watcher_backs_off_failing_file(tmp_path, monkeypatch):
+    """Test that a PDF that keeps failing does not hold up others, is retried with a delay, then left alone."""
+    monkeypatch.setattr(watcher_module, "WATCH_RETRY_SECONDS", 10.0)
+    folder = str(tmp_path / "resident")
+    good_pdf, bad_pdf = os.path.join(folder, "good.pdf"), os.path.join(folder, "bad.pdf")
+    write_pdf(good_pdf)
+    write_pdf(bad_pdf)
+    batches = []
+
+    def ingest(pdfs):
+        batches.append(sorted(filename for _, filename, _ in pdfs))
+        return [bad_pdf]
+    clock = FakeClock()
+    watcher = SurveyWatcher({"Resident": folder}, ingest=ingest, debounce=2.0, use_inotify=False, clock=clock)
+
+    watcher.step()
+    clock.now = 2.5
+    watcher.step()
+    assert batches == [["bad.pdf", "good.pdf"]]
+    assert list(watcher.pending) == [bad_pdf]
+
+    clock.now = 5.0
+    assert watcher.step() == []          # Waiting out the retry delay
+    clock.now = 14.5                     # Retry delay, then the usual debounce
+    assert watcher.step() == [("Resident", "bad.pdf", bad_pdf)]
+    clock.now = 40.0
+    assert watcher.step() == [("Resident", "bad.pdf", bad_pdf)]
+    assert watcher.pending == {}         # Given up after WATCH_MAX_ATTEMPTS
+    clock.now = 1000.0
+    assert watcher.step() == []
+
+    write_pdf(bad_pdf, b"%PDF-1.4 rescanned\n%%EOF\n")
+    watcher.step()
+    clock.now = 1002.5
+    assert watcher.step() == [("Resident", "bad.pdf", bad_pdf)]
+
+def test_watcher_uses_relative_survey_ids(watched):
+    """Test that a PDF in a subfolder is ingested under its path relative to the survey folder."""
+    watcher, folder, batches, clock = watched
+    pdf_path = os.path.join(folder, "2024", "scan.pdf")
+    write_pdf(pdf_path)
+
+    watcher.step()
+    clock.now = 2.5
+    assert watcher.step() == [("Resident", "2024/scan.pdf", pdf_path)]
+
+def test_watcher_run_stops(watched):
+    """Test that run() returns once its stop event is set."""
+    watcher, _, _, _ = watched
+    watcher.poll_interval = 0.01
+    stop_event = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop_event,))
+    thread.start()
+    stop_event.set()
+    thread.join(2)
+    assert not thread.is_alive()
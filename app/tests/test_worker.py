@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+import pytest
+import app.worker as worker
+from app.worker import IngestWorker, Lease, publish_result, task_key, merge_worker_results
+from app.datastore import open_store
+from app.models import Response, Survey
+from app.manifest import FileManifest
+from app.ocr_cache import OCRCache
+from app.ingest import pending_survey_pdfs
+
+@pytest.fixture
+def cluster(tmp_path, monkeypatch):
+    """Two resident PDFs and a factory for workers sharing one state folder, with OCR replaced by canned pages."""
+    extracted = []
+
+    def fake_extract_pdf(pdf_path, page_workers, template):
+        extracted.append(os.path.basename(pdf_path))
+        return [{"page": 1, "lines": ["1. How interested are you?", "4 - Interested"], "confidence": 90.0,
+                 "tier": "fast"}]
+    monkeypatch.setattr(worker, "load_form_template", lambda survey_type: None)
+    monkeypatch.setattr(worker, "extract_pdf", fake_extract_pdf)
+    monkeypatch.setattr(worker, "ocr_settings", lambda template=None: {"threshold_block_size": 31})
+
+    folder = tmp_path / "surveys" / "resident"
+    folder.mkdir(parents=True)
+    for name in ("resident1.pdf", "resident2.pdf"):
+        (folder / name).write_bytes(b"%PDF-1.4 " + name.encode())
+
+    def make_worker(worker_id, state_dir="work"):
+        return IngestWorker({"Resident": str(folder)}, str(tmp_path / "survey_data.db"), str(tmp_path / state_dir),
+                            worker_id=worker_id, lease_seconds=60,
+                            manifest=FileManifest(str(tmp_path / "survey_manifest.json")),
+                            cache=OCRCache(str(tmp_path / "cache")))
+    return make_worker, str(folder), extracted
+
+def test_workers_process_each_pdf_once_and_merge(cluster, tmp_path):
+    """Test that concurrent workers split the PDFs, never extract one twice, and merge into one store."""
+    make_worker, _, extracted = cluster
+    workers = [make_worker(f"worker-{index}") for index in range(4)]
+    threads = [threading.Thread(target=w.run, kwargs={"once": True}) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(extracted) == ["resident1.pdf", "resident2.pdf"]
+    store = open_store(str(tmp_path / "survey_data.db"))
+    assert {survey_id for _, survey_id in store.survey_keys()} == {"resident1.pdf", "resident2.pdf"}
+    assert not [name for name in os.listdir(tmp_path / "work") if name.endswith(".lease")]
+
+    assert workers[0].run_once() == 0  # Nothing left to claim
+
+def test_merged_pdfs_are_recorded_and_cached(cluster, tmp_path):
+    """Test that merged PDFs are in the manifest, so other ingestion runs skip them, and their OCR is cached."""
+    make_worker, folder, extracted = cluster
+    make_worker("worker-0").run(once=True)
+
+    assert pending_survey_pdfs({"Resident": folder}, str(tmp_path / "survey_data.db"),
+                               FileManifest(str(tmp_path / "survey_manifest.json"))) == []
+
+    # A worker with no shared state or manifest entries still finds the OCR output in the cache
+    os.remove(tmp_path / "survey_manifest.json")
+    make_worker("worker-1", state_dir="other-work").run(once=True)
+    assert sorted(extracted) == ["resident1.pdf", "resident2.pdf"]
+
+def test_edited_pdf_is_processed_again(cluster):
+    """Test that changing a PDF gives it a new task key, so it is extracted once more."""
+    make_worker, folder, extracted = cluster
+    node = make_worker("worker-0")
+    node.run_once()
+
+    pdf_path = os.path.join(folder, "resident1.pdf")
+    with open(pdf_path, "ab") as f:
+        f.write(b" rescanned")
+    os.utime(pdf_path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+
+    assert node.run_once() == 1
+    assert extracted.count("resident1.pdf") == 2
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    """Test that a held lease blocks other workers, and an expired one is taken over from its holder."""
+    path = str(tmp_path / "task.lease")
+    first = Lease.acquire(path, "worker-0", lease_seconds=60)
+
+    assert first.owned()
+    assert Lease.acquire(path, "worker-1", lease_seconds=60) is None
+
+    os.utime(path, (time.time() - 120, time.time() - 120))  # Holder stopped renewing
+    second = Lease.acquire(path, "worker-1", lease_seconds=60)
+
+    assert second is not None and second.owned()
+    assert not first.owned() and not first.renew()
+    first.release()
+    assert os.path.exists(path)
+
+def test_lease_of_crashed_worker_is_retried(cluster, tmp_path):
+    """Test that a PDF left leased by a worker that stopped heartbeating is picked up after the lease expires."""
+    make_worker, folder, extracted = cluster
+    node = make_worker("worker-1")
+    key, survey_type, filename, pdf_path = next(task for task in node.pending_tasks() if task[2] == "resident1.pdf")
+    crashed = Lease.acquire(os.path.join(node.state_dir, f"{key}.lease"), "worker-0", lease_seconds=60)
+
+    node.run_once()
+    assert extracted == ["resident2.pdf"]  # Live lease: left alone
+
+    os.utime(crashed.path, (time.time() - 120, time.time() - 120))
+    node.run_once()
+    assert sorted(extracted) == ["resident1.pdf", "resident2.pdf"]
+
+def test_result_is_published_once(tmp_path):
+    """Test that only the first worker to finish a task publishes its result."""
+    key = task_key("Resident", "resident1.pdf", 10, 1)
+    assert publish_result(str(tmp_path), key, "worker-0", {"survey": {}})
+    assert not publish_result(str(tmp_path), key, "worker-1", {"survey": {}})
+    assert sorted(os.listdir(tmp_path)) == [f"{key}.done"]
+
+def test_failed_extraction_releases_lease_and_gives_up(cluster, monkeypatch):
+    """Test that a failing PDF is released for retry and dropped after WORKER_MAX_ATTEMPTS."""
+    make_worker, _, _ = cluster
+    def broken_extract(pdf_path, page_workers, template):
+        raise RuntimeError("unreadable PDF")
+    monkeypatch.setattr(worker, "extract_pdf", broken_extract)
+    node = make_worker("worker-0")
+
+    for _ in range(worker.WORKER_MAX_ATTEMPTS):
+        assert node.run_once() == 0
+        assert not [name for name in os.listdir(node.state_dir) if name.endswith(".lease")]
+    assert node.pending_tasks() == []
+
+def test_merge_never_lets_an_old_version_win(tmp_path):
+    """Test that when two versions of one PDF await merging, the version on disk is saved whatever the order."""
+    pdf_path = tmp_path / "resident1.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 first scan")
+    old_stat = os.stat(pdf_path)
+    pdf_path.write_bytes(b"%PDF-1.4 second scan, longer")
+    new_stat = os.stat(pdf_path)
+
+    def publish(stat, answer, finished_at):
+        survey = Survey("Resident", "resident1.pdf", [Response(1, answer)])
+        record = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": answer}
+        publish_result(str(tmp_path), task_key("Resident", "resident1.pdf", stat.st_size, stat.st_mtime_ns),
+                       "worker-0", {"survey": survey.to_dict(), "pdf_path": str(pdf_path),
+                                    "manifest_record": record, "finished_at": finished_at})
+    publish(new_stat, "5 - Very Interested", finished_at=100.0)
+    publish(old_stat, "1 - Not Interested", finished_at=200.0)  # Slow worker finishing the old scan last
+
+    store = open_store(str(tmp_path / "survey_data.db"))
+    manifest = FileManifest(str(tmp_path / "survey_manifest.json"))
+    assert merge_worker_results(store, str(tmp_path), manifest=manifest) == 1
+
+    assert store.get_survey("Resident", "resident1.pdf").responses[0].response == "5 - Very Interested"
+    assert manifest.is_current(str(pdf_path))
+    assert merge_worker_results(store, str(tmp_path)) == 0
@@ -0,0 +1,165 @@
+import os
+import time
+import threading
+from app.ingest import SURVEY_FOLDERS, ingest_surveys, scan_survey_tree, survey_id_for
+from app.console_logger import log_stage
+
+# Optional inotify bindings (Linux); the watcher polls when they are not installed
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+# Seconds between rescans when polling, and the longest wait for an inotify event before rescanning anyway
+WATCH_POLL_INTERVAL = 2.0
+
+# Seconds a file's size and mtime must stay unchanged before it is treated as fully written
+WATCH_DEBOUNCE_SECONDS = 2.0
+
+# Failed ingestions of an unchanged file before the watcher gives up on it until it changes.
+# Retries wait WATCH_RETRY_SECONDS, doubling after each failure.
+WATCH_MAX_ATTEMPTS = 3
+WATCH_RETRY_SECONDS = 30.0
+
+def looks_complete(pdf_path: str) -> bool:
+    """Returns whether a PDF ends with its %%EOF marker, which a half-copied file usually lacks."""
+    try:
+        with open(pdf_path, "rb") as f:
+            f.seek(max(os.path.getsize(pdf_path) - 1024, 0))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+class SurveyWatcher:
+    """
+    Watches the survey folders and ingests PDFs as they arrive or change.
+    - Keeps a recursive index of the survey tree and diffs it on every rescan
+    - Rescans on inotify events when inotify_simple is installed, otherwise every poll interval
+    - Waits until a file has stopped changing (and ends in %%EOF) before ingesting it
+    - Ingests only the new or changed PDFs, in one batch per rescan
+    - Retries a PDF that fails to ingest with a growing delay, and gives up on it until it changes
+      after WATCH_MAX_ATTEMPTS failures, so one corrupt scan cannot stall the rest
+    """
+    def __init__(self, survey_folders: dict = None, ingest=None, debounce: float = None,
+                 poll_interval: float = None, use_inotify: bool = None, clock=time.monotonic):
+        """
+        Initialize a watcher.
+
+        Args:
+            survey_folders (dict, optional): Maps survey type to folder. Defaults to SURVEY_FOLDERS.
+            ingest (callable, optional): Called with a list of (survey_type, filename, pdf_path) tuples;
+                returns the paths that failed, if any. Defaults to ingest_surveys(pdfs=...).
+            debounce (float, optional): Seconds a file must be stable. Defaults to WATCH_DEBOUNCE_SECONDS.
+            poll_interval (float, optional): Seconds between rescans. Defaults to WATCH_POLL_INTERVAL.
+            use_inotify (bool, optional): Force inotify on or off. Defaults to on when inotify_simple is installed.
+            clock (callable, optional): Time source, replaceable in tests.
+        """
+        self.survey_folders = survey_folders or SURVEY_FOLDERS
+        self.ingest = ingest or self._ingest
+        self.debounce = WATCH_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.poll_interval = poll_interval or WATCH_POLL_INTERVAL
+        self.use_inotify = inotify_simple is not None if use_inotify is None else use_inotify
+        self.clock = clock
+        self.ingested = {}  # pdf_path -> (survey_type, size, mtime_ns) when last handed to ingest
+        self.pending = {}   # pdf_path -> (stat tuple, time it was first seen with that stat, or of its next retry)
+        self.failures = {}  # pdf_path -> failed attempts with its current stat
+        self._inotify = None
+        self._watched_dirs = {}
+
+    def _ingest(self, pdfs: list) -> list:
+        failed = []
+        ingest_surveys(self.survey_folders, pdfs=pdfs, failed=failed)
+        return failed
+
+    def step(self) -> list:
+        """
+        Rescans the tree once and ingests every changed PDF that has settled.
+
+        Returns:
+            list: The (survey_type, filename, pdf_path) tuples that were ingested.
+        """
+        now = self.clock()
+        index = scan_survey_tree(self.survey_folders)
+
+        for pdf_path, stat in index.items():
+            if self.ingested.get(pdf_path) == stat:
+                self.pending.pop(pdf_path, None)
+            elif pdf_path not in self.pending or self.pending[pdf_path][0] != stat:
+                self.pending[pdf_path] = (stat, now)  # New, or still being written: restart its timer
+                self.failures.pop(pdf_path, None)
+        for pdf_path in set(self.pending) - set(index):
+            del self.pending[pdf_path]  # Deleted before it settled
+            self.failures.pop(pdf_path, None)
+        for pdf_path in set(self.ingested) - set(index):
+            del self.ingested[pdf_path]
+
+        ready = [pdf_path for pdf_path, (_, first_seen) in sorted(self.pending.items())
+                 if now - first_seen >= self.debounce and looks_complete(pdf_path)]
+        if not ready:
+            return []
+
+        batch = []
+        for pdf_path in ready:
+            survey_type = self.pending[pdf_path][0][0]
+            batch.append((survey_type, survey_id_for(self.survey_folders[survey_type], pdf_path), pdf_path))
+        log_stage("New Survey Files Detected 👀", f"Ingesting {len(batch)} PDF(s).")
+        failed = set(self.ingest(batch) or ())
+        for pdf_path in ready:
+            stat = self.pending[pdf_path][0]
+            if pdf_path not in failed:
+                del self.pending[pdf_path]
+                self.failures.pop(pdf_path, None)
+                self.ingested[pdf_path] = stat
+                continue
+            attempts = self.failures[pdf_path] = self.failures.get(pdf_path, 0) + 1
+            if attempts >= WATCH_MAX_ATTEMPTS:
+                # Leave it alone until its size or mtime changes
+                del self.pending[pdf_path]
+                self.ingested[pdf_path] = stat
+                log_stage("Giving Up on Survey File ⚠️", f"{pdf_path} failed {attempts} time(s); "
+                                                         f"it will be retried once it changes.")
+            else:
+                # Becomes ready again after the retry delay
+                retry_delay = WATCH_RETRY_SECONDS * 2 ** (attempts - 1)
+                self.pending[pdf_path] = (stat, now + retry_delay)
+        return batch
+
+    def _watch_directories(self):
+        """Adds an inotify watch to every survey directory not yet watched (new subfolders included)."""
+        flags = inotify_simple.flags
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE | flags.MOVED_FROM
+        for survey_folder in self.survey_folders.values():
+            for directory, _, _ in os.walk(survey_folder):
+                if directory not in self._watched_dirs:
+                    try:
+                        self._watched_dirs[directory] = self._inotify.add_watch(directory, mask)
+                    except OSError:
+                        continue
+
+    def _wait(self, stop_event: threading.Event):
+        """Blocks until the tree may have changed, a pending file may have settled, or the watcher is stopped."""
+        timeout = min(self.poll_interval, self.debounce) if self.pending else self.poll_interval
+        if self._inotify is None:
+            stop_event.wait(timeout)
+            return
+        self._watch_directories()
+        self._inotify.read(timeout=int(timeout * 1000))
+
+    def run(self, stop_event: threading.Event = None):
+        """Watches until stop_event is set (or forever). Files already in the tree are checked on the first pass."""
+        stop_event = stop_event or threading.Event()
+        if self.use_inotify:
+            self._inotify = inotify_simple.INotify()
+        log_stage("Watching Survey Folders 👀",
+                  f"{', '.join(self.survey_folders.values())} ({'inotify' if self._inotify else 'polling'})")
+        try:
+            while not stop_event.is_set():
+                try:
+                    self.step()
+                except Exception as e:
+                    log_stage("Watch Ingestion Failed! ❌", str(e))
+                self._wait(stop_event)
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
@@ -0,0 +1,361 @@
+import os
+import json
+import time
+import socket
+import random
+import hashlib
+import threading
+from app.ingest import (SURVEY_FOLDERS, extract_pdf, build_survey, save_ingested_surveys, scan_survey_tree,
+                        survey_id_for)
+from app.extract_text import record_page_metrics, ocr_settings
+from app.form_templates import load_form_template
+from app.datastore import open_store
+from app.manifest import FileManifest
+from app.ocr_cache import OCRCache
+from app.models import Survey
+from app.console_logger import log_stage
+
+# Shared folder holding lease files, finished results and merge markers; must be visible to every worker
+WORKER_STATE_DIR = os.path.join("surveys", ".work")
+
+# Seconds a lease stays valid without a heartbeat before another worker may take the file over
+LEASE_SECONDS = 120.0
+
+# Seconds between rescans of the survey folders when a worker finds nothing to claim
+WORKER_POLL_INTERVAL = 5.0
+
+# Times one worker retries a file whose extraction fails before leaving it to other workers
+WORKER_MAX_ATTEMPTS = 3
+
+# Most finished results written to the survey store in one merge transaction
+MERGE_BATCH_SIZE = 500
+
+def task_key(survey_type: str, survey_id: str, size: int, mtime_ns: int) -> str:
+    """Names one version of one survey PDF; an edited file gets a new key and is processed again."""
+    return hashlib.sha1(f"{survey_type}\0{survey_id}\0{size}\0{mtime_ns}".encode("utf-8")).hexdigest()[:24]
+
+class Lease:
+    """
+    A claim on one task, held as a lease file created with O_EXCL.
+    - The file's mtime is the heartbeat; renew() touches it
+    - A lease whose mtime is older than lease_seconds has expired and may be stolen by another worker
+    """
+    def __init__(self, path: str, owner: str):
+        self.path = path
+        self.owner = owner
+
+    @classmethod
+    def acquire(cls, path: str, owner: str, lease_seconds: float, info: dict = None, clock=time.time):
+        """
+        Claims a lease file, taking it over if its holder stopped renewing it.
+
+        Returns:
+            Lease: The claimed lease, or None if another worker holds it.
+        """
+        payload = json.dumps(dict(info or {}, owner=owner, claimed_at=clock())).encode("utf-8")
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not cls._steal_expired(path, owner, lease_seconds, clock):
+                    return None
+                continue  # The expired lease is gone; race the other workers to create a fresh one
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            return cls(path, owner)
+        return None
+
+    @staticmethod
+    def _steal_expired(path: str, owner: str, lease_seconds: float, clock) -> bool:
+        """Moves an expired lease aside. Rename is atomic, so only one worker succeeds per expired lease."""
+        try:
+            if clock() - os.stat(path).st_mtime < lease_seconds:
+                return False
+            stale_path = f"{path}.{owner}.stale"
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return True  # Released or stolen in the meantime; try to create it
+        if clock() - os.stat(stale_path).st_mtime < lease_seconds:
+            # Renewed (or re-created) between the check and the rename: hand it back
+            try:
+                os.link(stale_path, path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+        os.remove(stale_path)
+        log_stage("Expired Lease Taken Over ♻️", os.path.basename(path))
+        return True
+
+    def owned(self) -> bool:
+        """Returns whether the lease file still exists and names this holder."""
+        try:
+            with open(self.path, "rb") as f:
+                return json.loads(f.read() or b"{}").get("owner") == self.owner
+        except (OSError, ValueError):
+            return False
+
+    def renew(self) -> bool:
+        """Touches the lease so it does not expire. Returns False once the lease has been lost."""
+        if not self.owned():
+            return False
+        try:
+            os.utime(self.path)
+            return True
+        except OSError:
+            return False
+
+    def release(self):
+        """Deletes the lease file if this holder still owns it."""
+        if self.owned():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+def publish_result(state_dir: str, key: str, owner: str, payload: dict) -> bool:
+    """
+    Writes a task's result as <key>.done, exactly once.
+
+    The result is written to a temporary file and hard-linked into place, which fails if
+    another worker already published the same task.
+
+    Returns:
+        bool: False if the task had already been published.
+    """
+    done_path = os.path.join(state_dir, f"{key}.done")
+    temp_path = f"{done_path}.{owner}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(payload, owner=owner), f)
+    try:
+        os.link(temp_path, done_path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(temp_path)
+
+def is_stale_result(result: dict) -> bool:
+    """Returns whether a result's PDF has been edited or deleted since it was processed."""
+    try:
+        stat = os.stat(result["pdf_path"])
+    except FileNotFoundError:
+        return True
+    record = result["manifest_record"]
+    return record["size"] != stat.st_size or record["mtime"] != stat.st_mtime
+
+def merge_worker_results(store, state_dir: str = None, batch_size: int = None, manifest: FileManifest = None) -> int:
+    """
+    Saves every published result not yet in the survey store, oldest first, then marks it <key>.merged.
+    - Skips results whose PDF changed after it was processed, so an old version never overwrites a newer one
+    - Keeps only the newest result per survey within a batch
+    - Records each merged PDF in the manifest, so ingestion runs and serve's auto mode see it as ingested
+    - Saving is an upsert keyed on (survey_type, survey_id), so merging a result twice is harmless
+
+    Returns:
+        int: The number of surveys saved.
+    """
+    state_dir = state_dir or WORKER_STATE_DIR
+    batch_size = batch_size or MERGE_BATCH_SIZE
+    names = set(os.listdir(state_dir))
+    finished = []
+    for name in names:
+        if name.endswith(".done") and f"{name[:-5]}.merged" not in names:
+            with open(os.path.join(state_dir, name), encoding="utf-8") as f:
+                finished.append((json.load(f)["finished_at"], name[:-5]))
+    pending = [key for _, key in sorted(finished)]
+
+    merged = 0
+    for start in range(0, len(pending), batch_size):
+        keys = pending[start:start + batch_size]
+        latest = {}  # (survey_type, survey_id) -> (survey, result), later results replacing earlier ones
+        for key in keys:
+            with open(os.path.join(state_dir, f"{key}.done"), encoding="utf-8") as f:
+                result = json.load(f)
+            if is_stale_result(result):
+                log_stage("Stale Worker Result Skipped ⏭️", result["pdf_path"])
+                continue
+            survey = Survey.from_dict(result["survey"])
+            latest[(survey.survey_type, survey.survey_id)] = (survey, result)
+        surveys = [survey for survey, _ in latest.values()]
+        save_ingested_surveys(store, surveys)
+        if manifest is not None:
+            for survey, result in latest.values():
+                manifest.record(result["pdf_path"], result["manifest_record"],
+                                survey_type=survey.survey_type, survey_id=survey.survey_id)
+            manifest.save()
+        for key in keys:
+            open(os.path.join(state_dir, f"{key}.merged"), "w").close()
+        merged += len(surveys)
+    if merged:
+        log_stage("Worker Results Merged 📥", f"{merged} survey(s) saved to {store.path}")
+    return merged
+
+class IngestWorker:
+    """
+    One ingestion worker. Any number may run side by side, on one machine or several sharing the survey folders.
+    - Workers coordinate only through files in the shared state folder, with no central scheduler
+    - A PDF is claimed with a lease file; a background thread renews held leases, and leases
+      left behind by crashed workers expire and are taken over
+    - A finished PDF is published as a result file exactly once, so a file is never ingested twice;
+      OCR output is shared through the OCR cache like any other ingestion run
+    - One worker at a time, holding the merge lease, writes published results to the survey store
+      in batches, so workers never contend on the store
+    """
+    def __init__(self, survey_folders: dict = None, datastore_path: str = None, state_dir: str = None,
+                 worker_id: str = None, lease_seconds: float = None, manifest: FileManifest = None,
+                 cache: OCRCache = None, clock=time.time):
+        """
+        Initialize a worker.
+
+        Args:
+            survey_folders (dict, optional): Maps survey type to folder. Defaults to SURVEY_FOLDERS.
+            datastore_path (str, optional): Survey store results are merged into. Defaults to DATASTORE_PATH.
+            state_dir (str, optional): Shared lease and result folder. Defaults to WORKER_STATE_DIR.
+            worker_id (str, optional): Unique name for this worker. Defaults to host name and process id.
+            lease_seconds (float, optional): Lease lifetime without a heartbeat. Defaults to LEASE_SECONDS.
+            manifest (FileManifest, optional): PDFs this manifest shows as already ingested are skipped,
+                and merged PDFs are recorded in it. Defaults to a FileManifest at MANIFEST_PATH.
+            cache (OCRCache, optional): OCR result cache. Defaults to an OCRCache in OCR_CACHE_DIR.
+            clock (callable, optional): Wall-clock time source, replaceable in tests.
+        """
+        self.survey_folders = survey_folders or SURVEY_FOLDERS
+        self.datastore_path = datastore_path
+        self.state_dir = state_dir or WORKER_STATE_DIR
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds or LEASE_SECONDS
+        self.manifest = manifest or FileManifest()
+        self.cache = cache or OCRCache()
+        self.clock = clock
+        self.failures = {}
+        self.leases = set()
+        self._store = None
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.worker_id)
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def pending_tasks(self) -> list:
+        """
+        Lists the PDFs that have no published result yet, in a per-worker random order
+        so concurrent workers rarely race for the same file.
+
+        Returns:
+            list: (key, survey_type, filename, pdf_path) tuples.
+        """
+        finished = {name[:-5] for name in os.listdir(self.state_dir) if name.endswith(".done")}
+        tasks = []
+        for pdf_path, (survey_type, size, mtime_ns) in scan_survey_tree(self.survey_folders).items():
+            filename = survey_id_for(self.survey_folders[survey_type], pdf_path)
+            key = task_key(survey_type, filename, size, mtime_ns)
+            if key in finished or self.failures.get(key, 0) >= WORKER_MAX_ATTEMPTS:
+                continue
+            try:
+                if self.manifest.is_current(pdf_path):
+                    continue
+            except OSError:
+                continue  # Deleted since the scan
+            tasks.append((key, survey_type, filename, pdf_path))
+        self._rng.shuffle(tasks)
+        return tasks
+
+    def process(self, key: str, survey_type: str, filename: str, pdf_path: str) -> bool:
+        """
+        Claims and extracts one PDF, then publishes its survey.
+
+        Returns:
+            bool: Whether this worker published the result.
+        """
+        lease = Lease.acquire(os.path.join(self.state_dir, f"{key}.lease"), self.worker_id, self.lease_seconds,
+                              {"survey_type": survey_type, "survey_id": filename, "pdf_path": pdf_path}, self.clock)
+        if lease is None:
+            return False
+        with self._lock:
+            self.leases.add(lease)
+        try:
+            # Results are published before leases are released, so this catches a worker that finished
+            # the file after our scan
+            if os.path.exists(os.path.join(self.state_dir, f"{key}.done")):
+                return False
+            template = load_form_template(survey_type)
+            _, record = self.manifest.check(pdf_path)
+            cache_key = self.cache.key_for(pdf_path, ocr_settings(template=template), content_hash=record["sha256"])
+            extracted_output = self.cache.get(cache_key)
+            if extracted_output is None:
+                extracted_output = extract_pdf(pdf_path, 1, template)
+                self.cache.put(cache_key, extracted_output)
+                if template is None:
+                    record_page_metrics(extracted_output)
+            survey = build_survey(survey_type, filename, extracted_output, template)
+            if not lease.owned():
+                log_stage("Lease Lost, Result Dropped ⚠️", filename)
+                return False
+            published = publish_result(self.state_dir, key, self.worker_id,
+                                       {"survey": survey.to_dict(), "pdf_path": pdf_path, "manifest_record": record,
+                                        "finished_at": self.clock()})
+            if published:
+                log_stage("Survey Processed ✅", f"{survey_type}: {filename} ({self.worker_id})")
+            return published
+        except Exception as e:
+            self.failures[key] = self.failures.get(key, 0) + 1
+            log_stage("Survey Processing Failed! ❌", f"{filename}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self.leases.discard(lease)
+            lease.release()
+
+    def merge(self) -> int:
+        """Merges published results into the survey store if no other worker is merging."""
+        lease = Lease.acquire(os.path.join(self.state_dir, "merge.lease"), self.worker_id, self.lease_seconds,
+                              clock=self.clock)
+        if lease is None:
+            return 0
+        with self._lock:
+            self.leases.add(lease)
+        try:
+            if self._store is None:
+                self._store = open_store(self.datastore_path)
+            # Reload under the merge lease so entries merged by other workers are kept
+            self.manifest = FileManifest(self.manifest.manifest_path)
+            return merge_worker_results(self._store, self.state_dir, manifest=self.manifest)
+        finally:
+            with self._lock:
+                self.leases.discard(lease)
+            lease.release()
+
+    def run_once(self) -> int:
+        """
+        Processes every pending PDF this worker can claim, merging after each one.
+
+        Returns:
+            int: The number of PDFs this worker processed.
+        """
+        processed = 0
+        for task in self.pending_tasks():
+            if self.process(*task):
+                processed += 1
+                self.merge()
+        self.merge()  # Results published by workers that are not merging
+        return processed
+
+    def _heartbeat(self, stop_event: threading.Event):
+        while not stop_event.wait(self.lease_seconds / 4):
+            with self._lock:
+                leases = list(self.leases)
+            for lease in leases:
+                lease.renew()
+
+    def run(self, stop_event: threading.Event = None, poll_interval: float = None, once: bool = False):
+        """Claims and processes PDFs until stop_event is set, or until nothing is left to claim when once is set."""
+        stop_event = stop_event or threading.Event()
+        heartbeat_stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(heartbeat_stop,), name="lease-heartbeat", daemon=True).start()
+        log_stage("Ingestion Worker Started 👷", f"{self.worker_id} (state in {self.state_dir})")
+        try:
+            while not stop_event.is_set():
+                if not self.run_once():
+                    if once:
+                        break
+                    stop_event.wait(poll_interval or WORKER_POLL_INTERVAL)
+        finally:
+            heartbeat_stop.set()
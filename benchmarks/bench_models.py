@@ -0,0 +1,55 @@
+"""
+Compares bulk serialization of Survey objects with the columnar SurveyTable
+on a synthetic dataset.
+
+Usage:
+    python -m benchmarks.bench_models [--surveys 20000] [--questions 20] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import time
+from app.models import Response, Survey, SurveyTable
+
+ANSWERS = ["1 - Not Interested", "2 - Slightly Interested", "3 - Somewhat Interested",
+           "4 - Interested", "5 - Very Interested", ["Job Skills", "Life Skills"], ["Evenings"]]
+
+def make_surveys(count: int, questions: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [Survey(rng.choice(["Resident", "Stakeholder"]), f"survey{index}.pdf",
+                   [Response(q, rng.choice(ANSWERS), round(rng.uniform(50, 99), 2)) for q in range(1, questions + 1)])
+            for index in range(count)]
+
+def best_of(repeat: int, func) -> float:
+    """Returns the fastest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--surveys", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    surveys = make_surveys(args.surveys, args.questions)
+    table = SurveyTable.from_surveys(surveys)
+    assert table.to_json() == json.dumps([survey.to_dict() for survey in surveys])
+
+    objects_ms = best_of(args.repeat, lambda: json.dumps([survey.to_dict() for survey in surveys]))
+    table_ms = best_of(args.repeat, table.to_json)
+    print(json.dumps({
+        "surveys": args.surveys,
+        "responses": len(table.question_ids),
+        "distinct_answers": len(table.answers),
+        "objects_to_json_ms": round(objects_ms, 2),
+        "table_to_json_ms": round(table_ms, 2),
+        "speedup": round(objects_ms / table_ms, 2),
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures per-page OCR latency for each available OCR engine.
+
+The page is drawn with OpenCV rather than rendered from a PDF, so the numbers
+isolate the OCR call itself (process start-up, temp file I/O and model loading
+for pytesseract; a single buffer hand-off for tesserocr).
+
+Usage:
+    python -m benchmarks.bench_ocr_engine [--pages 20]
+"""
+import argparse
+import json
+import time
+import cv2
+import numpy as np
+import app.extract_text as extract_text
+
+def make_page(lines: int = 12, width: int = 1700, height: int = 2200) -> np.ndarray:
+    """Draws a synthetic survey page and returns it preprocessed, as OCR sees it."""
+    page = np.full((height, width), 255, dtype=np.uint8)
+    for i in range(lines):
+        text = f"{i + 1}. How interested are you in taking classes? 4 - Interested"
+        cv2.putText(page, text, (80, 150 + i * 150), cv2.FONT_HERSHEY_SIMPLEX, 1.4, 0, 3)
+    return extract_text.preprocess_image(page)
+
+def bench_engine(engine_name: str, page: np.ndarray, pages: int) -> dict:
+    """OCRs the same page repeatedly with one engine and returns latency figures in milliseconds."""
+    start = time.perf_counter()
+    engine = extract_text.OCR_ENGINES[engine_name]()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(pages):
+        start = time.perf_counter()
+        engine.image_to_string(page)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "engine": engine_name,
+        "pages": pages,
+        "engine_load_ms": round(load_ms, 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "median_ms": round(timings[len(timings) // 2], 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="Pages OCR'd per engine.")
+    args = parser.parse_args()
+
+    page = make_page()
+    engines = [extract_text.PytesseractEngine.name]
+    if extract_text.tesserocr is not None:
+        engines.append(extract_text.TesserocrEngine.name)
+
+    results = [bench_engine(name, page, args.pages) for name in engines]
+    if len(results) == 2:
+        saved_ms = results[0]["mean_ms"] - results[1]["mean_ms"]
+        results.append({"per_page_overhead_removed_ms": round(saved_ms, 2)})
+    print(json.dumps(results, indent=4))
+
+if __name__ == "__main__":
+    main()
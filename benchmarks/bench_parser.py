@@ -0,0 +1,83 @@
+"""
+Compares the streaming survey parser with the original line-by-line implementation
+on large synthetic OCR transcripts.
+
+Usage:
+    python -m benchmarks.bench_parser [--questions 20000] [--answer-lines 3] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import time
+from app.models import Response, Survey
+from app.extract_text import parse_survey_responses
+
+def legacy_parse_survey_responses(survey_type: str, survey_id: str, extracted_text: list) -> Survey:
+    """The parser before the streaming rewrite, kept here as the baseline (capped at 20 questions)."""
+    responses = []
+    current_question_id = None
+    response_buffer = []
+
+    for line in extracted_text:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.endswith("?") or any(line.startswith(f"{i}.") for i in range(1, 21)):
+            if current_question_id is not None and response_buffer:
+                responses.append(Response(current_question_id, response_buffer))
+
+            current_question_id = len(responses) + 1
+            response_buffer = []
+        elif current_question_id:
+            response_buffer.append(line)
+
+    if current_question_id and response_buffer:
+        responses.append(Response(current_question_id, response_buffer))
+
+    return Survey(survey_type, survey_id, responses)
+
+def make_transcript(questions: int, answer_lines: int, seed: int = 0) -> list:
+    """Builds OCR-like lines: numbered questions, answers, blank lines and stray noise."""
+    rng = random.Random(seed)
+    answers = ["4 - Interested", "3 - Somewhat Important", "Evenings after work", "Job skills", "| ~ ."]
+    lines = []
+    for i in range(1, questions + 1):
+        lines.append(f"{(i - 1) % 20 + 1}. How interested are you in taking classes")
+        for _ in range(answer_lines):
+            lines.append(rng.choice(answers))
+        lines.append("")
+    return lines
+
+def best_of(repeat: int, parse, lines: list) -> float:
+    """Returns the fastest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse("Resident", "bench.pdf", lines)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--answer-lines", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Question numbers cycle through 1-20 so the legacy parser detects every header too
+    lines = make_transcript(args.questions, args.answer_lines)
+    assert ([r.to_dict() for r in parse_survey_responses("Resident", "bench.pdf", lines).responses]
+            == [r.to_dict() for r in legacy_parse_survey_responses("Resident", "bench.pdf", lines).responses])
+
+    legacy_ms = best_of(args.repeat, legacy_parse_survey_responses, lines)
+    streaming_ms = best_of(args.repeat, parse_survey_responses, lines)
+    print(json.dumps({
+        "lines": len(lines),
+        "legacy_ms": round(legacy_ms, 2),
+        "streaming_ms": round(streaming_ms, 2),
+        "speedup": round(legacy_ms / streaming_ms, 2),
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+End-to-end OCR pipeline benchmark on a synthetic survey corpus.
+
+Generates PDFs with benchmarks.corpus, then measures, per stage:
+- extract: extract_text_from_pdf on every PDF (no cache)
+- parse: parse_survey_responses on the extracted lines (or on the corpus's ideal transcripts when extract is skipped,
+  which needs no OCR binaries)
+- save: save_to_json over the corpus folder, cold (empty OCR cache and manifest) and warm (unchanged files)
+
+Reports throughput, per-document latency percentiles and peak memory as JSON,
+tagged with the git commit and settings so runs can be compared across commits.
+Everything runs offline; the extract and save stages need the tesseract and poppler binaries installed.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--documents 20] [--pages 2] [--questions 20] [--noise 0.3]
+        [--stages extract,parse,save] [--trace-python-memory] [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+import app.extract_text as extract_text
+import app.manifest as manifest
+import app.ocr_cache as ocr_cache
+import app.form_templates as form_templates
+from benchmarks.corpus import generate_corpus
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def peak_rss_mb() -> dict:
+    """Peak resident memory so far, for this process and for its finished child processes (OCR workers)."""
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    return {
+        "self_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+def measure(label: str, items: list, func, pages_per_item: int = None, trace_memory: bool = False) -> dict:
+    """
+    Runs func once per item and returns throughput, latency percentiles (ms) and peak memory.
+
+    RSS peaks include the C libraries and worker processes. The Python heap peak is only
+    measured with trace_memory, as tracemalloc slows Python-heavy stages noticeably.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        func(item)
+        latencies.append((time.perf_counter() - item_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "stage": label,
+        "items": len(items),
+        "seconds": round(elapsed, 4),
+        "items_per_second": round(len(items) / elapsed, 3) if elapsed else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p90": round(percentile(latencies, 0.90), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(max(latencies), 3),
+        },
+        "peak_rss": peak_rss_mb(),
+    }
+    if trace_memory:
+        result["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        tracemalloc.stop()
+    if pages_per_item:
+        result["pages_per_second"] = round(len(items) * pages_per_item / elapsed, 3) if elapsed else None
+    return result
+
+def git_commit():
+    """Returns the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.3, help="0 (clean) to 1 (heavy speckle).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Page workers for extract_text_from_pdf.")
+    parser.add_argument("--stages", default="extract,parse,save")
+    parser.add_argument("--tesseract-cmd", default="tesseract")
+    parser.add_argument("--poppler-path", default=None, help="Folder holding pdftoppm/pdfinfo; defaults to PATH.")
+    parser.add_argument("--trace-python-memory", action="store_true", help="Also report Python heap peaks (slower).")
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout.")
+    args = parser.parse_args()
+    stages = set(args.stages.split(","))
+
+    # Use the local Linux binaries instead of the Windows install paths configured in extract_text
+    extract_text.TESSERACT_CMD = args.tesseract_cmd
+    extract_text.POPPLER_PATH = args.poppler_path
+
+    report = {
+        "benchmark": "pipeline",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": [],
+    }
+    if stages & {"extract", "save"}:
+        report["ocr_settings"] = extract_text.ocr_settings()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir = os.path.join(work_dir, "surveys", "resident")
+        corpus = generate_corpus(corpus_dir, args.documents, args.pages, args.questions, args.noise, args.seed)
+        pdf_paths = [pdf_path for pdf_path, _ in corpus]
+
+        # Keep every write inside the temporary folder
+        extract_text.DATASTORE_PATH = os.path.join(work_dir, "survey_data.db")
+        manifest.MANIFEST_PATH = os.path.join(work_dir, "survey_manifest.json")
+        ocr_cache.OCR_CACHE_DIR = os.path.join(work_dir, ".ocr_cache")
+        form_templates.FORM_TEMPLATE_DIR = os.path.join(work_dir, "form_templates")
+
+        transcripts = dict(corpus)
+        if "extract" in stages:
+            def extract(pdf_path):
+                transcripts[pdf_path] = extract_text.extract_text_from_pdf(pdf_path, max_workers=args.workers)
+            report["results"].append(measure("extract_text_from_pdf", pdf_paths, extract, args.pages,
+                                             args.trace_python_memory))
+
+        if "parse" in stages:
+            # Parsing one transcript takes microseconds, so each sample parses it many times
+            repeats = 200
+            samples = [transcripts[path] for path in pdf_paths] * 5
+            random.Random(args.seed).shuffle(samples)
+
+            def parse(lines):
+                for _ in range(repeats):
+                    extract_text.parse_survey_responses("Resident", "synthetic.pdf", lines)
+            result = measure("parse_survey_responses", samples, parse, trace_memory=args.trace_python_memory)
+            result["parses_per_item"] = repeats
+            result["lines_per_second"] = round(sum(map(len, samples)) * repeats / result["seconds"], 1)
+            report["results"].append(result)
+
+        if "save" in stages:
+            report["results"].append(measure("save_to_json_cold", [corpus_dir],
+                                             lambda folder: extract_text.save_to_json("Resident", folder),
+                                             args.documents * args.pages, args.trace_python_memory))
+            report["results"].append(measure("save_to_json_warm", [corpus_dir],
+                                             lambda folder: extract_text.save_to_json("Resident", folder),
+                                             trace_memory=args.trace_python_memory))
+
+    output = json.dumps(report, indent=4)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
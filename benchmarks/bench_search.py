@@ -0,0 +1,70 @@
+"""
+Measures search index build time and query latency on a synthetic dataset
+of OCR-noisy survey responses.
+
+Usage:
+    python -m benchmarks.bench_search [--surveys 20000] [--questions 20] [--noise 0.05] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import time
+from app.models import Response, Survey
+from app.search import SearchIndex
+from benchmarks.bench_models import best_of
+from benchmarks.corpus import RATINGS, FREE_TEXT
+
+# Misreads applied to the synthetic text, as OCR makes them
+MISREADS = {"l": "1", "o": "0", "s": "5", "i": "l", "e": "c"}
+
+QUERIES = ["computer classes", "childcare", "evenings after work", "interested", "resume help weekends",
+           "c0mputer", "jobskills"]
+
+def misread(text: str, rng: random.Random, noise: float) -> str:
+    return "".join(MISREADS[c] if c in MISREADS and rng.random() < noise else c for c in text)
+
+def make_surveys(count: int, questions: int, noise: float, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    surveys = []
+    for index in range(count):
+        responses = []
+        for question_id in range(1, questions + 1):
+            if rng.random() < 0.5:
+                responses.append(Response(question_id, misread(rng.choice(RATINGS), rng, noise)))
+            else:
+                responses.append(Response(question_id, [misread(line, rng, noise)
+                                                        for line in rng.sample(FREE_TEXT, rng.randint(1, 2))]))
+        surveys.append(Survey(rng.choice(["Resident", "Stakeholder"]), f"survey{index}.pdf", responses))
+    return surveys
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--surveys", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.05, help="Chance each confusable character is misread.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    surveys = make_surveys(args.surveys, args.questions, args.noise)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.rebuild(surveys)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = {}
+    for query in QUERIES:
+        queries[query] = {
+            "ms": round(best_of(args.repeat, lambda: index.search(query)), 2),
+            "filtered_ms": round(best_of(args.repeat, lambda: index.search(query, "Resident", 3)), 2),
+            "total": index.search(query)["total"],
+        }
+    print(json.dumps({
+        "surveys": args.surveys,
+        "responses": len(index.docs),
+        "terms": len(index.postings),
+        "build_ms": round(build_ms, 2),
+        "queries": queries,
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Generates synthetic survey PDFs for benchmarks.
+
+Each PDF holds numbered questions followed by one to three answer lines, spread
+over the requested number of pages, with optional scanner-style noise (random
+specks and faint stray lines). The same seed always produces the same corpus.
+
+Usage:
+    python -m benchmarks.corpus OUTPUT_DIR [--documents 10] [--pages 2] [--questions 20] [--noise 0.3]
+"""
+import os
+import argparse
+import random
+from fpdf import FPDF
+
+RATINGS = ["1 - Not Interested", "2 - Slightly Interested", "3 - Somewhat Interested",
+           "4 - Interested", "5 - Very Interested"]
+FREE_TEXT = ["Evenings after work", "Weekends only", "Job skills and resume help", "Computer classes",
+             "Childcare would help me attend", "Online if possible"]
+QUESTIONS = ["How interested are you in taking classes?", "What time of day works best for you?",
+             "Would you attend classes online?", "Which topics matter most to you?",
+             "How did you hear about the program?"]
+
+def make_survey_pdf(pdf_path: str, pages: int = 2, questions: int = 20, noise: float = 0.0, seed: int = 0):
+    """
+    Writes one synthetic survey PDF.
+
+    Args:
+        pdf_path (str): Output file.
+        pages (int, optional): Page count; questions are split evenly across pages.
+        questions (int, optional): Number of questions in the survey.
+        noise (float, optional): 0 for a clean page up to 1 for heavy speckle and stray lines.
+        seed (int, optional): Seed for the answers and noise.
+
+    Returns:
+        list: The text lines written, in reading order (the ideal OCR transcript).
+    """
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.set_auto_page_break(False)
+    per_page = max(1, -(-questions // max(pages, 1)))
+    lines = []
+
+    question_id = 1
+    for _ in range(max(pages, 1)):
+        pdf.add_page()
+        pdf.set_font("Arial", size=11)
+        y = 15
+        for _ in range(per_page):
+            if question_id > questions:
+                break
+            pdf.set_xy(15, y)
+            lines.append(f"{question_id}. {rng.choice(QUESTIONS)}")
+            pdf.cell(180, 6, txt=lines[-1], ln=True)
+            y += 6
+            for _ in range(rng.randint(1, 3)):
+                lines.append(rng.choice(RATINGS + FREE_TEXT))
+                pdf.set_xy(20, y)
+                pdf.cell(170, 6, txt=lines[-1], ln=True)
+                y += 6
+            y += 2
+            question_id += 1
+
+        # Scanner noise: dark specks and faint stray lines
+        pdf.set_fill_color(0, 0, 0)
+        for _ in range(int(noise * 400)):
+            size = rng.uniform(0.2, 0.6)
+            pdf.rect(rng.uniform(5, 200), rng.uniform(5, 285), size, size, style="F")
+        pdf.set_draw_color(120, 120, 120)
+        for _ in range(int(noise * 4)):
+            x = rng.uniform(5, 200)
+            pdf.line(x, rng.uniform(5, 140), x + rng.uniform(-3, 3), rng.uniform(150, 290))
+
+    pdf.output(pdf_path)
+    return lines
+
+def generate_corpus(output_dir: str, documents: int = 10, pages: int = 2, questions: int = 20,
+                    noise: float = 0.0, seed: int = 0) -> list:
+    """
+    Writes a folder of synthetic survey PDFs.
+
+    Returns:
+        list: (pdf_path, transcript lines) for each generated PDF, in name order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    corpus = []
+    for index in range(documents):
+        pdf_path = os.path.join(output_dir, f"synthetic{index + 1:04d}.pdf")
+        corpus.append((pdf_path, make_survey_pdf(pdf_path, pages, questions, noise, seed + index)))
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.output_dir, args.documents, args.pages, args.questions, args.noise, args.seed)
+    print(f"Wrote {len(corpus)} PDF(s) to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -36,58 +36,191 @@
 
 #     print("\n🚀 STLOVP app is running...\n")
 #     app.run(debug=True)
+import os
 import sys
 import time  # Import time module
-import pytest
-from app import create_app
-from app.functions import get_resident_survey_info, get_stakeholder_survey_info
+import socket
+import argparse
+import threading
+import multiprocessing
 from app.console_logger import log_stage
-from app.extract_text import save_to_json
 
-def run_tests():
-    """Run tests and exit if any fail."""
+def run_tests(pytest_args: list = None) -> int:
+    """Run the test suite and return pytest's exit code."""
+    import pytest
+
     start_time = time.time()  # Start test timing
-    exit_code = pytest.main(["-q", "--disable-warnings"])
+    exit_code = pytest.main(["-q", "--disable-warnings", *(pytest_args or [])])
     end_time = time.time()  # End test timing
     duration = end_time - start_time
 
     if exit_code != 0:
-        log_stage("❌ Tests Failed!", f"Fix the issues before running the app. (⏳ {duration:.2f} seconds)")
-        sys.exit(1)
-    log_stage("✅ Tests Passed!", f"All tests ran successfully. (⏳ {duration:.2f} seconds)")
-
-if __name__ == '__main__':
-    overall_start_time = time.time()  # Start full script timing
+        log_stage("❌ Tests Failed!", f"(⏳ {duration:.2f} seconds)")
+    else:
+        log_stage("✅ Tests Passed!", f"All tests ran successfully. (⏳ {duration:.2f} seconds)")
+    return exit_code
 
-    run_tests()  # Run tests first
-
-    log_stage("Initializing Application... ⚙️")
-    app = create_app()
+def run_ingest():
+    """Extract every new or changed survey PDF into the survey store."""
+    from app.functions import get_resident_survey_info, get_stakeholder_survey_info
+    from app.ingest import ingest_surveys
 
     log_stage("Gathering Resident Survey Data... 📂")
-    resident_data = get_resident_survey_info()
+    get_resident_survey_info()
 
     log_stage("Gathering Stakeholder Survey Data... 📂")
-    stakeholder_data = get_stakeholder_survey_info()
+    get_stakeholder_survey_info()
+
+    # Extract text from all Resident and Stakeholder survey PDFs through one shared worker pool
+    log_stage("Extracting Survey Responses... 📝")
+    ingest_start_time = time.time()
+    ingest_surveys()
+    ingest_end_time = time.time()
+    log_stage("Survey Extraction Complete ✅", f"Time taken: ⏳ {ingest_end_time - ingest_start_time:.2f} seconds")
+
+def run_export(args) -> int:
+    """Stream the survey store to a file (or stdout) as CSV or Parquet."""
+    from app.datastore import open_store, SURVEY_TYPES
+    from app.export import iter_export
+    from app.console_logger import configure_logging
+
+    if not args.output:
+        configure_logging(stream=sys.stderr)  # Keep log lines out of the exported data
+
+    types_by_name = {name.lower(): name for name in SURVEY_TYPES}
+    try:
+        survey_types = [types_by_name[survey_type.lower()] for survey_type in args.type]
+        chunks = iter_export(open_store(), args.format, survey_types or None)
+    except KeyError as e:
+        log_stage("Export Failed! ❌", f"Unknown survey type: {e.args[0]}")
+        return 1
+    except RuntimeError as e:
+        log_stage("Export Failed! ❌", str(e))
+        return 1
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+            log_stage("Export Complete ✅", args.output)
+        else:
+            output.flush()
+    return 0
+
+def run_worker(once: bool = False):
+    """Run one distributed ingestion worker until interrupted (or until nothing is left to claim)."""
+    from app.worker import IngestWorker
+    try:
+        IngestWorker().run(once=once)
+    except KeyboardInterrupt:
+        log_stage("Worker Stopped 👋")
+
+def ingest_when_listening(host: str, port: int, timeout: float = 30.0):
+    """Wait until the server accepts connections, then ingest in this (background) thread."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    try:
+        run_ingest()
+    except Exception as e:
+        log_stage("Background Ingestion Failed! ❌", str(e))
+
+def serve(args):
+    """
+    Start the web app without waiting on OCR.
+    - "auto" ingests in the background only when survey PDFs changed since the last run
+    - "background" always ingests in the background, "blocking" ingests before serving, "skip" never ingests
+    """
+    from app import create_app
+    from app.ingest import pending_survey_pdfs
 
-    # Extract text from all Resident survey PDFs and save them
-    log_stage("Extracting Resident Survey Responses... 📝")
-    resident_start_time = time.time()
-    save_to_json("Resident", "surveys/resident")
-    resident_end_time = time.time()
-    log_stage("Resident Survey Extraction Complete ✅", f"Time taken: ⏳ {resident_end_time - resident_start_time:.2f} seconds")
-
-    # Extract text from all Stakeholder survey PDFs and save them
-    log_stage("Extracting Stakeholder Survey Responses... 📝")
-    stakeholder_start_time = time.time()
-    save_to_json("Stakeholder", "surveys/stakeholder")
-    stakeholder_end_time = time.time()
-    log_stage("Stakeholder Survey Extraction Complete ✅", f"Time taken: ⏳ {stakeholder_end_time - stakeholder_start_time:.2f} seconds")
+    log_stage("Initializing Application... ⚙️")
+    app = create_app()
 
-    log_stage("Finalizing Initialization... ✅", "All data loaded and saved successfully.")
+    # With the debug reloader the script runs twice; only the serving child process ingests
+    serving_process = not args.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+    ingest_mode = args.ingest
+    if ingest_mode == "auto" and serving_process:
+        pending = pending_survey_pdfs()
+        ingest_mode = "background" if pending else "skip"
+        log_stage("Survey Data Checked 🗂️", f"{len(pending)} PDF(s) new or changed.")
 
-    overall_end_time = time.time()  # End full script timing
-    log_stage("Total Execution Time", f"⏳ {overall_end_time - overall_start_time:.2f} seconds")
+    if ingest_mode == "blocking":
+        run_ingest()
+    elif ingest_mode == "background" and serving_process:
+        host = "127.0.0.1" if args.host in ("0.0.0.0", "") else args.host
+        threading.Thread(target=ingest_when_listening, args=(host, args.port), name="ingest", daemon=True).start()
 
     print("\n🚀 STLOVP app is running...\n")
-    app.run(debug=True)
+    app.run(host=args.host, port=args.port, debug=args.debug)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="STLOVP survey app.")
+    commands = parser.add_subparsers(dest="command")
+
+    serve_parser = commands.add_parser("serve", help="Run the web app (default).")
+    serve_parser.add_argument("--ingest", choices=["auto", "background", "blocking", "skip"], default="auto")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=5000)
+    serve_parser.add_argument("--debug", action=argparse.BooleanOptionalAction, default=True)
+
+    commands.add_parser("ingest", help="Extract new or changed survey PDFs, then exit.")
+    commands.add_parser("watch", help="Keep ingesting survey PDFs as they are added or changed.")
+
+    worker_parser = commands.add_parser("worker", help="Claim and ingest survey PDFs alongside other workers.")
+    worker_parser.add_argument("--processes", type=int, default=1, help="Workers to start on this machine.")
+    worker_parser.add_argument("--once", action="store_true", help="Exit when no unclaimed PDFs are left.")
+
+    export_parser = commands.add_parser("export", help="Stream stored responses as CSV or Parquet, one row per answer.")
+    export_parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    export_parser.add_argument("--type", action="append", default=[], help="Survey type to export; repeatable.")
+    export_parser.add_argument("--output", help="File to write; defaults to stdout.")
+
+    test_parser = commands.add_parser("test", help="Run the test suite; extra arguments go to pytest.")
+    test_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in commands.choices and argv[0] not in ("-h", "--help"):
+        argv.insert(0, "serve")  # Plain "python run.py" serves, as it always has
+    args = parser.parse_args(argv)
+
+    if args.command == "test":
+        return run_tests(args.pytest_args)
+    if args.command == "ingest":
+        overall_start_time = time.time()  # Start full script timing
+        run_ingest()
+        log_stage("Total Execution Time", f"⏳ {time.time() - overall_start_time:.2f} seconds")
+        return 0
+    if args.command == "export":
+        return run_export(args)
+    if args.command == "worker":
+        workers = [multiprocessing.Process(target=run_worker, args=(args.once,), name=f"worker-{index}")
+                   for index in range(max(args.processes, 1))]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.join()
+        return 0
+    if args.command == "watch":
+        from app.watcher import SurveyWatcher
+        try:
+            SurveyWatcher().run()
+        except KeyboardInterrupt:
+            log_stage("Stopped Watching 👋")
+        return 0
+    serve(args)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())